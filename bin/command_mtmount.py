@@ -32,6 +32,6 @@ tma_commander.py --help
 
 import asyncio
 
-from lsst.ts import MTMount
+from lsst.ts.MTMount import MTMountCommander
 
-asyncio.run(MTMount.MTMountCommander.amain(index=0))
+asyncio.run(MTMountCommander.amain(index=0))
@@ -36,7 +36,7 @@ tma_commander.py --help
 
 import asyncio
 
-from lsst.ts import MTMount
+from lsst.ts.MTMount import TmaCommander
 
 
-asyncio.run(MTMount.TmaCommander.amain())
+asyncio.run(TmaCommander.amain())
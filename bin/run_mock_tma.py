@@ -20,9 +20,9 @@
 import asyncio
 import logging
 
-from lsst.ts import MTMount
+from lsst.ts.MTMount import mock
 
 logging.basicConfig()
 
 
-asyncio.run(MTMount.mock.Controller.amain())
+asyncio.run(mock.Controller.amain())
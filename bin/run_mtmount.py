@@ -19,6 +19,6 @@
 #
 import asyncio
 
-from lsst.ts import MTMount
+from lsst.ts.MTMount import MTMountCsc
 
-asyncio.run(MTMount.MTMountCsc.amain(index=None))
+asyncio.run(MTMountCsc.amain(index=None))
@@ -19,6 +19,6 @@
 #
 import asyncio
 
-from lsst.ts import MTMount
+from lsst.ts.MTMount import TelemetryClient
 
-asyncio.run(MTMount.TelemetryClient.amain())
+asyncio.run(TelemetryClient.amain())
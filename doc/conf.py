@@ -6,6 +6,9 @@ This configuration only affects single-package Sphinx documentation builds.
 from documenteer.sphinxconfig.stackconf import build_package_configs
 import lsst.ts.MTMount
 
+# Import the lazily imported names, so automodapi can document them.
+for _name in lsst.ts.MTMount.__all__:
+    getattr(lsst.ts.MTMount, _name)
 
 _g = globals()
 _g.update(
@@ -19,26 +19,86 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+"""Lazily import most of this package.
+
+The cheap modules (constants, enums and utils) are imported eagerly.
+Everything else is imported the first time it is used,
+so that, for instance, the telemetry client does not pay
+for importing astropy, the mock controller and the CSC.
+"""
+
 # Set __version__ before importing the CSC
 try:
     from .version import *
 except ImportError:
     __version__ = "?"
 
+import importlib
+
 from .constants import *
 from .enums import *
 from .utils import *
-from .limits import *
-from . import field_info
-from . import base_message
-from . import commands
-from . import replies
-from .client_server_pair import *
-from .communicator import *
-from .command_futures import *
-from .telemetry_client import *
-from .mtmount_commander import *
-from .mtmount_csc import *
-from .tma_commander import *
-from . import mock
-from . import testutils
+from . import constants, enums, utils
+
+# Dict of module name: names exported by the module,
+# for modules whose contents are available as package attributes.
+# Each list must match the ``__all__`` of the module.
+_LAZY_MODULE_EXPORTS = {
+    "limits": ["Limits", "LimitsDict", "SetpointValidator", "estimate_slew_time"],
+    "trajectory": ["Trajectory"],
+    "client_server_pair": ["ClientServerPair"],
+    "communicator": ["Communicator"],
+    "command_futures": ["CommandFutures"],
+    "latency_stats": ["LatencyHistogram", "CommandLatencyStats"],
+    "command_sequencer": ["SequenceStep", "CommandSequencer"],
+    "telemetry_client": ["TelemetryTopicHandler", "TelemetryClient"],
+    "mtmount_commander": ["MTMountCommander"],
+    "mtmount_csc": ["MTMountCsc"],
+    "tma_commander": ["TmaCommander"],
+    "startup_profiler": ["EntryPoint", "StartupProfiler"],
+}
+
+# Submodules that are available as package attributes,
+# e.g. ``MTMount.commands``.
+_LAZY_SUBMODULES = {
+    "field_info",
+    "base_message",
+    "commands",
+    "replies",
+    "mock",
+    "testutils",
+}.union(_LAZY_MODULE_EXPORTS)
+
+# Dict of lazily imported name: name of module that defines it.
+_LAZY_NAMES = {
+    name: module_name
+    for module_name, names in _LAZY_MODULE_EXPORTS.items()
+    for name in names
+}
+
+__all__ = (
+    ["__version__"]
+    + constants.__all__
+    + enums.__all__
+    + utils.__all__
+    + list(_LAZY_NAMES)
+)
+
+
+def __getattr__(name):
+    """Import a lazily imported name or submodule on first use.
+    """
+    if name in _LAZY_NAMES:
+        module = importlib.import_module(f".{_LAZY_NAMES[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache the value, so this function is only called once per name.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES) | _LAZY_SUBMODULES)
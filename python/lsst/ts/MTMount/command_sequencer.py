@@ -0,0 +1,205 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["SequenceStep", "CommandSequencer"]
+
+import asyncio
+import time
+
+
+class SequenceStep:
+    """One step of a `CommandSequencer`: a low-level command to send
+    once all the steps it depends on have finished.
+
+    Parameters
+    ----------
+    name : `str`
+        Name of the step; must be unique within a sequence.
+    command : `Command`
+        Low-level command to send.
+    depends_on : `List` [`str`], optional
+        Names of steps that must finish before this step starts.
+    allow_failure : `bool`, optional
+        If True then a failure of this step is logged as a warning
+        and the steps that depend on it are still run.
+        If False then a failure of this step aborts the sequence.
+    """
+
+    def __init__(self, name, command, depends_on=(), allow_failure=False):
+        self.name = name
+        self.command = command
+        self.depends_on = tuple(depends_on)
+        self.allow_failure = allow_failure
+
+    def __repr__(self):
+        return (
+            f"SequenceStep(name={self.name!r}, command={self.command}, "
+            f"depends_on={self.depends_on}, allow_failure={self.allow_failure})"
+        )
+
+
+class CommandSequencer:
+    """Run a graph of low-level commands, sending independent commands
+    in parallel.
+
+    Parameters
+    ----------
+    name : `str`
+        Name of the sequence; used in log messages.
+    steps : `List` [`SequenceStep`]
+        The steps. Each step is started as soon as all the steps
+        listed in its ``depends_on`` have finished (successfully,
+        or unsuccessfully if they have ``allow_failure`` true).
+    log : `logging.Logger`
+        Logger.
+
+    Raises
+    ------
+    ValueError
+        If a step name is duplicated, a step depends on an unknown step,
+        or the dependencies contain a cycle.
+
+    Attributes
+    ----------
+    durations : `dict` [`str`, `float`]
+        Dict of step name: duration (seconds) for each step
+        that has finished, successfully or not.
+        Reset each time `run` is called.
+    """
+
+    def __init__(self, name, steps, log):
+        self.name = name
+        self.steps = tuple(steps)
+        self.log = log
+        self.step_dict = {}
+        for step in self.steps:
+            if step.name in self.step_dict:
+                raise ValueError(f"Step name {step.name!r} appears more than once")
+            self.step_dict[step.name] = step
+        for step in self.steps:
+            for name in step.depends_on:
+                if name not in self.step_dict:
+                    raise ValueError(
+                        f"Step {step.name!r} depends on unknown step {name!r}"
+                    )
+        self._assert_no_cycles()
+        self.durations = dict()
+
+    def _assert_no_cycles(self):
+        """Raise ValueError if the step dependencies contain a cycle.
+        """
+        remaining = {step.name: set(step.depends_on) for step in self.steps}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"The dependencies of steps {sorted(remaining)} contain a cycle"
+                )
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    async def run(self, send_command):
+        """Run the sequence.
+
+        Parameters
+        ----------
+        send_command : ``coroutine``
+            Coroutine function that sends one command and waits
+            for it to finish, e.g. `MTMountCsc.send_command`.
+            It is called with one positional argument: the command.
+
+        Returns
+        -------
+        durations : `dict` [`str`, `float`]
+            Dict of step name: duration (seconds) for each step.
+
+        Raises
+        ------
+        Exception
+            The exception raised by the first step that fails
+            and does not have ``allow_failure`` true.
+            Steps that are still running are cancelled.
+        """
+        self.durations = dict()
+        t0 = time.monotonic()
+        task_dict = dict()
+        for step in self.steps:
+            self._start_step(step=step, task_dict=task_dict, send_command=send_command)
+        try:
+            await asyncio.gather(*task_dict.values())
+        except Exception:
+            for task in task_dict.values():
+                task.cancel()
+            raise
+        finally:
+            total_duration = time.monotonic() - t0
+            self.log.info(
+                f"{self.name} took {total_duration:0.2f} sec; step durations: "
+                + ", ".join(
+                    f"{name}={duration:0.2f}"
+                    for name, duration in self.durations.items()
+                )
+            )
+        return self.durations
+
+    def _start_step(self, step, task_dict, send_command):
+        """Start a task to run one step, if not already started.
+
+        The steps it depends on are started first.
+        """
+        if step.name in task_dict:
+            return task_dict[step.name]
+        prerequisite_tasks = [
+            self._start_step(
+                step=self.step_dict[name],
+                task_dict=task_dict,
+                send_command=send_command,
+            )
+            for name in step.depends_on
+        ]
+        task = asyncio.create_task(
+            self._run_step(
+                step=step,
+                prerequisite_tasks=prerequisite_tasks,
+                send_command=send_command,
+            )
+        )
+        task_dict[step.name] = task
+        return task
+
+    async def _run_step(self, step, prerequisite_tasks, send_command):
+        """Wait for the prerequisites of one step, then run it.
+        """
+        if prerequisite_tasks:
+            await asyncio.gather(*prerequisite_tasks)
+        t0 = time.monotonic()
+        try:
+            await send_command(step.command)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not step.allow_failure:
+                raise
+            self.log.warning(f"Command {step.command} failed; continuing: {e!r}")
+        finally:
+            self.durations[step.name] = time.monotonic() - t0
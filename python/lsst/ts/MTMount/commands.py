@@ -22,6 +22,7 @@
 __all__ = [
     "NUM_HEADER_FIELDS",
     "AckOnlyCommandCodes",
+    "EmergencyCommandCodes",
     "Command",
     "AskForCommand",
     "AzimuthAxisDriveEnable",
@@ -77,9 +78,15 @@ __all__ = [
     "TopEndChillerTrackAmbient",
     "Commands",
     "CommandDict",
+    "CommandDecoderDict",
+    "CommandTemplate",
     "parse_command",
 ]
 
+import datetime
+
+import astropy.time
+
 from lsst.ts import salobj
 from . import base_message
 from . import enums
@@ -103,6 +110,14 @@ AckOnlyCommandCodes = set(
     )
 )
 
+# Commands that stop a device, and safety commands.
+# `Communicator` writes these before any other queued messages.
+EmergencyCommandCodes = set(
+    command_code
+    for command_code in enums.CommandCode
+    if command_code.name.endswith("_STOP")
+) | {enums.CommandCode.STOP_MOUNT, enums.CommandCode.SAFETY_RESET}
+
 
 class Command(base_message.BaseMessage):
     """Base class for commands.
@@ -749,6 +764,19 @@ def _make_command_dict():
 # Dict of CommandCode: CommandClass
 CommandDict = _make_command_dict()
 
+# Dict of command_code as a string: decoder for that command,
+# as made by `BaseMessage.make_decoder`. The key is the
+# command_code field exactly as it is encoded, e.g. "1001",
+# so a command can be decoded with a single dict lookup.
+# Commands added to `CommandDict` later are still parsed,
+# but by the slower path in `parse_command`.
+CommandDecoderDict = {
+    CommandClass.field_infos[1].str_from_value(
+        command_code
+    ): CommandClass.make_decoder()
+    for command_code, CommandClass in CommandDict.items()
+}
+
 
 def parse_command(fields):
     """Return a Command from a bytes string.
@@ -768,9 +796,117 @@ def parse_command(fields):
         raise ValueError(
             f"A command has at least {NUM_HEADER_FIELDS} fields; only got {len(fields)}"
         )
-    command_code = enums.CommandCode(int(fields[1]))
-    try:
-        CommandClass = CommandDict[command_code]
-    except ValueError:
-        raise RuntimeError(f"Unsupported command_code={command_code}")
-    return CommandClass.from_str_fields(fields)
+    decoder = CommandDecoderDict.get(fields[1])
+    if decoder is None:
+        # Handle unusual representations of the command code, such as "+1001",
+        # and commands added to CommandDict after this module was imported.
+        command_code = enums.CommandCode(int(fields[1]))
+        try:
+            CommandClass = CommandDict[command_code]
+        except KeyError:
+            raise ValueError(f"Unsupported command_code={command_code!r}")
+        return CommandClass.from_str_fields(fields)
+    return decoder(fields)
+
+
+class CommandTemplate:
+    """Make commands with fixed parameters quickly.
+
+    The fields other than ``sequence_id`` and ``timestamp``
+    are encoded once, when the template is constructed.
+    Each call makes a new command with the next ``sequence_id``
+    and the current time, whose encoded form is already cached,
+    so `BaseMessage.encode` is free and making the command
+    is mostly a bytes join.
+
+    Parameters
+    ----------
+    CommandClass : ``class``
+        Command class: a subclass of `Command`.
+    **kwargs : `dict`
+        Command parameters; ``sequence_id`` and ``timestamp``
+        are not allowed.
+
+    Raises
+    ------
+    ValueError
+        If ``kwargs`` includes ``sequence_id`` or ``timestamp``,
+        or if a command cannot be constructed from the parameters.
+
+    Attributes
+    ----------
+    CommandClass : ``class``
+        Command class.
+    prototype : `Command`
+        A command with the fixed field values.
+    """
+
+    def __init__(self, CommandClass, **kwargs):
+        for name in ("sequence_id", "timestamp"):
+            if name in kwargs:
+                raise ValueError(f"{name} may not be specified")
+        self.CommandClass = CommandClass
+        self.prototype = CommandClass(sequence_id=0, **kwargs)
+        self._fixed_items = tuple(
+            (finfo.name, getattr(self.prototype, finfo.name))
+            for finfo in CommandClass.field_infos
+            if finfo.name not in ("sequence_id", "timestamp")
+        )
+        str_fields = self.prototype.str_fields()
+        # Encoded fields between sequence_id and timestamp,
+        # and after timestamp (including the terminator).
+        self._encoded_middle = ("\n" + "\n".join(str_fields[1:3]) + "\n").encode()
+        self._encoded_end = (
+            "".join("\n" + str_field for str_field in str_fields[4:]) + "\r\n"
+        ).encode()
+
+    def __call__(self, sequence_id=None):
+        """Make a command.
+
+        Parameters
+        ----------
+        sequence_id : `int` or `None`, optional
+            Sequence ID. If `None` then use the next value
+            of ``Command.sequence_id_generator``.
+
+        Returns
+        -------
+        command : `Command`
+            The command, an instance of `CommandClass`.
+        """
+        if sequence_id is None:
+            sequence_id = next(self.CommandClass.sequence_id_generator)
+        # Get and format the current time using datetime, which is much
+        # faster than astropy. Truncate the time to the precision of the
+        # encoded value, so the astropy time has the same isot value.
+        now = datetime.datetime.now(datetime.timezone.utc)
+        now = now.replace(tzinfo=None, microsecond=now.microsecond // 1000 * 1000)
+        timestamp = astropy.time.Time(now, scale="utc", format="datetime")
+        command = self.CommandClass.__new__(self.CommandClass)
+        set_attr = object.__setattr__
+        for name, value in self._fixed_items:
+            set_attr(command, name, value)
+        set_attr(command, "sequence_id", sequence_id)
+        set_attr(command, "timestamp", timestamp)
+        set_attr(
+            command,
+            "_encoded",
+            b"".join(
+                (
+                    f"{sequence_id}".encode(),
+                    self._encoded_middle,
+                    now.isoformat(timespec="milliseconds").encode(),
+                    self._encoded_end,
+                )
+            ),
+        )
+        return command
+
+    def __repr__(self):
+        arglist = [self.CommandClass.__name__] + [
+            f"{name}={self.prototype._get_formatted_value(name)}"
+            for name, value in self._fixed_items
+            if name != "command_code"
+        ]
+        argstr = ", ".join(arglist)
+        return f"{type(self).__name__}({argstr})"
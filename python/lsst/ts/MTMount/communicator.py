@@ -22,9 +22,13 @@
 __all__ = ["Communicator"]
 
 import asyncio
+import contextlib
+import heapq
+import itertools
 
 from . import client_server_pair
 from . import commands
+from . import enums
 from . import replies
 
 
@@ -62,6 +66,16 @@ class Communicator(client_server_pair.ClientServerPair):
 
     Notes
     -----
+    Messages are written in order of `WritePriority`, so that a stop
+    command waits for at most one write in progress, however many
+    other messages are waiting to be written.
+    By default stop and safety commands (`commands.EmergencyCommandCodes`)
+    have priority ``EMERGENCY``, tracking commands
+    (`commands.AckOnlyCommandCodes`) have priority ``TRACKING``,
+    and all other messages have priority ``BULK``.
+    Messages with the same priority are written in the order
+    `write` or `write_many` was called.
+
     Tekniker's OperationManager software connects to each component
     (PXI, EUI and HHD) using two TCP/IP sockets:
 
@@ -101,8 +115,14 @@ class Communicator(client_server_pair.ClientServerPair):
         else:
             self.parse_read_fields = commands.parse_command
 
-        # Lock write/drain to prevent calling drain while draining (an error).
-        self.write_lock = asyncio.Lock()
+        # Only one message (or batch of messages) is written at a time,
+        # to prevent calling drain while draining (an error).
+        # Is a write in progress (or about to start)?
+        self._writing = False
+        # Heap of (priority, index, future) for writes waiting to start.
+        # The index makes writes of the same priority first-in, first-out.
+        self._write_waiters = []
+        self._write_index = itertools.count()
 
     async def close(self):
         self.monitor_client_writer_task.cancel()
@@ -122,6 +142,37 @@ class Communicator(client_server_pair.ClientServerPair):
         message : `BaseMessage`
             The message read.
 
+        Raises
+        ------
+        RuntimeError
+            If not connected before reading begins.
+        ConnectionResetError
+            If the connection is lost while reading.
+            This also calls ``connect_callback``.
+        ValueError
+            If the message cannot be parsed.
+        """
+        fields = await self.read_fields()
+        try:
+            message = self.parse_read_fields(fields)
+            self.log.debug("Read %s", message)
+            return message
+        except Exception:
+            self.log.exception(f"Could not parse read data: {fields}")
+            raise
+
+    async def read_fields(self):
+        """Read a message and return it as a list of string fields,
+        without parsing it. Waits indefinitely.
+
+        This is faster than `read`, for readers that only need
+        a few of the fields, or need to decide how to parse the message.
+
+        Returns
+        -------
+        fields : `List` [`str`]
+            The fields of the message; there is always at least one.
+
         Raises
         ------
         RuntimeError
@@ -134,7 +185,6 @@ class Communicator(client_server_pair.ClientServerPair):
             raise RuntimeError("Server not connected")
         try:
             read_bytes = await self.server_reader.readuntil(b"\r\n")
-            read_str = read_bytes.decode(errors="ignore")[:-2]
         except asyncio.CancelledError:
             raise
         except ConnectionResetError:
@@ -142,27 +192,75 @@ class Communicator(client_server_pair.ClientServerPair):
                 "Lost connection to the low-level controller (detected in read)"
             )
             self.call_connect_callback()
+            raise
         except Exception:
             # Print details if the error is other than "connection lost"
             if self.connected:
                 self.log.exception("Read failed")
             raise
-        try:
-            fields = read_str.split("\n")
-            message = self.parse_read_fields(fields)
-            self.log.debug("Read %s; bytes %s", message, read_bytes)
-            return message
-        except Exception:
-            self.log.exception(f"Could not parse read data: {read_bytes}")
-            raise
+        self.log.debug("Read bytes %s", read_bytes)
+        return read_bytes.decode(errors="ignore")[:-2].split("\n")
 
-    async def write(self, message):
+    @property
+    def num_waiting_writes(self):
+        """Get the number of writes waiting for another write to finish.
+        """
+        return sum(1 for waiter in self._write_waiters if not waiter[-1].done())
+
+    @staticmethod
+    def get_write_priority(message):
+        """Get the default write priority of a message.
+
+        Parameters
+        ----------
+        message : `BaseMessage`
+            Message.
+
+        Returns
+        -------
+        priority : `WritePriority`
+            ``EMERGENCY`` for commands in `commands.EmergencyCommandCodes`,
+            ``TRACKING`` for commands in `commands.AckOnlyCommandCodes`,
+            else ``BULK``.
+        """
+        command_code = getattr(message, "command_code", None)
+        if command_code in commands.EmergencyCommandCodes:
+            return enums.WritePriority.EMERGENCY
+        elif command_code in commands.AckOnlyCommandCodes:
+            return enums.WritePriority.TRACKING
+        return enums.WritePriority.BULK
+
+    async def write(self, message, priority=None):
         """Write a message.
 
         Parameters
         ----------
         message : `BaseMessage`
             Message to write.
+        priority : `WritePriority` or `None`, optional
+            Priority. If `None` then use the default priority
+            for the message; see `get_write_priority`.
+
+        Raises
+        ------
+        RuntimeError
+            If not connected before writing.
+        ConnectionResetError
+            If the connection is lost while writing.
+            This also calls ``connect_callback``.
+        """
+        await self.write_many([message], priority=priority)
+
+    async def write_many(self, messages, priority=None):
+        """Write one or more messages, using a single socket write.
+
+        Parameters
+        ----------
+        messages : `List` [`BaseMessage`]
+            Messages to write, in order.
+        priority : `WritePriority` or `None`, optional
+            Priority. If `None` then use the highest
+            default priority of the messages; see `get_write_priority`.
 
         Raises
         ------
@@ -174,10 +272,13 @@ class Communicator(client_server_pair.ClientServerPair):
         """
         if not self.client_connected:
             raise RuntimeError("Client not connected")
-        message_bytes = message.encode()
+        if priority is None:
+            priority = min(self.get_write_priority(message) for message in messages)
+        message_bytes = b"".join(message.encode() for message in messages)
         try:
-            async with self.write_lock:
-                self.log.debug("Write %s; bytes=%s", message, message_bytes)
+            async with self._write_turn(priority):
+                for message in messages:
+                    self.log.debug("Write %s; bytes=%s", message, message.encode())
                 self.client_writer.write(message_bytes)
                 await self.client_writer.drain()
         except ConnectionResetError:
@@ -190,6 +291,47 @@ class Communicator(client_server_pair.ClientServerPair):
             self.log.exception(f"Failed to write {message_bytes}")
             raise
 
+    @contextlib.asynccontextmanager
+    async def _write_turn(self, priority):
+        """Wait for all other writes in progress or of higher priority
+        to finish, then allow this write to proceed.
+
+        Parameters
+        ----------
+        priority : `WritePriority`
+            Priority of the write.
+        """
+        if self._writing:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(
+                self._write_waiters, (priority, next(self._write_index), future)
+            )
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # This write was allowed to proceed, but was cancelled
+                    # before it could; let the next write proceed.
+                    self._start_next_write()
+                raise
+        self._writing = True
+        try:
+            yield
+        finally:
+            self._start_next_write()
+
+    def _start_next_write(self):
+        """Allow the highest priority waiting write to proceed, if any.
+        """
+        self._writing = False
+        while self._write_waiters:
+            future = heapq.heappop(self._write_waiters)[-1]
+            if not future.done():
+                # Reserve the turn for this write.
+                self._writing = True
+                future.set_result(None)
+                return
+
     async def monitor_client_reader(self):
         """Monitor the client reader; if it closes then close the writer.
         """
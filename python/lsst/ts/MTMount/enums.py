@@ -27,6 +27,7 @@ __all__ = [
     "ReplyCode",
     "Source",
     "TelemetryTopicId",
+    "WritePriority",
 ]
 
 import enum
@@ -269,3 +270,16 @@ class TelemetryTopicId(enum.IntEnum):
     ELEVATION = 15
     ELEVATION_DRIVE = 14
     CAMERA_CABLE_WRAP = 8
+
+
+class WritePriority(enum.IntEnum):
+    """Priority of a message written by `Communicator`.
+
+    Messages waiting to be written are written in order of priority
+    (lower values first), and in the order they were queued
+    for a given priority.
+    """
+
+    EMERGENCY = 0  # Stop and safety commands
+    TRACKING = 1  # Tracking commands
+    BULK = 2  # Everything else
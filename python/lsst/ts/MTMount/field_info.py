@@ -35,6 +35,7 @@ __all__ = [
 
 import abc
 import enum
+import math
 
 import astropy.time
 
@@ -100,6 +101,15 @@ class BaseFieldInfo(metaclass=abc.ABCMeta):
         """
         return str(value)
 
+    def values_equal(self, value1, value2):
+        """Return True if two values of this field are equal.
+
+        Values are equal if they have the same string representation,
+        but this is usually much faster than comparing
+        string representations.
+        """
+        return value1 == value2
+
 
 class BoolFieldInfo(BaseFieldInfo):
     """A bool field with str representation "0"/"1".
@@ -218,6 +228,15 @@ class FloatFieldInfo(BaseFieldInfo):
     def str_from_value(self, value):
         return str(float(value))
 
+    def values_equal(self, value1, value2):
+        # Match str_from_value: 0.0 and -0.0 are different
+        # and all NaNs are the same.
+        value1 = float(value1)
+        value2 = float(value2)
+        if value1 == value2:
+            return value1 != 0 or math.copysign(1, value1) == math.copysign(1, value2)
+        return math.isnan(value1) and math.isnan(value2)
+
 
 class IntFieldInfo(BaseFieldInfo):
     """An int field.
@@ -324,11 +343,20 @@ class TimestampFieldInfo(BaseFieldInfo):
             raise ValueError(f"value={value!r} is not an astropy.time.Time")
 
     def value_from_str(self, strval):
-        return astropy.time.Time(strval, scale="utc")
+        try:
+            # Specifying the format is much faster than letting astropy guess.
+            return astropy.time.Time(strval, scale="utc", format="isot")
+        except ValueError:
+            return astropy.time.Time(strval, scale="utc")
 
     def str_from_value(self, value):
         return value.isot
 
+    def values_equal(self, value1, value2):
+        # Compare the string representations, since the str representation
+        # has limited precision. This is fast because astropy caches isot.
+        return value1 is value2 or value1.isot == value2.isot
+
 
 # Convenience versions of the fields above
 
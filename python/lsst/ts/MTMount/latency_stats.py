@@ -0,0 +1,360 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["LatencyHistogram", "CommandLatencyStats"]
+
+import math
+
+import numpy as np
+
+# Minimum number of latency measurements for a command code
+# before its timeouts are adapted and drift is reported.
+MIN_SAMPLES = 20
+
+# Quantile of the latency histogram used to compute timeouts,
+# and the factor by which that latency is multiplied.
+TIMEOUT_QUANTILE = 0.999
+TIMEOUT_SCALE = 3
+
+# Minimum adaptive Ack timeout (sec).
+MIN_ACK_TIMEOUT = 1
+
+# Maximum adaptive Done timeout, as a multiple of the default Done timeout
+# (which is based on the timeout reported by the low-level controller).
+MAX_DONE_TIMEOUT_SCALE = 2
+
+# Weight of each new latency in the recent mean latency,
+# which is compared to the median of the histogram to detect drift.
+RECENT_WEIGHT = 0.1
+
+# Report drift when the recent mean latency is more than
+# DRIFT_START_RATIO times the median latency, and report recovery
+# when it falls below DRIFT_END_RATIO times the median latency.
+DRIFT_START_RATIO = 2
+DRIFT_END_RATIO = 1.5
+
+# Maximum weight of a new measurement in a LatencyHistogram,
+# before the counts are rescaled to avoid overflow.
+_MAX_WEIGHT = 1e100
+
+
+class LatencyHistogram:
+    """Histogram of latencies, with exponentially spaced bins,
+    in which older measurements gradually lose weight.
+
+    Parameters
+    ----------
+    min_latency : `float`, optional
+        Upper edge of the first bin (sec).
+    growth : `float`, optional
+        Ratio of the upper edge of each bin to the previous one.
+        Must be > 1.
+    num_bins : `int`, optional
+        Number of bins. The last bin includes all larger latencies.
+    decay : `float`, optional
+        Factor by which the weight of all existing measurements
+        is reduced each time a measurement is added.
+        Must be in the range (0, 1]; 1 means no decay.
+
+    Attributes
+    ----------
+    counts : `numpy.ndarray`
+        Weighted count of each bin, relative to the weight of the
+        next measurement (so only ratios of counts are meaningful).
+    upper_edges : `numpy.ndarray`
+        Upper edge of each bin (sec).
+    num_samples : `int`
+        Number of latencies added.
+
+    Notes
+    -----
+    The default values have bins from 0.1 msec to about 3 minutes,
+    each about 25% wider than the previous bin. The default decay
+    gives measurements a half-life of about 700 measurements.
+    """
+
+    def __init__(self, min_latency=1e-4, growth=1.25, num_bins=65, decay=0.999):
+        if min_latency <= 0:
+            raise ValueError(f"min_latency={min_latency} must be > 0")
+        if growth <= 1:
+            raise ValueError(f"growth={growth} must be > 1")
+        if num_bins < 2:
+            raise ValueError(f"num_bins={num_bins} must be >= 2")
+        if not 0 < decay <= 1:
+            raise ValueError(f"decay={decay} must be in the range (0, 1]")
+        self.min_latency = min_latency
+        self.num_bins = num_bins
+        self.upper_edges = min_latency * growth ** np.arange(num_bins)
+        self.counts = np.zeros(num_bins)
+        self.num_samples = 0
+        self._log_growth = math.log(growth)
+        # Rather than multiplying all counts by decay for each new
+        # measurement, divide the weight of each new measurement by decay.
+        self._inv_decay = 1 / decay
+        self._weight = 1.0
+
+    def add(self, latency):
+        """Add a latency measurement.
+
+        Parameters
+        ----------
+        latency : `float`
+            Latency (sec).
+        """
+        if latency < self.min_latency:
+            index = 0
+        else:
+            index = min(
+                int(math.log(latency / self.min_latency) / self._log_growth) + 1,
+                self.num_bins - 1,
+            )
+        self.counts[index] += self._weight
+        self.num_samples += 1
+        self._weight *= self._inv_decay
+        if self._weight > _MAX_WEIGHT:
+            self.counts /= self._weight
+            self._weight = 1.0
+
+    def quantile(self, q):
+        """Get an upper bound for the specified quantile of latency.
+
+        Parameters
+        ----------
+        q : `float`
+            Quantile, in the range [0, 1].
+
+        Returns
+        -------
+        latency : `float` or `None`
+            Upper edge of the bin containing the quantile (sec),
+            or `None` if there are no measurements.
+            Quantiles in the last bin return the lower edge
+            of that bin, because it has no upper edge.
+        """
+        if self.num_samples == 0:
+            return None
+        cumulative_counts = np.cumsum(self.counts)
+        # Find the first bin whose cumulative count reaches the quantile.
+        # Treat q=0 as a tiny quantile, to skip empty bins.
+        target = max(q, 1e-12) * cumulative_counts[-1]
+        index = int(np.searchsorted(cumulative_counts, target))
+        index = min(index, self.num_bins - 1)
+        if index == self.num_bins - 1:
+            return float(self.upper_edges[index - 1])
+        return float(self.upper_edges[index])
+
+
+class _LatencyTracker:
+    """Latency statistics for one kind of reply to one command code.
+    """
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        # Exponentially weighted mean of recent latencies (sec).
+        self.recent_latency = None
+        # Is recent latency much larger than usual?
+        self.drifting = False
+
+    def add(self, latency):
+        """Add a latency measurement.
+
+        Returns
+        -------
+        drift_changed : `bool`
+            True if ``drifting`` changed.
+        """
+        self.histogram.add(latency)
+        if self.recent_latency is None:
+            self.recent_latency = latency
+        else:
+            self.recent_latency += RECENT_WEIGHT * (latency - self.recent_latency)
+        if self.histogram.num_samples < MIN_SAMPLES:
+            return False
+        median_latency = self.histogram.quantile(0.5)
+        if self.drifting:
+            drifting = self.recent_latency > DRIFT_END_RATIO * median_latency
+        else:
+            drifting = self.recent_latency > DRIFT_START_RATIO * median_latency
+        if drifting == self.drifting:
+            return False
+        self.drifting = drifting
+        return True
+
+    def get_timeout_latency(self):
+        """Get the scaled latency quantile used to compute a timeout,
+        or `None` if there are too few measurements.
+        """
+        if self.histogram.num_samples < MIN_SAMPLES:
+            return None
+        return TIMEOUT_SCALE * self.histogram.quantile(TIMEOUT_QUANTILE)
+
+
+class CommandLatencyStats:
+    """Latency statistics for low-level controller commands,
+    for each command code.
+
+    Used by `MTMountCsc` to adapt the time it waits for Ack and Done
+    replies to the latency it has seen, and to warn when latency
+    starts to grow, which may indicate a degrading connection
+    to the low-level controller.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+
+    Attributes
+    ----------
+    ack_trackers : `dict` [`CommandCode`, ``_LatencyTracker``]
+        Ack latency statistics: the time from writing a command
+        to reading its Ack reply.
+    done_trackers : `dict` [`CommandCode`, ``_LatencyTracker``]
+        Done latency statistics: the time from reading the Ack reply
+        for a command to reading its Done reply.
+
+    Notes
+    -----
+    Once `MIN_SAMPLES` latencies have been measured for a command code:
+
+    * The Ack timeout is `TIMEOUT_SCALE` times the `TIMEOUT_QUANTILE`
+      quantile of Ack latency, clipped to the range
+      [`MIN_ACK_TIMEOUT`, default timeout].
+    * The Done timeout is `TIMEOUT_SCALE` times the `TIMEOUT_QUANTILE`
+      quantile of Done latency, clipped to the range
+      [default timeout, `MAX_DONE_TIMEOUT_SCALE` * default timeout].
+      Done latency depends on the command parameters
+      (e.g. how far to move), so the default timeout (which is based on
+      the timeout reported by the controller) is never reduced,
+      and it limits how much one unusually slow command can delay
+      the detection of a command that never finishes.
+    * A warning is logged when the recent mean latency becomes more than
+      `DRIFT_START_RATIO` times the median latency, and an info message
+      is logged when it falls below `DRIFT_END_RATIO` times the median.
+    """
+
+    def __init__(self, log):
+        self.log = log
+        self.ack_trackers = dict()
+        self.done_trackers = dict()
+
+    def add_ack_latency(self, command_code, latency):
+        """Add an Ack latency measurement.
+
+        Parameters
+        ----------
+        command_code : `CommandCode`
+            Command code.
+        latency : `float`
+            Time from writing the command to reading its Ack reply (sec).
+        """
+        self._add_latency(self.ack_trackers, "Ack", command_code, latency)
+
+    def add_done_latency(self, command_code, latency):
+        """Add a Done latency measurement.
+
+        Parameters
+        ----------
+        command_code : `CommandCode`
+            Command code.
+        latency : `float`
+            Time from reading the Ack reply for the command
+            to reading its Done reply (sec).
+        """
+        self._add_latency(self.done_trackers, "Done", command_code, latency)
+
+    def get_ack_timeout(self, command_code, default_timeout):
+        """Get the time to wait for an Ack reply.
+
+        Parameters
+        ----------
+        command_code : `CommandCode`
+            Command code.
+        default_timeout : `float`
+            Timeout to use if there are not enough measurements;
+            also the maximum timeout (sec).
+
+        Returns
+        -------
+        timeout : `float`
+            Timeout (sec).
+        """
+        tracker = self.ack_trackers.get(command_code)
+        latency = None if tracker is None else tracker.get_timeout_latency()
+        if latency is None:
+            return default_timeout
+        return min(max(latency, MIN_ACK_TIMEOUT), default_timeout)
+
+    def get_done_timeout(self, command_code, default_timeout):
+        """Get the time to wait for a Done reply,
+        after reading the Ack reply.
+
+        Parameters
+        ----------
+        command_code : `CommandCode`
+            Command code.
+        default_timeout : `float`
+            Timeout to use if there are not enough measurements;
+            also the minimum timeout, and the maximum timeout
+            divided by `MAX_DONE_TIMEOUT_SCALE` (sec).
+
+        Returns
+        -------
+        timeout : `float`
+            Timeout (sec).
+        """
+        tracker = self.done_trackers.get(command_code)
+        latency = None if tracker is None else tracker.get_timeout_latency()
+        if latency is None:
+            return default_timeout
+        return min(
+            max(latency, default_timeout), MAX_DONE_TIMEOUT_SCALE * default_timeout
+        )
+
+    def is_drifting(self, command_code):
+        """Is recent Ack or Done latency for this command code
+        much larger than usual?
+        """
+        return any(
+            trackers[command_code].drifting
+            for trackers in (self.ack_trackers, self.done_trackers)
+            if command_code in trackers
+        )
+
+    def _add_latency(self, trackers, reply_name, command_code, latency):
+        tracker = trackers.get(command_code)
+        if tracker is None:
+            tracker = _LatencyTracker()
+            trackers[command_code] = tracker
+        if not tracker.add(latency):
+            return
+        median_latency = tracker.histogram.quantile(0.5)
+        if tracker.drifting:
+            self.log.warning(
+                f"{reply_name} latency for {command_code!r} is increasing: "
+                f"recent mean latency = {tracker.recent_latency:0.3f} sec; "
+                f"median latency <= {median_latency:0.3f} sec"
+            )
+        else:
+            self.log.info(
+                f"{reply_name} latency for {command_code!r} is back to normal: "
+                f"recent mean latency = {tracker.recent_latency:0.3f} sec; "
+                f"median latency <= {median_latency:0.3f} sec"
+            )
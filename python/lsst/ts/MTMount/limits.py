@@ -19,7 +19,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["Limits", "LimitsDict"]
+__all__ = ["Limits", "LimitsDict", "SetpointValidator", "estimate_slew_time"]
+
+import numpy as np
 
 from . import enums
 
@@ -37,13 +39,19 @@ class Limits:
         Maximum absolute value of velocity (deg/sec)
     max_acceleration : `float`
         Maximum absolute value of acceleration (deg/sec/sec)
+    max_jerk : `float`, optional
+        Maximum absolute value of jerk (deg/sec/sec/sec).
+        If None then jerk is not limited.
     """
 
-    def __init__(self, min_position, max_position, max_velocity, max_acceleration):
+    def __init__(
+        self, min_position, max_position, max_velocity, max_acceleration, max_jerk=None
+    ):
         self.min_position = min_position
         self.max_position = max_position
         self.max_velocity = max_velocity
         self.max_acceleration = max_acceleration
+        self.max_jerk = max_jerk
 
     def scaled(self, factor=1.01):
         """Return a copy scaled by the specified factor.
@@ -57,7 +65,76 @@ class Limits:
             max_position=self.max_position * factor,
             max_velocity=self.max_velocity * factor,
             max_acceleration=self.max_acceleration * factor,
+            max_jerk=None if self.max_jerk is None else self.max_jerk * factor,
+        )
+
+    def move_time(self, start_position, end_position):
+        """Compute the minimum time to move between two positions.
+
+        The move starts and ends at rest, and follows a trapezoidal
+        velocity profile (if ``max_jerk`` is None) or a jerk-limited
+        "S curve" profile (otherwise).
+
+        Parameters
+        ----------
+        start_position : `float` or `numpy.ndarray`
+            Starting position(s) (deg).
+        end_position : `float` or `numpy.ndarray`
+            Ending position(s) (deg).
+            Must be broadcastable with ``start_position``.
+
+        Returns
+        -------
+        duration : `float` or `numpy.ndarray`
+            Duration of each move (sec).
+        """
+        distance = np.abs(
+            np.asarray(end_position, dtype=float)
+            - np.asarray(start_position, dtype=float)
+        )
+        vmax = self.max_velocity
+        amax = self.max_acceleration
+        if self.max_jerk is None:
+            # Distance needed to reach full speed and stop again.
+            full_speed_distance = vmax ** 2 / amax
+            duration = np.where(
+                distance < full_speed_distance,
+                2 * np.sqrt(distance / amax),
+                distance / vmax + vmax / amax,
+            )
+            return duration[()]
+
+        jmax = self.max_jerk
+        # Time to accelerate from rest to full speed (sec).
+        if vmax * jmax >= amax ** 2:
+            accel_time = vmax / amax + amax / jmax
+        else:
+            accel_time = 2 * np.sqrt(vmax / jmax)
+        # Distance needed to reach full speed and stop again.
+        full_speed_distance = vmax * accel_time
+        # Distance at which full acceleration is just reached.
+        full_accel_distance = 2 * amax ** 3 / jmax ** 2
+
+        # Full speed reached
+        cruise_duration = accel_time + distance / vmax
+        # Full acceleration reached, but not full speed; peak velocity
+        # vpeak satisfies: distance = vpeak (vpeak/amax + amax/jmax)
+        ratio = amax / jmax
+        vpeak = 0.5 * amax * (np.sqrt(ratio ** 2 + 4 * distance / amax) - ratio)
+        accel_limited_duration = 2 * (vpeak / amax + ratio)
+        # Neither full speed nor full acceleration reached
+        jerk_limited_duration = 4 * np.cbrt(distance / (2 * jmax))
+
+        duration = np.where(
+            distance >= full_speed_distance,
+            cruise_duration,
+            np.where(
+                distance >= full_accel_distance,
+                accel_limited_duration,
+                jerk_limited_duration,
+            ),
         )
+        return duration[()]
 
 
 LimitsDict = {
@@ -74,3 +151,263 @@ LimitsDict = {
         min_position=-90, max_position=90, max_velocity=4.0, max_acceleration=1.5
     ),
 }
+
+
+class SetpointValidator:
+    """Check position, velocity and acceleration setpoints
+    against the limits of one or more axes.
+
+    All checks are vectorized, so a whole trajectory can be checked
+    about as quickly as a single setpoint.
+
+    Parameters
+    ----------
+    device_ids : `List` [`DeviceId`], optional
+        The axes to check, in the order in which
+        setpoint values are specified.
+    limits_dict : `dict` [`DeviceId`, `Limits`], optional
+        Limits for each axis. If None then use `LimitsDict`.
+
+    Attributes
+    ----------
+    device_ids : `tuple` [`DeviceId`]
+        The ``device_ids`` argument.
+    min_position : `numpy.ndarray`
+        Minimum position of each axis (deg).
+    max_position : `numpy.ndarray`
+        Maximum position of each axis (deg).
+    max_velocity : `numpy.ndarray`
+        Maximum absolute velocity of each axis (deg/sec).
+    max_acceleration : `numpy.ndarray`
+        Maximum absolute acceleration of each axis (deg/sec/sec).
+
+    Notes
+    -----
+    Setpoint arrays have shape (num_axes,) for a single setpoint
+    or (num_setpoints, num_axes) for a sequence of setpoints.
+    The acceleration implied by consecutive setpoints is
+    the change in velocity divided by the change in time.
+    """
+
+    def __init__(
+        self,
+        device_ids=(enums.DeviceId.AZIMUTH_AXIS, enums.DeviceId.ELEVATION_AXIS),
+        limits_dict=None,
+    ):
+        if limits_dict is None:
+            limits_dict = LimitsDict
+        self.device_ids = tuple(device_ids)
+        limits_list = [limits_dict[device_id] for device_id in self.device_ids]
+        self.min_position = np.array([lim.min_position for lim in limits_list])
+        self.max_position = np.array([lim.max_position for lim in limits_list])
+        self.max_velocity = np.array([lim.max_velocity for lim in limits_list])
+        self.max_acceleration = np.array([lim.max_acceleration for lim in limits_list])
+
+    def check_positions(self, position, clip=False):
+        """Check positions against the position limits.
+
+        Parameters
+        ----------
+        position : `numpy.ndarray`
+            Position setpoints (deg).
+        clip : `bool`, optional
+            If True then clip out-of-range positions to the limits.
+            If False then raise `ValueError` if any is out of range.
+
+        Returns
+        -------
+        position : `numpy.ndarray`
+            The positions as a float array; clipped if ``clip`` is True.
+
+        Raises
+        ------
+        ValueError
+            If ``clip`` is False and any position is out of range,
+            or the array has the wrong shape.
+        """
+        position = self._as_setpoint_array(position, "position")
+        if clip:
+            return np.clip(position, self.min_position, self.max_position)
+        bad = (position < self.min_position) | (position > self.max_position)
+        if np.any(bad):
+            index = tuple(np.argwhere(bad)[0])
+            axis = index[-1]
+            raise ValueError(
+                f"{self._axis_name(axis)} position {position[index]} "
+                f"not in range [{self.min_position[axis]}, "
+                f"{self.max_position[axis]}]"
+            )
+        return position
+
+    def check_setpoints(
+        self,
+        tai,
+        position,
+        velocity,
+        previous_tai=None,
+        previous_velocity=None,
+        clip=False,
+    ):
+        """Check tracking setpoints against the position, velocity
+        and acceleration limits.
+
+        Parameters
+        ----------
+        tai : `float` or `numpy.ndarray`
+            TAI time of each setpoint (unix seconds).
+            Must be strictly increasing.
+        position : `numpy.ndarray`
+            Position setpoints (deg).
+        velocity : `numpy.ndarray`
+            Velocity setpoints (deg/sec).
+        previous_tai : `float`, optional
+            TAI time of the setpoint that precedes these (unix seconds).
+            If None then the acceleration of the first setpoint
+            is not checked.
+        previous_velocity : `numpy.ndarray`, optional
+            Velocity of the setpoint that precedes these (deg/sec).
+            Ignored if ``previous_tai`` is None.
+        clip : `bool`, optional
+            If True then clip position and velocity to the limits,
+            then clip velocity so the acceleration between consecutive
+            setpoints is within limits.
+            If False then raise `ValueError` if any limit is exceeded.
+
+        Returns
+        -------
+        position, velocity : `numpy.ndarray`
+            The position and velocity setpoints as float arrays;
+            clipped if ``clip`` is True.
+
+        Raises
+        ------
+        ValueError
+            If ``clip`` is False and any limit is exceeded,
+            the arrays have incompatible shapes,
+            or ``tai`` is not strictly increasing.
+        """
+        position = self.check_positions(position, clip=clip)
+        velocity = self._as_setpoint_array(velocity, "velocity")
+        if velocity.shape != position.shape:
+            raise ValueError(
+                f"velocity shape {velocity.shape} != position shape {position.shape}"
+            )
+        single = position.ndim == 1
+        tai = np.atleast_1d(np.asarray(tai, dtype=float))
+        velocity2d = np.atleast_2d(velocity)
+        if tai.shape != (velocity2d.shape[0],):
+            raise ValueError(
+                f"tai shape {tai.shape} does not match "
+                f"{velocity2d.shape[0]} setpoint(s)"
+            )
+
+        if clip:
+            velocity2d = np.clip(velocity2d, -self.max_velocity, self.max_velocity)
+        else:
+            bad = np.abs(velocity2d) > self.max_velocity
+            if np.any(bad):
+                row, axis = np.argwhere(bad)[0]
+                raise ValueError(
+                    f"{self._axis_name(axis)} velocity {velocity2d[row, axis]} "
+                    f"exceeds maximum {self.max_velocity[axis]}"
+                )
+
+        # Compute the time and velocity steps between consecutive setpoints,
+        # including the step from the previous setpoint, if any.
+        has_previous = previous_tai is not None
+        if has_previous:
+            previous_velocity = self._as_setpoint_array(
+                previous_velocity, "previous_velocity"
+            )
+            all_tai = np.concatenate(([previous_tai], tai))
+            all_velocity = np.vstack((previous_velocity, velocity2d))
+        else:
+            all_tai = tai
+            all_velocity = velocity2d
+        dt = np.diff(all_tai)
+        if np.any(dt <= 0):
+            raise ValueError("tai must be strictly increasing")
+        max_dv = self.max_acceleration * dt[:, np.newaxis]
+        dv = np.diff(all_velocity, axis=0)
+        bad = np.abs(dv) > max_dv
+        if np.any(bad):
+            if clip:
+                # Clipping one velocity affects the next step,
+                # so start at the first bad step and work forward.
+                first_row = np.argwhere(bad)[0][0]
+                for row in range(first_row, len(dt)):
+                    all_velocity[row + 1] = np.clip(
+                        all_velocity[row + 1],
+                        all_velocity[row] - max_dv[row],
+                        all_velocity[row] + max_dv[row],
+                    )
+                velocity2d = all_velocity[1:] if has_previous else all_velocity
+            else:
+                row, axis = np.argwhere(bad)[0]
+                raise ValueError(
+                    f"{self._axis_name(axis)} acceleration "
+                    f"{dv[row, axis] / dt[row]:0.3f} exceeds maximum "
+                    f"{self.max_acceleration[axis]}"
+                )
+        if single:
+            velocity2d = velocity2d[0]
+        return position, velocity2d
+
+    def _as_setpoint_array(self, values, name):
+        """Convert setpoint values to a float array and check the shape.
+        """
+        values = np.array(values, dtype=float)
+        if values.ndim not in (1, 2) or values.shape[-1] != len(self.device_ids):
+            raise ValueError(
+                f"{name} shape {values.shape} must be ({len(self.device_ids)},) "
+                f"or (n, {len(self.device_ids)})"
+            )
+        return values
+
+    def _axis_name(self, axis):
+        """Get the name of the axis with the specified index.
+        """
+        return self.device_ids[axis].name.lower()
+
+
+def estimate_slew_time(
+    start_azimuth, start_elevation, end_azimuth, end_elevation, limits_dict=None
+):
+    """Estimate the time to slew the azimuth and elevation axes.
+
+    The axes move independently, so the slew time is the longer of the
+    move times of the two axes; see `Limits.move_time`.
+
+    Parameters
+    ----------
+    start_azimuth : `float` or `numpy.ndarray`
+        Starting azimuth(s) (deg).
+    start_elevation : `float` or `numpy.ndarray`
+        Starting elevation(s) (deg).
+    end_azimuth : `float` or `numpy.ndarray`
+        Target azimuth(s) (deg).
+    end_elevation : `float` or `numpy.ndarray`
+        Target elevation(s) (deg).
+    limits_dict : `dict` [`DeviceId`, `Limits`], optional
+        Limits for each axis. If None then use `LimitsDict`.
+
+    Returns
+    -------
+    slew_time : `float` or `numpy.ndarray`
+        Estimated slew time(s) (sec). Array arguments are broadcast,
+        so one call can rank many candidate targets.
+
+    Notes
+    -----
+    The estimate assumes both axes start and end at rest,
+    and ignores settling time.
+    """
+    if limits_dict is None:
+        limits_dict = LimitsDict
+    azimuth_time = limits_dict[enums.DeviceId.AZIMUTH_AXIS].move_time(
+        start_position=start_azimuth, end_position=end_azimuth
+    )
+    elevation_time = limits_dict[enums.DeviceId.ELEVATION_AXIS].move_time(
+        start_position=start_elevation, end_position=end_elevation
+    )
+    return np.maximum(azimuth_time, elevation_time)[()]
@@ -19,10 +19,19 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from .clock import *
+from .drive_model import *
+from .ramp import *
 from .axis_device import *
 from .main_power_supply_device import *
 from .mirror_cover_locks_device import *
 from .mirror_covers_device import *
 from .oil_supply_system_device import *
 from .top_end_chiller_device import *
+from .multi_axis_path import *
+from .telemetry_engine import *
+from .telemetry_scheduler import *
+from .telemetry_server import *
+from .command_dispatcher import *
+from .fault_injector import *
 from .controller import *
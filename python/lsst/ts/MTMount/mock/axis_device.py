@@ -23,11 +23,11 @@ __all__ = ["AxisDevice"]
 
 import asyncio
 
-from lsst.ts import salobj
 from lsst.ts import simactuators
 from .. import enums
 from .. import limits
 from .base_device import BaseDevice
+from .drive_model import DriveModelDict
 
 
 class AxisDevice(BaseDevice):
@@ -45,6 +45,18 @@ class AxisDevice(BaseDevice):
         * enums.DeviceId.AZIMUTH_AXIS
         * enums.DeviceId.ELEVATION_AXIS
         * enums.DeviceId.CAMERA_CABLE_WRAP
+    target_callback : ``callable``, optional
+        Function to call whenever the target changes or is cleared;
+        called with this device as the only argument.
+        The mock controller uses this to schedule InPosition replies.
+
+    Attributes
+    ----------
+    drive_model : `DriveModel` or `None`
+        Model of the drives, for the azimuth and elevation axes;
+        None for the camera cable wrap. Use this to fault drives
+        or unbalance current sharing.
+        ``RESET_ALARM`` clears drive faults.
 
     Notes
     -----
@@ -55,7 +67,7 @@ class AxisDevice(BaseDevice):
     Turning on the device also enables it.
     """
 
-    def __init__(self, controller, device_id):
+    def __init__(self, controller, device_id, target_callback=None):
         device_id = enums.DeviceId(device_id)
         device_limits = limits.LimitsDict[device_id].scaled()
         self.enabled = False
@@ -64,6 +76,9 @@ class AxisDevice(BaseDevice):
         # Has a target position been specified?
         # Set True when tracking or moving point to point and False otherwise.
         self.has_target = False
+        self.target_callback = target_callback
+        drive_model = DriveModelDict.get(device_id)
+        self.drive_model = None if drive_model is None else drive_model.copy()
         self.actuator = simactuators.TrackingActuator(
             min_position=device_limits.min_position,
             max_position=device_limits.max_position,
@@ -126,18 +141,28 @@ class AxisDevice(BaseDevice):
         """
         # Provide some slop for non-monotonic clocks, which are
         # sometimes seen when running Docker on macOS.
-        duration = 0.2 + self.end_tai - salobj.current_tai()
-        await asyncio.sleep(duration)
+        duration = 0.2 + self.end_tai - self.clock.tai()
+        await self.clock.sleep(duration)
 
     def supersede_move_command(self):
         """Report the current move command (if any) as superseded.
         """
         self._monitor_move_task.cancel()
 
+    def target_changed(self):
+        """Call the target callback, if any.
+
+        Call this whenever the target or ``has_target`` changes.
+        """
+        if self.target_callback is not None:
+            self.target_callback(self)
+
     def abort(self):
-        self.actuator.abort()
-        self.actuator.stop()
+        tai = self.clock.tai()
+        self.actuator.abort(tai=tai)
+        self.actuator.stop(tai=tai)
         self.has_target = False
+        self.target_changed()
 
     def do_drive_enable(self, command):
         """Enable or disable the drive.
@@ -171,8 +196,9 @@ class AxisDevice(BaseDevice):
         """
         self.assert_enabled()
         self.supersede_move_command()
-        self.actuator.stop()
+        self.actuator.stop(tai=self.clock.tai())
         self.has_target = False
+        self.target_changed()
         # Camera cable wrap enable tracking has an "on" parameter:
         # on=1 means enable tracking, on=0 means pause tracking.
         # Azimuth and elevation enable tracking commands have no parameters;
@@ -189,7 +215,7 @@ class AxisDevice(BaseDevice):
                     "Tracking cannot be paused because tracking is not enabled"
                 )
             self.tracking_paused = True
-            self.actuator.stop()
+            self.actuator.stop(tai=self.clock.tai())
 
     def do_home(self, command):
         """Home the actuator.
@@ -224,21 +250,28 @@ class AxisDevice(BaseDevice):
         if not command.on:
             self.supersede_move_command()
             self.tracking_enabled = False
-            self.actuator.stop()
+            self.actuator.stop(tai=self.clock.tai())
+            self.target_changed()
         super().do_power(command)
         self.enabled = command.on
 
+    def do_reset_alarm(self, command):
+        super().do_reset_alarm(command)
+        if self.drive_model is not None:
+            self.drive_model.clear_faults()
+
     def do_stop(self, command):
         """Stop the actuator.
         """
         self.assert_enabled()
         self.supersede_move_command()
         self.tracking_enabled = False
-        self.actuator.stop()
+        self.actuator.stop(tai=self.clock.tai())
         # I am not sure if this should clear the target.
         # It depends what the real controller reports for the "in position"
         # event when an axis is stopped.
         self.has_target = False
+        self.target_changed()
 
     def do_track(self, command):
         """Specify a tracking target position, velocity, and time.
@@ -254,6 +287,7 @@ class AxisDevice(BaseDevice):
             tai=command.tai, position=command.position, velocity=command.velocity
         )
         self.has_target = True
+        self.target_changed()
 
     def move_point_to_point(self, position, command):
         """Move to the specified position.
@@ -275,9 +309,10 @@ class AxisDevice(BaseDevice):
         self.assert_enabled()
         self.assert_tracking_enabled(False)
         self.supersede_move_command()
-        tai = salobj.current_tai()
+        tai = self.clock.tai()
         self.actuator.set_target(tai=tai, position=position, velocity=0)
         self.has_target = True
+        self.target_changed()
         self.monitor_move_command(command)
         timeout = self.end_tai - tai
         return timeout, self._monitor_move_task
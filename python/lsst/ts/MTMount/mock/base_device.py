@@ -23,6 +23,7 @@ __all__ = ["BaseDevice"]
 
 from .. import enums
 from .. import commands
+from .clock import get_clock
 
 
 class BaseDevice:
@@ -35,6 +36,13 @@ class BaseDevice:
     device_id : `DeviceId`
         Device ID.
 
+    Attributes
+    ----------
+    clock : `RealClock` or `VirtualClock`
+        The controller's clock (or a `RealClock`, if the controller
+        has none). Use this instead of `salobj.current_tai`
+        and `asyncio.sleep`.
+
     Notes
     -----
     Each kind of device must define a (synchronous) do_command method
@@ -69,6 +77,7 @@ class BaseDevice:
         self.device_id = enums.DeviceId(device_id)
         self._device_prefix = self.device_id.name
         self.log = controller.log.getChild(self._device_prefix)
+        self.clock = get_clock(controller)
 
         self._power_on = False
         self.alarm_on = False
@@ -0,0 +1,168 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["RealClock", "VirtualClock", "get_clock"]
+
+import asyncio
+import heapq
+import itertools
+import time
+
+from lsst.ts import salobj
+
+
+class RealClock:
+    """Clock for the mock controller and devices that uses real time.
+    """
+
+    def tai(self):
+        """Get the current TAI time (unix seconds).
+        """
+        return salobj.current_tai()
+
+    async def sleep(self, duration):
+        """Sleep for the specified duration (seconds).
+        """
+        await asyncio.sleep(duration)
+
+
+class VirtualClock:
+    """Simulated clock for the mock controller and devices.
+
+    The clock has two modes:
+
+    * Fast mode (``rate`` specified): simulated time advances
+      continuously at ``rate`` times the rate of real time.
+    * Step mode (``rate`` None): simulated time only advances
+      when you call `advance`. This makes tests deterministic,
+      and they run as fast as the code allows.
+
+    Parameters
+    ----------
+    start_tai : `float`, optional
+        Initial simulated TAI time (unix seconds).
+        If None then use the current TAI time.
+    rate : `float`, optional
+        Rate at which simulated time advances, relative to real time.
+        Must be positive. If None then use step mode.
+
+    Raises
+    ------
+    ValueError
+        If ``rate`` is not None and not positive.
+    """
+
+    def __init__(self, start_tai=None, rate=None):
+        if rate is not None and rate <= 0:
+            raise ValueError(f"rate={rate} must be positive")
+        self.rate = rate
+        self._tai = salobj.current_tai() if start_tai is None else start_tai
+        self._start_monotonic = time.monotonic()
+        # Heap of (wake TAI, sequence number, future) for sleepers
+        # in step mode. The sequence number makes sleepers
+        # with the same wake time wake in the order they started.
+        self._sleepers = []
+        self._sequence_number = itertools.count()
+
+    @property
+    def num_sleepers(self):
+        """Get the number of tasks waiting in `sleep`, in step mode.
+        """
+        return len(self._sleepers)
+
+    def tai(self):
+        """Get the current simulated TAI time (unix seconds).
+        """
+        if self.rate is None:
+            return self._tai
+        return self._tai + self.rate * (time.monotonic() - self._start_monotonic)
+
+    async def sleep(self, duration):
+        """Sleep for the specified duration of simulated time (seconds).
+        """
+        if self.rate is not None:
+            await asyncio.sleep(max(0, duration) / self.rate)
+            return
+        future = asyncio.Future()
+        heapq.heappush(
+            self._sleepers,
+            (self._tai + max(0, duration), next(self._sequence_number), future),
+        )
+        await future
+
+    async def advance(self, duration):
+        """Advance simulated time, waking sleepers in order of wake time.
+
+        Only supported in step mode.
+
+        Parameters
+        ----------
+        duration : `float`
+            Amount by which to advance time (seconds). Must be >= 0.
+
+        Raises
+        ------
+        RuntimeError
+            If not in step mode.
+        ValueError
+            If ``duration`` < 0.
+
+        Notes
+        -----
+        Each time a sleeper is woken, the simulated time is set to
+        its wake time and other tasks are given a chance to run,
+        so that new sleepers they start are handled correctly.
+        """
+        if self.rate is not None:
+            raise RuntimeError("advance is only supported in step mode")
+        if duration < 0:
+            raise ValueError(f"duration={duration} must be >= 0")
+        end_tai = self._tai + duration
+        await self._yield()
+        while self._sleepers and self._sleepers[0][0] <= end_tai:
+            wake_tai, _, future = heapq.heappop(self._sleepers)
+            self._tai = max(self._tai, wake_tai)
+            if not future.done():
+                future.set_result(None)
+            await self._yield()
+        self._tai = end_tai
+
+    async def _yield(self, num_iter=5):
+        """Give other tasks a chance to run.
+
+        Several iterations are needed for a woken task
+        to run to its next sleep.
+        """
+        for i in range(num_iter):
+            await asyncio.sleep(0)
+
+
+def get_clock(controller):
+    """Get the clock used by a mock controller.
+
+    Parameters
+    ----------
+    controller : `Controller`
+        Mock controller. If it has no ``clock`` attribute
+        then return a `RealClock`.
+    """
+    clock = getattr(controller, "clock", None)
+    return RealClock() if clock is None else clock
@@ -0,0 +1,197 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["CommandDispatcher"]
+
+import asyncio
+import collections
+
+# Default number of worker tasks.
+DEFAULT_NUM_WORKERS = 4
+
+# Default maximum number of commands waiting to be handled.
+DEFAULT_MAX_PENDING = 1000
+
+
+class CommandDispatcher:
+    """Handle commands using a fixed pool of worker tasks,
+    preserving the order of commands with the same ordering key.
+
+    Parameters
+    ----------
+    handle_command : ``coroutine``
+        Coroutine that handles one command; called as
+        ``await handle_command(command)``.
+    get_ordering_key : ``callable``
+        Function that returns the ordering key for a command;
+        called as ``get_ordering_key(command)``. Commands with
+        the same key are handled one at a time, in the order submitted.
+        Commands with different keys may be handled concurrently.
+    log : `logging.Logger`
+        Logger.
+    num_workers : `int`, optional
+        Number of worker tasks; the maximum number of commands
+        handled concurrently. Must be >= 1.
+    max_pending : `int`, optional
+        Maximum number of commands waiting to be handled.
+        Must be >= 1. `submit` rejects commands beyond this limit.
+
+    Attributes
+    ----------
+    num_pending : `int`
+        Number of commands waiting to be handled.
+    num_running : `int`
+        Number of commands being handled.
+    num_rejected : `int`
+        Number of commands rejected by `submit`, because too many
+        were pending.
+    monitor_tasks : `set` [`asyncio.Task`]
+        Tasks started by `add_monitor_task` that have not finished.
+
+    Raises
+    ------
+    ValueError
+        If ``num_workers`` or ``max_pending`` < 1.
+
+    Notes
+    -----
+    Handling a command should be quick: typically it starts the command
+    and writes the Ack reply. Use `add_monitor_task` to track tasks
+    that wait for a command to finish, so `close` can cancel them.
+    """
+
+    def __init__(
+        self,
+        handle_command,
+        get_ordering_key,
+        log,
+        num_workers=DEFAULT_NUM_WORKERS,
+        max_pending=DEFAULT_MAX_PENDING,
+    ):
+        if num_workers < 1:
+            raise ValueError(f"num_workers={num_workers} must be >= 1")
+        if max_pending < 1:
+            raise ValueError(f"max_pending={max_pending} must be >= 1")
+        self.handle_command = handle_command
+        self.get_ordering_key = get_ordering_key
+        self.log = log.getChild("CommandDispatcher")
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self.num_pending = 0
+        self.num_running = 0
+        self.num_rejected = 0
+        self.monitor_tasks = set()
+        # Dict of ordering key: deque of pending commands.
+        # A key is present while it has pending or running commands.
+        self._pending_dict = dict()
+        # Queue of ordering keys that have pending commands
+        # and no running command.
+        self._ready_queue = asyncio.Queue()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for i in range(num_workers)
+        ]
+
+    @property
+    def num_in_flight(self):
+        """Get the number of commands pending, running, or being monitored.
+        """
+        return self.num_pending + self.num_running + len(self.monitor_tasks)
+
+    def submit(self, command):
+        """Queue a command to be handled.
+
+        Parameters
+        ----------
+        command : `Command`
+            The command.
+
+        Returns
+        -------
+        accepted : `bool`
+            True if the command was queued, False if it was rejected
+            because ``max_pending`` commands are already pending.
+        """
+        if self.num_pending >= self.max_pending:
+            self.num_rejected += 1
+            return False
+        key = self.get_ordering_key(command)
+        pending = self._pending_dict.get(key)
+        if pending is None:
+            pending = collections.deque()
+            self._pending_dict[key] = pending
+            self._ready_queue.put_nowait(key)
+        pending.append(command)
+        self.num_pending += 1
+        return True
+
+    def add_monitor_task(self, task):
+        """Track a task that monitors a command.
+
+        The task is forgotten when it finishes, and cancelled by `close`.
+        """
+        self.monitor_tasks.add(task)
+        task.add_done_callback(self.monitor_tasks.discard)
+
+    def clear(self):
+        """Discard all pending commands.
+
+        Commands being handled and monitor tasks are not affected.
+        """
+        for pending in self._pending_dict.values():
+            pending.clear()
+        self.num_pending = 0
+
+    async def close(self):
+        """Stop the workers, discard pending commands,
+        and cancel monitor tasks.
+        """
+        self.clear()
+        for task in self._worker_tasks + list(self.monitor_tasks):
+            task.cancel()
+        await asyncio.gather(
+            *self._worker_tasks, *self.monitor_tasks, return_exceptions=True
+        )
+
+    async def _worker(self):
+        """Handle commands for one ordering key at a time.
+        """
+        while True:
+            key = await self._ready_queue.get()
+            pending = self._pending_dict[key]
+            if not pending:
+                # Pending commands were discarded by `clear`.
+                del self._pending_dict[key]
+                continue
+            command = pending.popleft()
+            self.num_pending -= 1
+            self.num_running += 1
+            try:
+                await self.handle_command(command)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.log.exception(f"Failed to handle command {command}")
+            finally:
+                self.num_running -= 1
+                if pending:
+                    self._ready_queue.put_nowait(key)
+                else:
+                    del self._pending_dict[key]
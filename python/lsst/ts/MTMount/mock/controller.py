@@ -23,12 +23,12 @@ __all__ = ["Controller"]
 
 import argparse
 import asyncio
-import json
 import logging
 import signal
 
+import numpy as np
+
 from lsst.ts import salobj
-from lsst.ts import hexrotcomm
 from .. import commands
 from .. import communicator
 from .. import constants
@@ -42,6 +42,27 @@ from .mirror_covers_device import MirrorCoversDevice
 from .mirror_cover_locks_device import MirrorCoverLocksDevice
 from .oil_supply_system_device import OilSupplySystemDevice
 from .top_end_chiller_device import TopEndChillerDevice
+from .clock import RealClock, VirtualClock
+from .multi_axis_path import MultiAxisPath
+from .telemetry_engine import DEFAULT_TELEMETRY_INTERVAL, TelemetryEngine
+from .telemetry_scheduler import TelemetryScheduler
+from .telemetry_server import DEFAULT_MAX_BUFFER_SIZE, TelemetryServer
+from .fault_injector import FaultInjector
+from .command_dispatcher import (
+    DEFAULT_MAX_PENDING,
+    DEFAULT_NUM_WORKERS,
+    CommandDispatcher,
+)
+
+# Time resolution for computing when an axis will be in position (sec).
+IN_POSITION_RESOLUTION = 0.001
+
+# Interval between times at which the actual and target paths of an axis
+# are compared, before refining when the axis gets in position (sec).
+IN_POSITION_SCAN_INTERVAL = 0.05
+
+# Ordering key for azimuth, elevation, and BothAxes commands.
+_AXES_ORDERING_KEY = (enums.DeviceId.AZIMUTH_AXIS, enums.DeviceId.ELEVATION_AXIS)
 
 
 async def wait_tasks(*tasks):
@@ -70,7 +91,7 @@ class Controller:
         Port for reading commands (that the CSC writes).
         The reply port is one greater than the command port.
     telemetry_port : `int`
-        Port for the telemetry server.
+        Port for the telemetry server. Any number of clients may connect.
     log : `logging.Logger`
         Logger.
     reconnect : `bool`, optional
@@ -86,6 +107,50 @@ class Controller:
           other commander. This reflects the real system, because nobody
           can take command from the handheld device. This offers a convenient
           way to test `Command.ASK_FOR_COMMAND` failures.
+    telemetry_interval : `float`, optional
+        Interval between telemetry messages (seconds)
+        for topics not specified in ``telemetry_intervals``.
+        The real controller outputs telemetry at 20-100 Hz.
+    telemetry_intervals : `dict` [`TelemetryTopicId` or `int`, `float`], \
+            optional
+        Interval between telemetry messages (seconds) for specific topics.
+    clock : `RealClock` or `VirtualClock`, optional
+        Clock shared by the controller and its devices.
+        If None then use the clock of ``telemetry_scheduler``, if specified,
+        else a `RealClock`. Specify a `VirtualClock`
+        to run faster than real time or to step time deterministically.
+    telemetry_scheduler : `TelemetryScheduler`, optional
+        Telemetry scheduler. Specify a shared scheduler when running
+        several mock controllers in one process.
+        If None then the controller makes its own.
+    handle_signals : `bool`, optional
+        Close the controller on SIGINT and SIGTERM?
+        Specify False when running several mock controllers
+        in one process, and handle the signals yourself.
+    num_command_workers : `int`, optional
+        Maximum number of commands to handle concurrently.
+    max_pending_commands : `int`, optional
+        Maximum number of received commands waiting to be handled.
+        Commands received beyond this limit are rejected with NoAck.
+    fault_injector : `FaultInjector`, optional
+        Fault injector. If None then make one that injects no faults.
+        Either way, tests can configure ``self.fault_injector``
+        while the controller is running.
+    startup_scale : `float`, optional
+        Scale factor for the startup durations of the oil supply system
+        and top end chiller: 1 for realistic durations, 0 (the default)
+        to start up instantly, which speeds up unit tests.
+        Specify 1 and a fast `VirtualClock` to measure the CSC's
+        enable sequence against realistic startup durations.
+    telemetry_buffer_size : `int`, optional
+        Maximum number of bytes of telemetry buffered for each
+        telemetry client. If a client falls further behind than this,
+        the oldest buffered telemetry is discarded.
+
+    Notes
+    -----
+    Commands are handled by a `CommandDispatcher`. Commands for the same
+    device are handled in the order received; see `get_ordering_key`.
     """
 
     def __init__(
@@ -95,20 +160,46 @@ class Controller:
         log,
         reconnect=False,
         commander=enums.Source.NONE,
+        telemetry_interval=DEFAULT_TELEMETRY_INTERVAL,
+        telemetry_intervals=None,
+        clock=None,
+        telemetry_scheduler=None,
+        handle_signals=True,
+        num_command_workers=DEFAULT_NUM_WORKERS,
+        max_pending_commands=DEFAULT_MAX_PENDING,
+        fault_injector=None,
+        startup_scale=0,
+        telemetry_buffer_size=DEFAULT_MAX_BUFFER_SIZE,
     ):
+        if clock is None:
+            clock = (
+                RealClock()
+                if telemetry_scheduler is None
+                else telemetry_scheduler.clock
+            )
+        self.clock = clock
+        if fault_injector is None:
+            fault_injector = FaultInjector(clock=self.clock)
+        self.fault_injector = fault_injector
         self.command_port = command_port
         self.log = log.getChild("MockController")
         self.reconnect = reconnect
         self.commander = enums.Source(commander)
         self.closing = False
-        self.telemetry_interval = 0.2  # Seconds
-        self.telemetry_server = hexrotcomm.OneClientServer(
+        self.startup_scale = startup_scale
+        self.telemetry_server = TelemetryServer(
             name="MockControllerTelemetry",
             host=salobj.LOCAL_HOST,
             port=telemetry_port,
             log=self.log,
             connect_callback=self.telemetry_connect_callback,
+            max_buffer_size=telemetry_buffer_size,
         )
+        # Does this controller own its telemetry scheduler?
+        self.own_telemetry_scheduler = telemetry_scheduler is None
+        if self.own_telemetry_scheduler:
+            telemetry_scheduler = TelemetryScheduler(log=self.log, clock=self.clock)
+        self.telemetry_scheduler = telemetry_scheduler
 
         # Maximum position and velocity error,
         # below which an axis is considered in position
@@ -116,8 +207,12 @@ class Controller:
         self.max_velocity_error = 0.01  # degrees/second
         # A dict of device_id: in_position
         self.in_position_dict = {
-            enums.DeviceId.AZIMUTH_AXIS: None,
-            enums.DeviceId.ELEVATION_AXIS: None,
+            enums.DeviceId.AZIMUTH_AXIS: False,
+            enums.DeviceId.ELEVATION_AXIS: False,
+        }
+        # A dict of device_id: task that updates in_position_dict
+        self.in_position_tasks = {
+            device_id: salobj.make_done_future() for device_id in self.in_position_dict
         }
 
         self.communicator = None
@@ -130,20 +225,32 @@ class Controller:
         # Dict of DeviceId: mock device
         self.device_dict = {}
         self.add_all_devices()
+        self.telemetry_engine = TelemetryEngine(
+            device_dict=self.device_dict,
+            default_interval=telemetry_interval,
+            intervals=telemetry_intervals,
+        )
         self.command_dict[enums.CommandCode.ASK_FOR_COMMAND] = self.do_ask_for_command
         self.command_dict[enums.CommandCode.BOTH_AXES_MOVE] = self.do_both_axes_move
         self.command_dict[enums.CommandCode.BOTH_AXES_STOP] = self.do_both_axes_stop
         self.command_dict[enums.CommandCode.BOTH_AXES_TRACK] = self.do_both_axes_track
         self.command_dict[enums.CommandCode.SAFETY_RESET] = self.do_safety_reset
+        self.command_dispatcher = CommandDispatcher(
+            handle_command=self.handle_command,
+            get_ordering_key=self.get_ordering_key,
+            log=self.log,
+            num_workers=num_command_workers,
+            max_pending=max_pending_commands,
+        )
 
         self.read_loop_task = asyncio.Future()
-        self.telemetry_task = asyncio.Future()
         self.start_task = asyncio.create_task(self.start())
         self.connect_task = salobj.make_done_future()
         self.done_task = asyncio.Future()
-        loop = asyncio.get_running_loop()
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, self.signal_handler)
+        if handle_signals:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self.signal_handler)
 
     @property
     def connected(self):
@@ -175,74 +282,336 @@ class Controller:
             action="store_true",
             help="Shut down when the the CSC disconnects?",
         )
+        parser.add_argument(
+            "--telemetry-interval",
+            type=float,
+            default=DEFAULT_TELEMETRY_INTERVAL,
+            help="Interval between telemetry messages for each topic (sec).",
+        )
+        parser.add_argument(
+            "--clock-rate",
+            type=float,
+            help="Run the simulation this many times faster than real time. "
+            "If omitted, run in real time.",
+        )
+        parser.add_argument(
+            "--startup-scale",
+            type=float,
+            default=0,
+            help="Scale factor for the startup durations of the oil supply system "
+            "and top end chiller: 1 for realistic durations, 0 to start instantly.",
+        )
+        parser.add_argument(
+            "--num-mounts",
+            type=int,
+            default=1,
+            help="Number of mock TMA controllers to run. "
+            "Mount i uses command port command_port + 2*i "
+            "and telemetry port telemetry_port + i.",
+        )
+        parser.add_argument(
+            "--ack-delay",
+            type=float,
+            nargs=2,
+            metavar=("MIN", "MAX"),
+            help="Delay Ack replies by a random duration in this range (sec).",
+        )
+        parser.add_argument(
+            "--done-delay",
+            type=float,
+            nargs=2,
+            metavar=("MIN", "MAX"),
+            help="Delay Done replies by a random duration in this range (sec). "
+            "This allows Done replies to arrive out of order.",
+        )
+        parser.add_argument(
+            "--drop-probability",
+            type=float,
+            default=0,
+            help="Probability of dropping each Ack, Done, and NoAck reply.",
+        )
+        parser.add_argument(
+            "--telemetry-stall",
+            type=float,
+            nargs=2,
+            metavar=("PERIOD", "DURATION"),
+            help="Stall telemetry for DURATION seconds every PERIOD seconds. "
+            "Telemetry that is due during a stall is written "
+            "in a burst when the stall ends.",
+        )
+        parser.add_argument(
+            "--write-rate",
+            type=float,
+            help="Throttle writing replies and telemetry to this many bytes/second.",
+        )
+        parser.add_argument(
+            "--fault-seed",
+            type=int,
+            help="Seed for the random number generator used to inject faults.",
+        )
         namespace = parser.parse_args()
+        if namespace.num_mounts < 1:
+            parser.error(f"--num-mounts={namespace.num_mounts} must be >= 1")
         log = logging.getLogger("TMASimulator")
         log.setLevel(namespace.loglevel)
         print(
             "Mock TMA controller: "
             f"command_port={namespace.command_port}; "
             f"telemetry_port={namespace.telemetry_port}; "
-            f"reconnect={not namespace.noreconnect}"
+            f"reconnect={not namespace.noreconnect}; "
+            f"telemetry_interval={namespace.telemetry_interval}; "
+            f"clock_rate={namespace.clock_rate}; "
+            f"num_mounts={namespace.num_mounts}"
         )
-        mock_controller = cls(
-            command_port=namespace.command_port,
-            telemetry_port=namespace.telemetry_port,
-            log=log,
-            reconnect=not namespace.noreconnect,
+        clock = (
+            None
+            if namespace.clock_rate is None
+            else VirtualClock(rate=namespace.clock_rate)
+        )
+        try:
+            mock_controllers = cls.make_many(
+                num_mounts=namespace.num_mounts,
+                command_port=namespace.command_port,
+                telemetry_port=namespace.telemetry_port,
+                log=log,
+                reconnect=not namespace.noreconnect,
+                telemetry_interval=namespace.telemetry_interval,
+                clock=clock,
+                startup_scale=namespace.startup_scale,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        telemetry_stall_period, telemetry_stall_duration = (
+            (None, 0)
+            if namespace.telemetry_stall is None
+            else namespace.telemetry_stall
         )
+        for i, mock_controller in enumerate(mock_controllers):
+            mock_controller.fault_injector = FaultInjector(
+                clock=mock_controller.clock,
+                seed=None if namespace.fault_seed is None else namespace.fault_seed + i,
+                ack_delay=namespace.ack_delay,
+                done_delay=namespace.done_delay,
+                drop_probability=namespace.drop_probability,
+                telemetry_stall_period=telemetry_stall_period,
+                telemetry_stall_duration=telemetry_stall_duration,
+                write_rate=namespace.write_rate,
+            )
+
+        def signal_handler():
+            for mock_controller in mock_controllers:
+                asyncio.create_task(mock_controller.close())
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, signal_handler)
         try:
             print("Mock TMA controller starting")
-            await mock_controller.start_task
+            await asyncio.gather(
+                *[mock_controller.start_task for mock_controller in mock_controllers]
+            )
             print("Mock TMA controller running")
-            await mock_controller.done_task
+            await asyncio.gather(
+                *[mock_controller.done_task for mock_controller in mock_controllers]
+            )
         except asyncio.CancelledError:
             print("Mock TMA controller done")
         except Exception as e:
             print(f"Mock TMA controller failed: {e!r}")
 
+    @classmethod
+    def make_many(cls, num_mounts, command_port, telemetry_port, log, **kwargs):
+        """Make mock controllers that share one telemetry scheduler.
+
+        Parameters
+        ----------
+        num_mounts : `int`
+            Number of mock controllers to make.
+        command_port : `int`
+            Command port for the first controller.
+            Controller i uses command port ``command_port + 2*i``
+            and reply port ``command_port + 2*i + 1``.
+        telemetry_port : `int`
+            Telemetry port for the first controller.
+            Controller i uses telemetry port ``telemetry_port + i``.
+        log : `logging.Logger`
+            Logger. If ``num_mounts`` > 1 then controller i
+            uses a child logger named "Mount{i}".
+        **kwargs : `dict`
+            Additional arguments for the constructor,
+            except ``telemetry_scheduler`` and ``handle_signals``.
+            Specify ``clock`` to share a `VirtualClock`.
+
+        Returns
+        -------
+        controllers : `List` [`Controller`]
+            The mock controllers. The caller is responsible for
+            closing them on SIGINT and SIGTERM.
+
+        Raises
+        ------
+        ValueError
+            If ``num_mounts`` < 1 or the command/reply and telemetry
+            port ranges overlap.
+        """
+        if num_mounts < 1:
+            raise ValueError(f"num_mounts={num_mounts} must be >= 1")
+        command_ports = set(range(command_port, command_port + 2 * num_mounts))
+        telemetry_ports = set(range(telemetry_port, telemetry_port + num_mounts))
+        if command_ports & telemetry_ports:
+            raise ValueError(
+                f"Command/reply ports {min(command_ports)}-{max(command_ports)} "
+                f"overlap telemetry ports {min(telemetry_ports)}-{max(telemetry_ports)}"
+            )
+        telemetry_scheduler = TelemetryScheduler(
+            log=log, clock=kwargs.pop("clock", None)
+        )
+        return [
+            cls(
+                command_port=command_port + 2 * i,
+                telemetry_port=telemetry_port + i,
+                log=log if num_mounts == 1 else log.getChild(f"Mount{i}"),
+                telemetry_scheduler=telemetry_scheduler,
+                handle_signals=False,
+                **kwargs,
+            )
+            for i in range(num_mounts)
+        ]
+
     def telemetry_connect_callback(self, server):
         """Called when a client connects to or disconnects from
         the telemetry port.
+
+        Telemetry is written while at least one client is connected.
         """
-        self.telemetry_task.cancel()
-        if server.connected:
-            self.log.info("Telemetry server connected; start telemetry loop")
-            self.telemetry_task = asyncio.create_task(self.telemetry_loop())
+        if server.connected and not self.closing:
+            self.log.info(
+                f"{server.num_clients} telemetry client(s) connected; "
+                "writing telemetry"
+            )
+            self.telemetry_scheduler.add(self)
         else:
-            self.log.info("Telemetry server disconnected; stop telemetry loop")
-
-    async def put_axis_telemetry(self, device_id, tai):
-        """Warning: this minimal and simplistic."""
-        topic_id = {
-            enums.DeviceId.AZIMUTH_AXIS: enums.TelemetryTopicId.AZIMUTH,
-            enums.DeviceId.ELEVATION_AXIS: enums.TelemetryTopicId.ELEVATION,
-        }[device_id]
-        device = self.device_dict[device_id]
+            self.log.info("No telemetry clients connected; stop writing telemetry")
+            self.telemetry_scheduler.remove(self)
+
+    def compute_in_position_tai(self, device, tai):
+        """Compute when an axis will be in position.
+
+        An axis is in position when it has a target and the position and
+        velocity errors are less than ``max_position_error`` and
+        ``max_velocity_error``, respectively.
+
+        Parameters
+        ----------
+        device : `AxisDevice`
+            Azimuth or elevation axis device.
+        tai : `float`
+            Current TAI (unix seconds).
+
+        Returns
+        -------
+        in_position_tai : `float` or `None`
+            The earliest time >= ``tai`` from which the axis
+            stays in position (TAI unix seconds),
+            to within `IN_POSITION_RESOLUTION`;
+            None if the axis has no target or never gets in position.
+
+        Notes
+        -----
+        The actual and target paths are compared from ``tai``
+        to the end of the actual path, which then follows the target:
+        every `IN_POSITION_SCAN_INTERVAL` and at the start of each path
+        segment. The time at which the axis gets in position is then
+        refined by bisection, between the last time the axis is not
+        in position and the next time.
+        """
+        if not device.has_target:
+            return None
         actuator = device.actuator
-        target = actuator.target.at(tai)
-        actual = actuator.path.at(tai)
-
-        data_dict = {
-            "topicID": topic_id,
-            "angleActual": actual.position,
-            "angleSet": target.position,
-            "velocityActual": actual.velocity,
-            "velocitySet": target.velocity,
-            "accelerationActual": actual.acceleration,
-            # Torque is arbitrary; I have no idea
-            # what realistic values are.
-            "torqueActual": actual.acceleration / 10,
-            "timestamp": tai,
-        }
-        await self.write_telemetry(data_dict)
-
-        # Write the InPosition TCP/IP message, if command/event
-        # communicator connected.
-        in_position = (
-            device.has_target
-            and abs(target.position - actual.position) < self.max_position_error
-            and abs(target.velocity - actual.velocity) < self.max_velocity_error
+        end_tai = max(tai, device.end_tai)
+        multi_axis_path = MultiAxisPath([actuator.path, actuator.target])
+
+        def get_in_band(times):
+            position, velocity, _ = multi_axis_path.at(times)
+            return (np.abs(position[0] - position[1]) < self.max_position_error) & (
+                np.abs(velocity[0] - velocity[1]) < self.max_velocity_error
+            )
+
+        segment_tais = multi_axis_path.tai.ravel()
+        times = np.unique(
+            np.concatenate(
+                (
+                    np.arange(tai, end_tai, IN_POSITION_SCAN_INTERVAL),
+                    segment_tais[(segment_tais > tai) & (segment_tais < end_tai)],
+                    [end_tai],
+                )
+            )
         )
+        in_band = get_in_band(times)
+        if not in_band[-1]:
+            return None
+        out_of_band_indices = np.nonzero(~in_band)[0]
+        if len(out_of_band_indices) == 0:
+            return tai
+        index = out_of_band_indices[-1]
+        out_of_band_tai = times[index]
+        in_band_tai = times[index + 1]
+        while in_band_tai - out_of_band_tai > IN_POSITION_RESOLUTION:
+            mid_tai = (out_of_band_tai + in_band_tai) / 2
+            if get_in_band(mid_tai):
+                in_band_tai = mid_tai
+            else:
+                out_of_band_tai = mid_tai
+        return float(in_band_tai)
+
+    def axis_target_changed(self, device):
+        """Schedule InPosition replies for an axis whose target changed.
+
+        Called by the azimuth and elevation `AxisDevice`.
+        """
+        device_id = device.device_id
+        self.in_position_tasks[device_id].cancel()
+        tai = self.clock.tai()
+        in_position_tai = self.compute_in_position_tai(device=device, tai=tai)
+        self.in_position_tasks[device_id] = asyncio.create_task(
+            self._schedule_in_position(
+                device_id=device_id, tai=tai, in_position_tai=in_position_tai
+            )
+        )
+
+    async def _schedule_in_position(self, device_id, tai, in_position_tai):
+        """Report an axis as not in position (if it will not be in position
+        now), then in position at the specified time (if not None).
+        """
+        if in_position_tai is None or in_position_tai > tai:
+            await self.set_in_position(device_id=device_id, in_position=False)
+        if in_position_tai is not None:
+            delay = in_position_tai - self.clock.tai()
+            if delay > 0:
+                await self.clock.sleep(delay)
+            await self.set_in_position(device_id=device_id, in_position=True)
+
+    async def write_in_position_replies(self):
+        """Write an InPosition reply for each axis.
+        """
+        for device_id, in_position in self.in_position_dict.items():
+            what = {enums.DeviceId.AZIMUTH_AXIS: 0, enums.DeviceId.ELEVATION_AXIS: 1}[
+                device_id
+            ]
+            reply = replies.InPositionReply(what=what, in_position=in_position)
+            await self.write_reply(reply)
+
+    async def set_in_position(self, device_id, in_position):
+        """Set the in-position state of an axis and, if it changed,
+        write an InPosition reply.
+
+        Parameters
+        ----------
+        device_id : `DeviceId`
+            Axis: one of `DeviceId.AZIMUTH_AXIS` or `DeviceId.ELEVATION_AXIS`.
+        in_position : `bool`
+            Is the axis in position?
+        """
         if in_position != self.in_position_dict[device_id]:
             self.in_position_dict[device_id] = in_position
             what = {enums.DeviceId.AZIMUTH_AXIS: 0, enums.DeviceId.ELEVATION_AXIS: 1}[
@@ -250,49 +619,30 @@ class Controller:
             ]
             if self.connected:
                 reply = replies.InPositionReply(what=what, in_position=in_position)
-                await self.communicator.write(reply)
+                await self.write_reply(reply)
 
-    async def put_camera_cable_wrap_telemetry(self, tai):
-        """Warning: this minimal and simplistic."""
-        device = self.device_dict[enums.DeviceId.CAMERA_CABLE_WRAP]
-        actuator = device.actuator
-        actual = actuator.path.at(tai)
-
-        data_dict = dict(
-            topicID=enums.TelemetryTopicId.CAMERA_CABLE_WRAP,
-            angle=actual.position,
-            speed=actual.velocity,
-            acceleration=actual.acceleration,
-            timestamp=tai,
-        )
-        await self.write_telemetry(data_dict)
+    async def write_telemetry(self, tai):
+        """Write the telemetry that is due.
 
-    async def write_telemetry(self, data_dict):
-        data_str = json.dumps(data_dict)
-        self.telemetry_server.writer.write(data_str.encode() + b"\r\n")
-        await self.telemetry_server.writer.drain()
+        Called by the telemetry scheduler. All telemetry messages
+        that are due are encoded once and queued in a single write
+        to every telemetry client, to reduce overhead at high rates.
+        This does not wait for the data to be written,
+        so a slow client cannot delay telemetry.
 
-    async def telemetry_loop(self):
-        """Warning: this minimal and simplistic."""
-        try:
-            while self.telemetry_server.connected:
-                tai = salobj.current_tai()
-                await self.put_axis_telemetry(
-                    device_id=enums.DeviceId.AZIMUTH_AXIS, tai=tai
-                )
-                await self.put_axis_telemetry(
-                    device_id=enums.DeviceId.ELEVATION_AXIS, tai=tai
-                )
-                await self.put_camera_cable_wrap_telemetry(tai=tai)
-                await asyncio.sleep(self.telemetry_interval)
-        except ConnectionResetError:
-            self.log.warning("Disconnected")
-        except asyncio.CancelledError:
-            self.log.info("Telemetry loop cancelled")
-            pass
-        except Exception:
-            self.log.exception("Telemetry loop failed")
-            raise
+        Parameters
+        ----------
+        tai : `float`
+            Current TAI (unix seconds).
+        """
+        if not self.telemetry_server.connected:
+            raise ConnectionResetError("Telemetry client not connected")
+        data = self.fault_injector.filter_telemetry(
+            tai=tai, data=self.telemetry_engine.encode(tai)
+        )
+        if data:
+            self.telemetry_server.write(data)
+            await self.fault_injector.throttle(len(data))
 
     def add_all_devices(self):
         """Add all mock devices.
@@ -307,14 +657,18 @@ class Controller:
         for device_id in (
             enums.DeviceId.ELEVATION_AXIS,
             enums.DeviceId.AZIMUTH_AXIS,
-            enums.DeviceId.CAMERA_CABLE_WRAP,
         ):
-            self.add_device(AxisDevice, device_id=device_id)
+            self.add_device(
+                AxisDevice,
+                device_id=device_id,
+                target_callback=self.axis_target_changed,
+            )
+        self.add_device(AxisDevice, device_id=enums.DeviceId.CAMERA_CABLE_WRAP)
         self.add_device(MainPowerSupplyDevice)
         self.add_device(MirrorCoverLocksDevice)
         self.add_device(MirrorCoversDevice)
-        self.add_device(OilSupplySystemDevice)
-        self.add_device(TopEndChillerDevice)
+        self.add_device(OilSupplySystemDevice, startup_scale=self.startup_scale)
+        self.add_device(TopEndChillerDevice, startup_scale=self.startup_scale)
 
     def add_device(self, device_class, **kwargs):
         """Add a mock device.
@@ -354,6 +708,7 @@ class Controller:
         self.command_queue = None
 
     async def start(self):
+        await self.telemetry_server.start_task
         self.connect_task = asyncio.create_task(self.connect())
 
     async def connect(self):
@@ -385,6 +740,7 @@ class Controller:
             self.log.debug("Connecting to the CSC")
             await self.communicator.connect()
             self.log.debug("Connected")
+            await self.write_in_position_replies()
             self.read_loop_task = asyncio.create_task(self.read_loop())
         except asyncio.CancelledError:
             self.log.info("Connection cancelled")
@@ -408,11 +764,17 @@ class Controller:
         try:
             self.closing = True
             self.read_loop_task.cancel()
-            self.telemetry_task.cancel()
+            self.telemetry_scheduler.remove(self)
+            if self.own_telemetry_scheduler:
+                await self.telemetry_scheduler.close()
             self.connect_task.cancel()
             self.start_task.cancel()
+            await self.command_dispatcher.close()
+            for task in self.in_position_tasks.values():
+                task.cancel()
             for device in self.device_dict.values():
                 await device.close()
+            await self.telemetry_server.close()
             if self.communicator is not None:
                 await self.communicator.close()
         except Exception:
@@ -454,10 +816,34 @@ class Controller:
         else:
             timeout, task = timeout_task
             await self.write_ack(command, timeout=timeout)
-            # Do not bother to save the task because `Controller.close` calls
-            # `BaseDevice.close` on each mock device, which cancels the task
-            # that `Controller.monitor_command` is awaiting.
-            asyncio.create_task(self.monitor_command(command=command, task=task))
+            self.command_dispatcher.add_monitor_task(
+                asyncio.create_task(self.monitor_command(command=command, task=task))
+            )
+
+    def get_ordering_key(self, command):
+        """Get the ordering key for a command.
+
+        Commands with the same key are handled in the order received.
+
+        Returns
+        -------
+        key : `DeviceId`, `tuple` [`DeviceId`], or `None`
+            * The device ID for a command handled by a mock device,
+              except as follows.
+            * ``(DeviceId.AZIMUTH_AXIS, DeviceId.ELEVATION_AXIS)``
+              for commands for either of those axes, or both,
+              because the BothAxes commands affect both axes.
+            * None for all other commands.
+        """
+        command_func = self.command_dict.get(command.command_code)
+        device_id = getattr(getattr(command_func, "__self__", None), "device_id", None)
+        if device_id in _AXES_ORDERING_KEY or command.command_code in (
+            enums.CommandCode.BOTH_AXES_MOVE,
+            enums.CommandCode.BOTH_AXES_STOP,
+            enums.CommandCode.BOTH_AXES_TRACK,
+        ):
+            return _AXES_ORDERING_KEY
+        return device_id
 
     async def read_loop(self):
         self.log.debug("Read loop begins")
@@ -466,11 +852,17 @@ class Controller:
                 command = await self.communicator.read()
                 if self.command_queue and not self.command_queue.full():
                     self.command_queue.put_nowait(command)
-                asyncio.create_task(self.handle_command(command))
+                if not self.command_dispatcher.submit(command):
+                    await self.write_noack(
+                        command=command,
+                        explanation=f"Too many commands pending; "
+                        f"max_pending={self.command_dispatcher.max_pending}",
+                    )
         except asyncio.CancelledError:
             pass
         except (ConnectionResetError, asyncio.IncompleteReadError):
             self.log.warning("Connection lost")
+            self.command_dispatcher.clear()
             if self.closing:
                 return
             if self.reconnect:
@@ -596,7 +988,8 @@ class Controller:
             source=command.source,
             timeout_ms=int(timeout * 1000),
         )
-        await self.communicator.write(reply)
+        await self.fault_injector.delay_ack()
+        await self.write_reply(reply)
 
     async def write_done(self, command):
         """Report a command as done.
@@ -609,7 +1002,8 @@ class Controller:
         reply = replies.DoneReply(
             sequence_id=command.sequence_id, source=command.source,
         )
-        await self.communicator.write(reply)
+        await self.fault_injector.delay_done()
+        await self.write_reply(reply)
 
     async def write_noack(self, command, explanation):
         """Report a command as failed.
@@ -626,4 +1020,19 @@ class Controller:
             source=command.source,
             explanation=explanation,
         )
+        await self.write_reply(reply)
+
+    async def write_reply(self, reply):
+        """Write a reply, unless the fault injector drops it.
+
+        Parameters
+        ----------
+        reply : `Reply`
+            Reply to write.
+        """
+        if self.fault_injector.should_drop(reply):
+            self.log.info(f"Dropping reply {reply}, as requested")
+            return
         await self.communicator.write(reply)
+        if self.fault_injector.write_rate is not None:
+            await self.fault_injector.throttle(len(reply.encode()))
@@ -0,0 +1,227 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "DriveModel",
+    "DriveModelDict",
+    "NUM_AZIMUTH_DRIVES",
+    "NUM_ELEVATION_DRIVES",
+]
+
+import numpy as np
+
+from .. import enums
+
+# Number of azimuth and elevation drives.
+# These must match the telemetry client.
+NUM_AZIMUTH_DRIVES = 16
+NUM_ELEVATION_DRIVES = 12
+
+
+class DriveModel:
+    """Model the drives of an axis.
+
+    The torque needed to move the axis is shared between
+    the drives that are not faulted, in proportion to their weights.
+    The torque of each drive is limited to ``max_torque``
+    and the current of each drive is proportional to its torque.
+
+    Parameters
+    ----------
+    num_drives : `int`
+        Number of drives.
+    inertia : `float`
+        Moment of inertia of the axis (kg m2).
+    viscous_friction : `float`
+        Torque per unit velocity (N m/(deg/sec)).
+    coulomb_friction : `float`
+        Torque opposing motion, regardless of velocity (N m).
+    max_torque : `float`
+        Maximum absolute torque of each drive (N m).
+    torque_constant : `float`
+        Torque per unit current of each drive (N m/A).
+
+    Attributes
+    ----------
+    weights : `numpy.ndarray`
+        Relative share of torque for each drive. Initially all 1.
+        Change it to model unbalanced current sharing.
+    faulted : `numpy.ndarray`
+        Is each drive faulted? A faulted drive produces no torque.
+        Initially all False.
+
+    Notes
+    -----
+    Warning: the parameters in `DriveModelDict` are rough guesses.
+    """
+
+    def __init__(
+        self,
+        num_drives,
+        inertia,
+        viscous_friction,
+        coulomb_friction,
+        max_torque,
+        torque_constant,
+    ):
+        if num_drives < 1:
+            raise ValueError(f"num_drives={num_drives} must be >= 1")
+        self.num_drives = num_drives
+        self.inertia = inertia
+        self.viscous_friction = viscous_friction
+        self.coulomb_friction = coulomb_friction
+        self.max_torque = max_torque
+        self.torque_constant = torque_constant
+        self.weights = np.ones(num_drives)
+        self.faulted = np.zeros(num_drives, dtype=bool)
+
+    def copy(self):
+        """Return a copy with all weights 1 and no drives faulted.
+        """
+        return DriveModel(
+            num_drives=self.num_drives,
+            inertia=self.inertia,
+            viscous_friction=self.viscous_friction,
+            coulomb_friction=self.coulomb_friction,
+            max_torque=self.max_torque,
+            torque_constant=self.torque_constant,
+        )
+
+    def set_fault(self, index, faulted=True):
+        """Set or clear the fault state of one or more drives.
+
+        Parameters
+        ----------
+        index : `int` or `List` [`int`]
+            Index or indices of the drive(s) (0-based).
+        faulted : `bool`, optional
+            Fault state.
+        """
+        self.faulted[index] = faulted
+
+    def clear_faults(self):
+        """Clear the fault state of all drives.
+        """
+        self.faulted[:] = False
+
+    def get_demanded_torque(self, velocity, acceleration):
+        """Get the total torque needed for the specified motion.
+
+        Parameters
+        ----------
+        velocity : `float` or `numpy.ndarray`
+            Velocity (deg/sec).
+        acceleration : `float` or `numpy.ndarray`
+            Acceleration (deg/sec/sec).
+
+        Returns
+        -------
+        torque : `float` or `numpy.ndarray`
+            Total torque (N m).
+        """
+        return (
+            self.inertia * np.radians(acceleration)
+            + self.viscous_friction * np.asarray(velocity)
+            + self.coulomb_friction * np.sign(velocity)
+        )
+
+    def get_torques(self, velocity, acceleration):
+        """Get the torque of each drive.
+
+        Parameters
+        ----------
+        velocity : `float` or `numpy.ndarray`
+            Velocity (deg/sec), at one time or a block of times.
+        acceleration : `float` or `numpy.ndarray`
+            Acceleration (deg/sec/sec); same shape as ``velocity``.
+
+        Returns
+        -------
+        torques : `numpy.ndarray`
+            Torque of each drive (N m). If ``velocity`` is a scalar
+            then the shape is (num_drives,), else (num_drives, num times).
+        """
+        demanded_torque = self.get_demanded_torque(
+            velocity=velocity, acceleration=acceleration
+        )
+        weights = np.where(self.faulted, 0, self.weights)
+        total_weight = weights.sum()
+        if total_weight <= 0:
+            return np.zeros((self.num_drives,) + np.shape(demanded_torque))
+        torques = np.multiply.outer(weights / total_weight, demanded_torque)
+        return np.clip(torques, -self.max_torque, self.max_torque)
+
+    def get_currents(self, velocity, acceleration):
+        """Get the current of each drive.
+
+        Parameters and shape are as for `get_torques`.
+
+        Returns
+        -------
+        currents : `numpy.ndarray`
+            Current of each drive (A).
+        """
+        return (
+            self.get_torques(velocity=velocity, acceleration=acceleration)
+            / self.torque_constant
+        )
+
+    def is_saturated(self, velocity, acceleration):
+        """Are the drives unable to provide the demanded torque?
+
+        Parameters are as for `get_torques`.
+
+        Returns
+        -------
+        saturated : `bool` or `numpy.ndarray`
+            True if the total torque of the drives is less than
+            the demanded torque, at each time.
+        """
+        torques = self.get_torques(velocity=velocity, acceleration=acceleration)
+        demanded_torque = self.get_demanded_torque(
+            velocity=velocity, acceleration=acceleration
+        )
+        return ~np.isclose(torques.sum(axis=0), demanded_torque)
+
+
+# Drive models for the azimuth and elevation axes.
+# Warning: the parameters are rough guesses. The inertia and
+# maximum torque were chosen so that maximum acceleration
+# at maximum velocity uses about 80% of the available torque,
+# and the torque constant so that the maximum current is 100 A.
+DriveModelDict = {
+    enums.DeviceId.AZIMUTH_AXIS: DriveModel(
+        num_drives=NUM_AZIMUTH_DRIVES,
+        inertia=2.7e7,
+        viscous_friction=2.0e4,
+        coulomb_friction=2.0e4,
+        max_torque=2.7e5,
+        torque_constant=2700,
+    ),
+    enums.DeviceId.ELEVATION_AXIS: DriveModel(
+        num_drives=NUM_ELEVATION_DRIVES,
+        inertia=1.0e7,
+        viscous_friction=1.0e4,
+        coulomb_friction=1.0e4,
+        max_torque=6.8e4,
+        torque_constant=680,
+    ),
+}
@@ -0,0 +1,211 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["FaultInjector"]
+
+import random
+
+from .. import enums
+from .clock import RealClock
+
+
+class FaultInjector:
+    """Inject latency and faults into the mock controller.
+
+    All faults are disabled by default. Set the attributes directly
+    (or specify them as constructor arguments) to enable them.
+
+    Parameters
+    ----------
+    clock : `RealClock` or `VirtualClock`, optional
+        Clock used for delays and telemetry stalls.
+        If None then use a `RealClock`.
+    seed : `int`, optional
+        Seed for the random number generator.
+        Specify to make faults repeatable.
+    **kwargs : `dict`
+        Initial values for any of the attributes listed below.
+
+    Attributes
+    ----------
+    ack_delay : delay, optional
+        Delay before writing each Ack reply. See Notes for the format.
+    done_delay : delay, optional
+        Delay before writing each Done reply. Random delays
+        allow Done replies to arrive in a different order
+        than the commands were issued.
+    drop_probability : `float`
+        Probability of not writing a reply whose code
+        is in ``drop_reply_codes``, in range [0, 1].
+    drop_reply_codes : `set` [`ReplyCode`]
+        Codes of replies that may be dropped.
+        Defaults to Ack, Done, and NoAck.
+    telemetry_stall_period : `float`, optional
+        If not None, stall telemetry for ``telemetry_stall_duration``
+        seconds at the start of each period of this many seconds.
+    telemetry_stall_duration : `float`
+        Duration of each periodic telemetry stall (seconds).
+    telemetry_burst : `bool`
+        If True then telemetry that is due during a stall is held
+        and written in a single burst when the stall ends.
+        If False then it is discarded.
+    write_rate : `float`, optional
+        If not None, throttle writing replies and telemetry
+        to approximately this many bytes/second.
+    num_dropped : `int`
+        Number of replies dropped.
+
+    Raises
+    ------
+    ValueError
+        If an attribute is specified that does not exist.
+
+    Notes
+    -----
+    A delay may be specified as:
+
+    * None: no delay.
+    * A `float`: a fixed delay (seconds).
+    * A pair of `float`: a delay uniformly distributed in this range.
+    * A callable: called with a `random.Random` as its only argument;
+      it returns the delay (seconds). For example, for an exponential
+      distribution with mean 0.1 seconds:
+      ``lambda rng: rng.expovariate(10)``.
+    """
+
+    def __init__(self, clock=None, seed=None, **kwargs):
+        self.clock = RealClock() if clock is None else clock
+        self.random = random.Random(seed)
+        self.ack_delay = None
+        self.done_delay = None
+        self.drop_probability = 0
+        self.drop_reply_codes = {
+            enums.ReplyCode.ACK,
+            enums.ReplyCode.DONE,
+            enums.ReplyCode.NOACK,
+        }
+        self.telemetry_stall_period = None
+        self.telemetry_stall_duration = 0
+        self.telemetry_burst = True
+        self.write_rate = None
+        self.num_dropped = 0
+        for name, value in kwargs.items():
+            if not hasattr(self, name):
+                raise ValueError(f"Unknown fault attribute {name!r}")
+            setattr(self, name, value)
+        # TAI at which a stall started by `stall_telemetry` ends.
+        self._stall_end_tai = 0
+        # Telemetry held during a stall.
+        self._held_telemetry = []
+
+    def get_delay(self, delay):
+        """Get a delay (seconds) from a delay specification.
+
+        See Notes in the class doc string for the format.
+        """
+        if delay is None:
+            return 0
+        if callable(delay):
+            value = delay(self.random)
+        elif isinstance(delay, (tuple, list)):
+            value = self.random.uniform(*delay)
+        else:
+            value = delay
+        return max(0, value)
+
+    async def delay_ack(self):
+        """Sleep for the Ack delay, if any.
+        """
+        delay = self.get_delay(self.ack_delay)
+        if delay > 0:
+            await self.clock.sleep(delay)
+
+    async def delay_done(self):
+        """Sleep for the Done delay, if any.
+        """
+        delay = self.get_delay(self.done_delay)
+        if delay > 0:
+            await self.clock.sleep(delay)
+
+    def should_drop(self, reply):
+        """Return True if a reply should be dropped.
+        """
+        if (
+            self.drop_probability <= 0
+            or reply.reply_code not in self.drop_reply_codes
+            or self.random.random() >= self.drop_probability
+        ):
+            return False
+        self.num_dropped += 1
+        return True
+
+    def stall_telemetry(self, duration):
+        """Stall telemetry for the specified duration (seconds).
+
+        This is in addition to periodic stalls.
+        """
+        self._stall_end_tai = self.clock.tai() + duration
+
+    def telemetry_stalled(self, tai):
+        """Return True if telemetry is stalled at the specified TAI.
+        """
+        if tai < self._stall_end_tai:
+            return True
+        if self.telemetry_stall_period is None:
+            return False
+        return tai % self.telemetry_stall_period < self.telemetry_stall_duration
+
+    def filter_telemetry(self, tai, data):
+        """Get the telemetry to write now.
+
+        Parameters
+        ----------
+        tai : `float`
+            Current TAI (unix seconds).
+        data : `bytes`
+            Telemetry that is due.
+
+        Returns
+        -------
+        data : `bytes`
+            Telemetry to write: empty during a stall;
+            otherwise ``data`` preceded by any held telemetry.
+        """
+        if self.telemetry_stalled(tai):
+            if self.telemetry_burst and data:
+                self._held_telemetry.append(data)
+            return b""
+        if self._held_telemetry:
+            self._held_telemetry.append(data)
+            data = b"".join(self._held_telemetry)
+            self._held_telemetry = []
+        return data
+
+    async def throttle(self, num_bytes):
+        """Sleep long enough to limit the write rate, if specified.
+
+        Parameters
+        ----------
+        num_bytes : `int`
+            Number of bytes just written.
+        """
+        if self.write_rate is not None and num_bytes > 0:
+            await self.clock.sleep(num_bytes / self.write_rate)
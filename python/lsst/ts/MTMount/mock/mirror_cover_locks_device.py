@@ -64,4 +64,4 @@ class MirrorCoverLocksDevice(PointToPointDevice):
         """Stop the actuator.
         """
         self.supersede_move_command()
-        self.actuator.stop()
+        self.actuator.stop(tai=self.clock.tai())
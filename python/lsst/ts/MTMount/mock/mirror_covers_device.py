@@ -66,4 +66,4 @@ class MirrorCoversDevice(PointToPointDevice):
         """Stop the actuator.
         """
         self.supersede_move_command()
-        self.actuator.stop()
+        self.actuator.stop(tai=self.clock.tai())
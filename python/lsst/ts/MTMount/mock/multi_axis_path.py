@@ -0,0 +1,120 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["MultiAxisPath"]
+
+import numpy as np
+
+from lsst.ts import simactuators
+
+
+class MultiAxisPath:
+    """Evaluate the paths of several axes at once.
+
+    Parameters
+    ----------
+    paths : `List` [`simactuators.path.Path` or \
+            `simactuators.path.PathSegment`]
+        Path for each axis. A path segment is treated
+        as a path with one segment. The paths are read once,
+        so make a new `MultiAxisPath` if any path changes;
+        `matches` can tell you if that is necessary.
+
+    Attributes
+    ----------
+    paths : `tuple`
+        The paths.
+    tai : `numpy.ndarray`
+        Start time (TAI unix seconds) of each segment of each path,
+        with shape (num axes, max num segments).
+        Unused entries are +inf, so they are never in effect.
+    position, velocity, acceleration, jerk : `numpy.ndarray`
+        Position, velocity, acceleration, and jerk at the start
+        of each segment of each path; same shape as ``tai``.
+        Unused entries are 0.
+
+    Notes
+    -----
+    Like `simactuators.path.Path.at`, the segment in effect is the last
+    segment that starts at or before the specified time,
+    or the first segment if the time is before that.
+    """
+
+    def __init__(self, paths):
+        self.paths = tuple(paths)
+        segments_list = [
+            (path,) if isinstance(path, simactuators.path.PathSegment) else tuple(path)
+            for path in self.paths
+        ]
+        num_segments = max(len(segments) for segments in segments_list)
+        shape = (len(segments_list), num_segments)
+        self.tai = np.full(shape, np.inf)
+        self.position = np.zeros(shape)
+        self.velocity = np.zeros(shape)
+        self.acceleration = np.zeros(shape)
+        self.jerk = np.zeros(shape)
+        for i, segments in enumerate(segments_list):
+            for j, segment in enumerate(segments):
+                self.tai[i, j] = segment.tai
+                self.position[i, j] = segment.position
+                self.velocity[i, j] = segment.velocity
+                self.acceleration[i, j] = segment.acceleration
+                self.jerk[i, j] = segment.jerk
+        self._rows = np.arange(len(segments_list))[:, np.newaxis]
+
+    def matches(self, paths):
+        """Return True if ``paths`` are the same objects as `paths`.
+        """
+        return len(paths) == len(self.paths) and all(
+            path is self_path for path, self_path in zip(paths, self.paths)
+        )
+
+    def at(self, tai):
+        """Compute position, velocity, and acceleration of all axes.
+
+        Parameters
+        ----------
+        tai : `float` or `numpy.ndarray`
+            TAI time, or a 1-dimensional array of times (unix seconds).
+
+        Returns
+        -------
+        position, velocity, acceleration : `numpy.ndarray`
+            Position, velocity, and acceleration of each axis
+            at each time. If ``tai`` is a scalar then each array has
+            shape (num axes,), else (num axes, num times).
+        """
+        tai_arr = np.asarray(tai, dtype=float)
+        times = np.atleast_1d(tai_arr)
+        # Index of the segment in effect for each axis and time.
+        index = np.maximum(np.sum(self.tai[:, :, np.newaxis] <= times, axis=1) - 1, 0)
+        dt = times - self.tai[self._rows, index]
+        velocity0 = self.velocity[self._rows, index]
+        acceleration0 = self.acceleration[self._rows, index]
+        jerk = self.jerk[self._rows, index]
+        position = self.position[self._rows, index] + dt * (
+            velocity0 + dt * (acceleration0 / 2 + dt * jerk / 6)
+        )
+        velocity = velocity0 + dt * (acceleration0 + dt * jerk / 2)
+        acceleration = acceleration0 + dt * jerk
+        if tai_arr.ndim == 0:
+            return position[:, 0], velocity[:, 0], acceleration[:, 0]
+        return position, velocity, acceleration
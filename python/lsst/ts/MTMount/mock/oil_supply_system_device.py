@@ -21,9 +21,17 @@
 
 __all__ = ["OilSupplySystemDevice"]
 
+import asyncio
+
 from lsst.ts import salobj
 from .. import enums
 from .base_device import BaseDevice
+from .ramp import Ramp
+
+# Oil temperature when the cooling is off (C).
+AMBIENT_OIL_TEMPERATURE = 20
+# Extra time allowed for a command, beyond the startup duration (sec).
+STARTUP_TIMEOUT_MARGIN = 1
 
 
 class OilSupplySystemDevice(BaseDevice):
@@ -33,13 +41,41 @@ class OilSupplySystemDevice(BaseDevice):
     ----------
     controller : `MockController`
         Mock controller.
+    startup_scale : `float`, optional
+        Scale factor for the startup durations: 1 for realistic durations,
+        0 (the default) to start up instantly, which speeds up unit tests.
+        To run a realistic startup faster than real time,
+        specify 1 and give the controller a `VirtualClock`.
+
+    Attributes
+    ----------
+    oil_temperature : `Ramp`
+        Oil temperature (C). The cooling subsystem brings it
+        to the operating temperature.
+    oil_pressure : `Ramp`
+        Oil pressure (bar). The main pump builds it up.
+    oil_flow : `Ramp`
+        Oil flow to the hydrostatic bearings (liter/minute).
+        The oil subsystem builds it up.
+    startup_tasks : `dict` [`str`, `asyncio.Future`]
+        Dict of subsystem name: task that is done when
+        the subsystem has finished starting up.
+
+    Raises
+    ------
+    ValueError
+        If ``startup_scale`` < 0.
 
     Notes
     -----
     The real oil supply system can take 1/4 hour to turn on,
     as the oil is brought to the correct temperature.
-    This mock uses no actual delay, to simplify the code,
-    but it reports semi-normal timeouts.
+    This mock models each subsystem as a process variable
+    that ramps linearly to its nominal value when the subsystem is
+    turned on, and back when it is turned off. A power-on command
+    finishes when its ramps finish; a power-off command finishes at once.
+    The timeouts are semi-normal, regardless of ``startup_scale``.
+    Warning: the nominal values and durations are rough guesses.
 
     There must be rules about which oil subsystem must be on or off
     in other to turn the others on or off. But I don't know the rules,
@@ -49,10 +85,27 @@ class OilSupplySystemDevice(BaseDevice):
     instead it keeps track with cooling_on, main_pump_on, oil_on.
     """
 
-    def __init__(self, controller):
+    # Dict of subsystem name: (process variable attribute name,
+    # value when on, value when off, realistic startup duration (sec)).
+    subsystem_dict = {
+        "cooling": ("oil_temperature", 12, AMBIENT_OIL_TEMPERATURE, 15 * 60),
+        "main_pump": ("oil_pressure", 60, 0, 60),
+        "oil": ("oil_flow", 150, 0, 2 * 60),
+    }
+
+    def __init__(self, controller, startup_scale=0):
+        if startup_scale < 0:
+            raise ValueError(f"startup_scale={startup_scale} must be >= 0")
+        self.startup_scale = startup_scale
         self.cooling_on = False
         self.main_pump_on = False
         self.oil_on = False
+        self.oil_temperature = Ramp(AMBIENT_OIL_TEMPERATURE)
+        self.oil_pressure = Ramp(0)
+        self.oil_flow = Ramp(0)
+        self.startup_tasks = {
+            name: salobj.make_done_future() for name in self.subsystem_dict
+        }
         super().__init__(
             controller=controller, device_id=enums.DeviceId.OIL_SUPPLY_SYSTEM
         )
@@ -65,26 +118,94 @@ class OilSupplySystemDevice(BaseDevice):
 
     @power_on.setter
     def power_on(self, on):
-        self.cooling_on = on
-        self.main_pump_on = on
-        self.oil_on = on
+        for name in self.subsystem_dict:
+            self.set_subsystem_power(name=name, on=on)
+
+    def set_subsystem_power(self, name, on):
+        """Turn a subsystem on or off and start ramping its process variable.
+
+        Cancel the startup task of the subsystem, if running.
+
+        Parameters
+        ----------
+        name : `str`
+            Subsystem name: one of "cooling", "main_pump", or "oil".
+        on : `bool`
+            Turn the subsystem on?
+
+        Returns
+        -------
+        duration : `float`
+            Duration of the ramp (seconds).
+        """
+        process_variable_name, on_value, off_value, duration = self.subsystem_dict[name]
+        self.startup_tasks[name].cancel()
+        setattr(self, f"{name}_on", on)
+        duration *= self.startup_scale
+        getattr(self, process_variable_name).set_target(
+            tai=self.clock.tai(),
+            target=on_value if on else off_value,
+            duration=duration,
+        )
+        return duration
+
+    def power_subsystems(self, names, on, min_timeout):
+        """Turn subsystems on or off and return the timeout and task.
+
+        Parameters
+        ----------
+        names : `List` [`str`]
+            Subsystem names.
+        on : `bool`
+            Turn the subsystems on?
+        min_timeout : `float` or `None`
+            Minimum timeout (seconds). If None and the subsystems
+            start up instantly, return None.
+
+        Returns
+        -------
+        timeout_task : `None` or `tuple`
+            None or (timeout, task), as required of a do_method.
+            The task is done when all subsystems have started up.
+        """
+        durations = [self.set_subsystem_power(name=name, on=on) for name in names]
+        duration = max(durations) if on else 0
+        if duration == 0:
+            if min_timeout is None:
+                return None
+            return min_timeout, salobj.make_done_future()
+        task = asyncio.create_task(self.clock.sleep(duration))
+        for name in names:
+            self.startup_tasks[name] = task
+        if min_timeout is None:
+            min_timeout = 0
+        return max(min_timeout, duration + STARTUP_TIMEOUT_MARGIN), task
+
+    async def close(self):
+        for task in self.startup_tasks.values():
+            task.cancel()
+        await super().close()
 
     def do_power(self, command):
-        super().do_power(command)
         # The real system can take roughly 15 minutes
         # to bring the oil to an acceptable temperature.
-        timeout = 15 * 60 if command.on else 1
-        return timeout, salobj.make_done_future()
+        return self.power_subsystems(
+            names=list(self.subsystem_dict),
+            on=command.on,
+            min_timeout=15 * 60 if command.on else 1,
+        )
 
     def do_power_cooling(self, command):
-        self.cooling_on = command.on
         # The real system can take roughly 15 minutes
         # to bring the oil to an acceptable temperature.
-        timeout = 15 * 60 if command.on else 1
-        return timeout, salobj.make_done_future()
+        return self.power_subsystems(
+            names=["cooling"], on=command.on, min_timeout=15 * 60 if command.on else 1
+        )
 
     def do_power_main_pump(self, command):
-        self.main_pump_on = command.on
+        return self.power_subsystems(
+            names=["main_pump"], on=command.on, min_timeout=None
+        )
 
     def do_power_oil(self, command):
-        self.oil_on = command.on
+        return self.power_subsystems(names=["oil"], on=command.on, min_timeout=None)
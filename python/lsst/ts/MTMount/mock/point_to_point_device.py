@@ -109,7 +109,7 @@ class PointToPointDevice(base_device.BaseDevice):
         """
         # Provide some slop for non-monotonic clocks, which are
         # sometimes seen when running Docker on macOS.
-        await asyncio.sleep(self.actuator.remaining_time() + 0.2)
+        await self.clock.sleep(self.actuator.remaining_time(tai=self.clock.tai()) + 0.2)
 
     def supersede_move_command(self):
         """Report the current move command (if any) as superseded.
@@ -132,7 +132,7 @@ class PointToPointDevice(base_device.BaseDevice):
         """Stop the actuator.
         """
         self.supersede_move_command()
-        self.actuator.stop()
+        self.actuator.stop(tai=self.clock.tai())
 
     def move(self, position, command):
         """Move to the specified position.
@@ -154,6 +154,6 @@ class PointToPointDevice(base_device.BaseDevice):
         if self.multi_drive:
             self.assert_drive_all(command)
         self.supersede_move_command()
-        timeout = self.actuator.set_position(position)
+        timeout = self.actuator.set_position(position, start_tai=self.clock.tai())
         task = self.monitor_move_command(command)
         return timeout, task
@@ -0,0 +1,97 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["Ramp"]
+
+
+class Ramp:
+    """A process variable that changes linearly from one value to another.
+
+    Use this to model slow processes, such as oil pressure building up
+    or a chiller approaching its set temperature. The value is computed
+    from the time, so there is no need to step the model.
+
+    Parameters
+    ----------
+    value : `float`
+        Initial value.
+
+    Attributes
+    ----------
+    start_tai : `float`
+        TAI (unix seconds) at which the current ramp started.
+    start_value : `float`
+        Value at ``start_tai``.
+    end_tai : `float`
+        TAI (unix seconds) at which the current ramp ends.
+    end_value : `float`
+        Value at and after ``end_tai``.
+    """
+
+    def __init__(self, value):
+        self.start_tai = 0
+        self.start_value = value
+        self.end_tai = 0
+        self.end_value = value
+
+    def at(self, tai):
+        """Get the value at the specified time.
+
+        Parameters
+        ----------
+        tai : `float`
+            TAI time (unix seconds).
+        """
+        if tai >= self.end_tai:
+            return self.end_value
+        if tai <= self.start_tai:
+            return self.start_value
+        fraction = (tai - self.start_tai) / (self.end_tai - self.start_tai)
+        return self.start_value + fraction * (self.end_value - self.start_value)
+
+    def done(self, tai):
+        """Return True if the value has reached ``end_value``.
+        """
+        return tai >= self.end_tai
+
+    def set_target(self, tai, target, duration):
+        """Start a new ramp from the current value.
+
+        Parameters
+        ----------
+        tai : `float`
+            TAI time (unix seconds) at which to start the ramp.
+        target : `float`
+            Final value.
+        duration : `float`
+            Duration of the ramp (seconds). Must be >= 0.
+
+        Raises
+        ------
+        ValueError
+            If ``duration`` < 0.
+        """
+        if duration < 0:
+            raise ValueError(f"duration={duration} must be >= 0")
+        self.start_value = self.at(tai)
+        self.start_tai = tai
+        self.end_tai = tai + duration
+        self.end_value = target
@@ -0,0 +1,368 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = [
+    "TelemetryEngine",
+    "AXIS_DEVICE_IDS",
+    "OIL_SUPPLY_SYSTEM_TOPIC_ID",
+    "TOP_END_CHILLER_TOPIC_ID",
+]
+
+import json
+
+import numpy as np
+
+from .. import enums
+from .multi_axis_path import MultiAxisPath
+
+# Default interval between telemetry messages for each topic (seconds).
+DEFAULT_TELEMETRY_INTERVAL = 0.2
+
+# Topic IDs of the telemetry topics that are only output by the mock.
+# These are not part of the low-level controller's interface,
+# so they are not in `TelemetryTopicId`.
+OIL_SUPPLY_SYSTEM_TOPIC_ID = 101
+TOP_END_CHILLER_TOPIC_ID = 102
+
+# Axes whose paths are evaluated together; see `get_axis_states`.
+AXIS_DEVICE_IDS = (
+    enums.DeviceId.AZIMUTH_AXIS,
+    enums.DeviceId.ELEVATION_AXIS,
+    enums.DeviceId.CAMERA_CABLE_WRAP,
+)
+
+
+class TelemetryEngine:
+    """Generate telemetry for the mock controller.
+
+    Generates every topic in ``data/telemetry_map.yaml``,
+    plus the mock-only oil supply system and top end chiller topics
+    (if those devices are in ``device_dict``), each at its own rate.
+    Call `encode` periodically (at least as often as `next_tai`)
+    to get the telemetry messages that are due.
+
+    Parameters
+    ----------
+    device_dict : `dict` [`DeviceId`, ``Device``]
+        Mock devices; see `Controller.device_dict`.
+    default_interval : `float`, optional
+        Interval between messages (seconds) for topics
+        not specified in ``intervals``.
+    intervals : `dict` [`TelemetryTopicId` or `int`, `float`], optional
+        Interval between messages (seconds) for specific topics.
+        Use `OIL_SUPPLY_SYSTEM_TOPIC_ID` and `TOP_END_CHILLER_TOPIC_ID`
+        for the mock-only topics.
+
+    Attributes
+    ----------
+    intervals : `dict` [`TelemetryTopicId` or `int`, `float`]
+        Interval between messages (seconds) for each topic.
+    next_tai_dict : `dict` [`TelemetryTopicId` or `int`, `float`]
+        TAI (unix seconds) at which the next message
+        for each topic is due; 0 if not yet sent.
+    """
+
+    def __init__(
+        self, device_dict, default_interval=DEFAULT_TELEMETRY_INTERVAL, intervals=None
+    ):
+        self.device_dict = device_dict
+        # Dict of topic ID: method that returns a data dict.
+        self.data_makers = {
+            enums.TelemetryTopicId.AZIMUTH: self.make_azimuth_data,
+            enums.TelemetryTopicId.AZIMUTH_DRIVE: self.make_azimuth_drives_data,
+            enums.TelemetryTopicId.ELEVATION: self.make_elevation_data,
+            enums.TelemetryTopicId.ELEVATION_DRIVE: self.make_elevation_drives_data,
+            enums.TelemetryTopicId.CAMERA_CABLE_WRAP: self.make_camera_cable_wrap_data,
+        }
+        # Topics that are only output by the mock,
+        # and only if the device is present.
+        for device_id, topic_id, data_maker in (
+            (
+                enums.DeviceId.OIL_SUPPLY_SYSTEM,
+                OIL_SUPPLY_SYSTEM_TOPIC_ID,
+                self.make_oil_supply_system_data,
+            ),
+            (
+                enums.DeviceId.TOP_END_CHILLER,
+                TOP_END_CHILLER_TOPIC_ID,
+                self.make_top_end_chiller_data,
+            ),
+        ):
+            if device_id in device_dict:
+                self.data_makers[topic_id] = data_maker
+        if intervals is None:
+            intervals = dict()
+        for topic_id, interval in intervals.items():
+            if topic_id not in self.data_makers:
+                raise ValueError(f"Unsupported topic ID {topic_id!r}")
+            if interval <= 0:
+                raise ValueError(f"Interval {interval} for {topic_id!r} must be > 0")
+        if default_interval <= 0:
+            raise ValueError(f"default_interval={default_interval} must be > 0")
+        self.intervals = {
+            topic_id: intervals.get(topic_id, default_interval)
+            for topic_id in self.data_makers
+        }
+        self.next_tai_dict = {topic_id: 0 for topic_id in self.data_makers}
+        # Dict of axis device ID: index in `AXIS_DEVICE_IDS`.
+        self.axis_index_dict = {
+            device_id: i for i, device_id in enumerate(AXIS_DEVICE_IDS)
+        }
+        self._multi_axis_path = None
+        self._axis_states_tai = None
+        self._axis_states = None
+
+    @property
+    def topic_ids(self):
+        """Get the IDs of the supported telemetry topics.
+        """
+        return tuple(self.data_makers)
+
+    @property
+    def next_tai(self):
+        """Get the TAI (unix seconds) at which the next message is due.
+        """
+        return min(self.next_tai_dict.values())
+
+    def reset(self):
+        """Make all topics due immediately.
+
+        Call this when a new telemetry client connects.
+        """
+        for topic_id in self.next_tai_dict:
+            self.next_tai_dict[topic_id] = 0
+
+    def encode(self, tai):
+        """Get the encoded telemetry messages that are due.
+
+        Parameters
+        ----------
+        tai : `float`
+            Current TAI (unix seconds).
+
+        Returns
+        -------
+        data : `bytes`
+            The messages for each topic that is due, each encoded as
+            json and terminated with "\\r\\n", concatenated so they can be
+            written in one call. Empty if no topics are due.
+        """
+        lines = []
+        for topic_id, next_tai in self.next_tai_dict.items():
+            if next_tai > tai:
+                continue
+            interval = self.intervals[topic_id]
+            # Keep a regular cadence, unless more than an interval late.
+            next_tai += interval
+            self.next_tai_dict[topic_id] = (
+                next_tai if next_tai > tai else tai + interval
+            )
+            data_dict = self.data_makers[topic_id](tai)
+            lines.append(json.dumps(data_dict))
+        if not lines:
+            return b""
+        lines.append("")
+        return "\r\n".join(lines).encode()
+
+    def get_axis_states(self, tai):
+        """Get the actual and target state of all axes.
+
+        The paths of all axes in `AXIS_DEVICE_IDS` are evaluated
+        in a single vectorized call. The result for a scalar ``tai``
+        is cached, so calling this repeatedly for one tick is cheap.
+
+        Parameters
+        ----------
+        tai : `float` or `numpy.ndarray`
+            TAI time, or a 1-dimensional array of times (unix seconds),
+            e.g. to evaluate a block of future ticks.
+
+        Returns
+        -------
+        actual_position, actual_velocity, actual_acceleration, \
+                target_position, target_velocity : `numpy.ndarray`
+            Actual position, velocity, and acceleration,
+            and target position and velocity, of each axis
+            in `AXIS_DEVICE_IDS`, at each time. Use `axis_index_dict`
+            to find the index of an axis. If ``tai`` is a scalar
+            then each array has shape (num axes,),
+            else (num axes, num times).
+        """
+        actuators = [
+            self.device_dict[device_id].actuator for device_id in AXIS_DEVICE_IDS
+        ]
+        paths = [actuator.path for actuator in actuators] + [
+            actuator.target for actuator in actuators
+        ]
+        if self._multi_axis_path is None or not self._multi_axis_path.matches(paths):
+            self._multi_axis_path = MultiAxisPath(paths)
+            self._axis_states_tai = None
+        scalar_tai = not hasattr(tai, "__len__")
+        if scalar_tai and tai == self._axis_states_tai:
+            return self._axis_states
+        position, velocity, acceleration = self._multi_axis_path.at(tai)
+        num_axes = len(AXIS_DEVICE_IDS)
+        axis_states = (
+            position[:num_axes],
+            velocity[:num_axes],
+            acceleration[:num_axes],
+            position[num_axes:],
+            velocity[num_axes:],
+        )
+        if scalar_tai:
+            self._axis_states_tai = tai
+            self._axis_states = axis_states
+        return axis_states
+
+    def make_axis_data(self, device_id, tai):
+        """Make telemetry data for the azimuth or elevation axis.
+
+        Warning: this is minimal and simplistic.
+        """
+        topic_id = {
+            enums.DeviceId.AZIMUTH_AXIS: enums.TelemetryTopicId.AZIMUTH,
+            enums.DeviceId.ELEVATION_AXIS: enums.TelemetryTopicId.ELEVATION,
+        }[device_id]
+        i = self.axis_index_dict[device_id]
+        (
+            actual_position,
+            actual_velocity,
+            actual_acceleration,
+            target_position,
+            target_velocity,
+        ) = self.get_axis_states(tai)
+        return {
+            "topicID": topic_id,
+            "angleActual": float(actual_position[i]),
+            "angleSet": float(target_position[i]),
+            "velocityActual": float(actual_velocity[i]),
+            "velocitySet": float(target_velocity[i]),
+            "accelerationActual": float(actual_acceleration[i]),
+            "torqueActual": self.get_torque(device_id=device_id, tai=tai),
+            "timestamp": tai,
+        }
+
+    def make_azimuth_data(self, tai):
+        return self.make_axis_data(device_id=enums.DeviceId.AZIMUTH_AXIS, tai=tai)
+
+    def make_elevation_data(self, tai):
+        return self.make_axis_data(device_id=enums.DeviceId.ELEVATION_AXIS, tai=tai)
+
+    def make_drives_data(self, device_id, tai):
+        """Make per-drive telemetry for the azimuth or elevation axis.
+
+        The current of each drive is computed by the device's
+        `DriveModel`, and is 0 if the device is off.
+        """
+        topic_id, prefix = {
+            enums.DeviceId.AZIMUTH_AXIS: (
+                enums.TelemetryTopicId.AZIMUTH_DRIVE,
+                "azCurrent",
+            ),
+            enums.DeviceId.ELEVATION_AXIS: (
+                enums.TelemetryTopicId.ELEVATION_DRIVE,
+                "elCurrent",
+            ),
+        }[device_id]
+        device = self.device_dict[device_id]
+        if device.power_on:
+            i = self.axis_index_dict[device_id]
+            velocity, acceleration = self.get_axis_states(tai)[1:3]
+            currents = device.drive_model.get_currents(
+                velocity=velocity[i], acceleration=acceleration[i]
+            )
+        else:
+            currents = np.zeros(device.drive_model.num_drives)
+        data_dict = {"topicID": topic_id}
+        for i, current in enumerate(currents.tolist()):
+            data_dict[f"{prefix}{i + 1}"] = current
+        data_dict["timestamp"] = tai
+        return data_dict
+
+    def make_azimuth_drives_data(self, tai):
+        return self.make_drives_data(device_id=enums.DeviceId.AZIMUTH_AXIS, tai=tai)
+
+    def make_elevation_drives_data(self, tai):
+        return self.make_drives_data(device_id=enums.DeviceId.ELEVATION_AXIS, tai=tai)
+
+    def make_camera_cable_wrap_data(self, tai):
+        """Make telemetry data for the camera cable wrap.
+
+        Warning: this is minimal and simplistic.
+        """
+        i = self.axis_index_dict[enums.DeviceId.CAMERA_CABLE_WRAP]
+        position, velocity, acceleration = self.get_axis_states(tai)[0:3]
+        return {
+            "topicID": enums.TelemetryTopicId.CAMERA_CABLE_WRAP,
+            "angle": float(position[i]),
+            "speed": float(velocity[i]),
+            "acceleration": float(acceleration[i]),
+            "timestamp": tai,
+        }
+
+    def make_oil_supply_system_data(self, tai):
+        """Make telemetry data for the oil supply system.
+
+        This topic is only output by the mock.
+        """
+        device = self.device_dict[enums.DeviceId.OIL_SUPPLY_SYSTEM]
+        return {
+            "topicID": OIL_SUPPLY_SYSTEM_TOPIC_ID,
+            "coolingOn": device.cooling_on,
+            "mainPumpOn": device.main_pump_on,
+            "oilOn": device.oil_on,
+            "oilTemperature": device.oil_temperature.at(tai),
+            "oilPressure": device.oil_pressure.at(tai),
+            "oilFlow": device.oil_flow.at(tai),
+            "timestamp": tai,
+        }
+
+    def make_top_end_chiller_data(self, tai):
+        """Make telemetry data for the top end chiller.
+
+        This topic is only output by the mock.
+        """
+        device = self.device_dict[enums.DeviceId.TOP_END_CHILLER]
+        return {
+            "topicID": TOP_END_CHILLER_TOPIC_ID,
+            "powerOn": device.power_on,
+            "trackAmbient": device.track_ambient,
+            "temperatureSet": device.target_temperature,
+            "temperatureActual": device.actual_temperature.at(tai),
+            "temperatureAmbient": device.ambient_temperature,
+            "timestamp": tai,
+        }
+
+    def get_torque(self, device_id, tai):
+        """Get the total torque of the drives of an axis (N m).
+
+        The torque is computed by the device's `DriveModel`,
+        and is 0 if the device is off.
+        """
+        device = self.device_dict[device_id]
+        if not device.power_on:
+            return 0
+        i = self.axis_index_dict[device_id]
+        velocity, acceleration = self.get_axis_states(tai)[1:3]
+        torques = device.drive_model.get_torques(
+            velocity=velocity[i], acceleration=acceleration[i]
+        )
+        return float(torques.sum())
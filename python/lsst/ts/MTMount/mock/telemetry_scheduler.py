@@ -0,0 +1,130 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["TelemetryScheduler"]
+
+import asyncio
+
+from lsst.ts import salobj
+from .clock import RealClock
+
+
+class TelemetryScheduler:
+    """Write telemetry for one or more mock controllers from a single task.
+
+    Parameters
+    ----------
+    log : `logging.Logger`
+        Logger.
+    clock : `RealClock` or `VirtualClock`, optional
+        Clock shared by all the controllers.
+        If None then use a `RealClock`.
+
+    Notes
+    -----
+    A controller is added when a client connects to its telemetry port,
+    and removed when the client disconnects or writing fails.
+    Each time telemetry is due for any controller,
+    the scheduler calls ``write_telemetry(tai)`` on every controller;
+    each controller's `TelemetryEngine` decides which topics are due.
+    """
+
+    def __init__(self, log, clock=None):
+        self.log = log.getChild("TelemetryScheduler")
+        self.clock = RealClock() if clock is None else clock
+        self.controllers = []
+        self._wakeup_event = asyncio.Event()
+        self._loop_task = salobj.make_done_future()
+
+    def add(self, controller):
+        """Start writing telemetry for a controller.
+
+        All of its telemetry topics are written immediately.
+        """
+        if controller not in self.controllers:
+            controller.telemetry_engine.reset()
+            self.controllers.append(controller)
+        if self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._loop())
+        else:
+            self._wakeup_event.set()
+
+    def remove(self, controller):
+        """Stop writing telemetry for a controller.
+
+        A no-op if the controller was not added.
+        """
+        if controller in self.controllers:
+            self.controllers.remove(controller)
+        if not self.controllers:
+            self._loop_task.cancel()
+
+    async def close(self):
+        """Stop writing telemetry for all controllers.
+        """
+        self.controllers = []
+        self._loop_task.cancel()
+
+    async def _loop(self):
+        """Write telemetry until there are no controllers.
+        """
+        try:
+            while self.controllers:
+                tai = self.clock.tai()
+                for controller in list(self.controllers):
+                    try:
+                        await controller.write_telemetry(tai)
+                    except ConnectionResetError:
+                        self.log.warning(
+                            f"Telemetry client of {controller.log.name} disconnected"
+                        )
+                        self.remove(controller)
+                    except Exception:
+                        self.log.exception(
+                            f"Writing telemetry for {controller.log.name} failed"
+                        )
+                        self.remove(controller)
+                if not self.controllers:
+                    break
+                self._wakeup_event.clear()
+                next_tai = min(
+                    controller.telemetry_engine.next_tai
+                    for controller in self.controllers
+                )
+                delay = next_tai - self.clock.tai()
+                if delay > 0:
+                    await self._sleep_or_wakeup(delay)
+        except asyncio.CancelledError:
+            self.log.info("Telemetry loop cancelled")
+
+    async def _sleep_or_wakeup(self, delay):
+        """Sleep until ``delay`` seconds have elapsed
+        or a controller has been added.
+        """
+        tasks = [
+            asyncio.create_task(self.clock.sleep(delay)),
+            asyncio.create_task(self._wakeup_event.wait()),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
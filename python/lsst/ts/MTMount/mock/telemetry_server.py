@@ -0,0 +1,275 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["TelemetryClientConnection", "TelemetryServer"]
+
+import asyncio
+import collections
+
+from lsst.ts import salobj
+
+# Default maximum number of bytes buffered for each client.
+DEFAULT_MAX_BUFFER_SIZE = 1_000_000
+
+
+class TelemetryClientConnection:
+    """A client connected to a `TelemetryServer`.
+
+    Parameters
+    ----------
+    reader : `asyncio.StreamReader`
+        Stream reader.
+    writer : `asyncio.StreamWriter`
+        Stream writer.
+
+    Attributes
+    ----------
+    buffer : `collections.deque` [`bytes`]
+        Data waiting to be written.
+    buffer_size : `int`
+        Total number of bytes in ``buffer``.
+    num_dropped : `int`
+        Number of writes discarded because the buffer was full.
+    write_task : `asyncio.Task`
+        Task that writes the data in ``buffer``.
+    read_task : `asyncio.Task`
+        Task that detects when the client disconnects.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.buffer = collections.deque()
+        self.buffer_size = 0
+        self.num_dropped = 0
+        self.data_event = asyncio.Event()
+        self.write_task = salobj.make_done_future()
+        self.read_task = salobj.make_done_future()
+
+    @property
+    def peername(self):
+        return self.writer.get_extra_info("peername")
+
+
+class TelemetryServer:
+    """TCP/IP server that writes the same telemetry to any number of clients.
+
+    Each call to `write` queues the data for every connected client,
+    so the data is encoded once, no matter how many clients there are.
+    Each client has its own bounded buffer and write task,
+    so a slow client does not delay the others.
+
+    Parameters
+    ----------
+    name : `str`
+        Name used for log messages.
+    host : `str` or `None`
+        IP address for this server. If `None` then use all interfaces.
+    port : `int`
+        IP port for this server. If 0 then use a random port.
+    log : `logging.Logger`
+        Logger.
+    connect_callback : callable, optional
+        Synchronous function to call when a client connects
+        or disconnects. It receives one argument: this server.
+    max_buffer_size : `int`, optional
+        Maximum number of bytes buffered for each client.
+        Data that does not fit is handled according to ``drop_oldest``.
+    drop_oldest : `bool`, optional
+        What to do if data does not fit in a client's buffer:
+        if True (the default), discard the oldest buffered data
+        until it fits, so the client sees a gap but stays current;
+        if False, discard the new data.
+
+    Attributes
+    ----------
+    clients : `List` [`TelemetryClientConnection`]
+        Connected clients.
+    num_dropped : `int`
+        Total number of writes discarded because a buffer was full,
+        summed over all clients (including disconnected clients).
+    start_task : `asyncio.Task`
+        Task that is done when the server has started.
+
+    Notes
+    -----
+    Each call to `write` should contain complete messages.
+    Data is discarded one write at a time, so clients
+    never see a partial message.
+    """
+
+    def __init__(
+        self,
+        name,
+        host,
+        port,
+        log,
+        connect_callback=None,
+        max_buffer_size=DEFAULT_MAX_BUFFER_SIZE,
+        drop_oldest=True,
+    ):
+        if max_buffer_size <= 0:
+            raise ValueError(f"max_buffer_size={max_buffer_size} must be > 0")
+        self.name = name
+        self.host = host
+        self.port = port
+        self.log = log.getChild(f"TelemetryServer({name})")
+        self.connect_callback = connect_callback
+        self.max_buffer_size = max_buffer_size
+        self.drop_oldest = drop_oldest
+        self.clients = []
+        self.num_dropped = 0
+        self._server = None
+        self.start_task = asyncio.create_task(self.start())
+
+    @property
+    def connected(self):
+        """Is at least one client connected?
+        """
+        return len(self.clients) > 0
+
+    @property
+    def num_clients(self):
+        """Get the number of connected clients.
+        """
+        return len(self.clients)
+
+    async def start(self):
+        """Start the TCP/IP server.
+
+        If ``port`` is 0 then set it to the port actually used.
+        """
+        self._server = await asyncio.start_server(
+            self._connect_client, host=self.host, port=self.port
+        )
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+        self.log.info(f"Listening on host={self.host}; port={self.port}")
+
+    async def close(self):
+        """Disconnect all clients and stop the server.
+        """
+        self.start_task.cancel()
+        for client in list(self.clients):
+            await self.close_client(client)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def close_client(self, client):
+        """Disconnect a client.
+
+        A no-op if the client is not connected.
+
+        Parameters
+        ----------
+        client : `TelemetryClientConnection`
+            Client to disconnect.
+        """
+        if client not in self.clients:
+            return
+        self.clients.remove(client)
+        client.write_task.cancel()
+        client.read_task.cancel()
+        client.writer.close()
+        try:
+            await client.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+        self.log.info(f"Client {client.peername} disconnected")
+        self._call_connect_callback()
+
+    def write(self, data):
+        """Queue data to be written to all connected clients.
+
+        Parameters
+        ----------
+        data : `bytes`
+            Data to write; one or more complete messages.
+        """
+        if not data:
+            return
+        data_size = len(data)
+        for client in self.clients:
+            if client.buffer_size + data_size > self.max_buffer_size:
+                if not self.drop_oldest or data_size > self.max_buffer_size:
+                    client.num_dropped += 1
+                    self.num_dropped += 1
+                    continue
+                while client.buffer_size + data_size > self.max_buffer_size:
+                    client.buffer_size -= len(client.buffer.popleft())
+                    client.num_dropped += 1
+                    self.num_dropped += 1
+            client.buffer.append(data)
+            client.buffer_size += data_size
+            client.data_event.set()
+
+    def _call_connect_callback(self):
+        if self.connect_callback is None:
+            return
+        try:
+            self.connect_callback(self)
+        except Exception:
+            self.log.exception(f"Connect callback {self.connect_callback} failed")
+
+    async def _connect_client(self, reader, writer):
+        """Handle a new client connection.
+        """
+        client = TelemetryClientConnection(reader=reader, writer=writer)
+        self.clients.append(client)
+        client.write_task = asyncio.create_task(self._write_loop(client))
+        client.read_task = asyncio.create_task(self._read_loop(client))
+        self.log.info(
+            f"Client {client.peername} connected; num_clients={self.num_clients}"
+        )
+        self._call_connect_callback()
+
+    async def _read_loop(self, client):
+        """Read and discard data from a client until it disconnects.
+        """
+        try:
+            while await client.reader.read(1000):
+                pass
+        except asyncio.CancelledError:
+            return
+        except (ConnectionError, OSError):
+            pass
+        asyncio.create_task(self.close_client(client))
+
+    async def _write_loop(self, client):
+        """Write buffered data to a client until it disconnects.
+        """
+        try:
+            while True:
+                await client.data_event.wait()
+                client.data_event.clear()
+                data = b"".join(client.buffer)
+                client.buffer.clear()
+                client.buffer_size = 0
+                client.writer.write(data)
+                await client.writer.drain()
+        except asyncio.CancelledError:
+            return
+        except (ConnectionError, OSError):
+            pass
+        except Exception:
+            self.log.exception(f"Writing to client {client.peername} failed")
+        asyncio.create_task(self.close_client(client))
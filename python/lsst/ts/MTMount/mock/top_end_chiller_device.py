@@ -21,8 +21,21 @@
 
 __all__ = ["TopEndChillerDevice"]
 
+import asyncio
+
+from lsst.ts import salobj
 from .. import enums
 from .base_device import BaseDevice
+from .ramp import Ramp
+
+# Initial ambient temperature (C).
+DEFAULT_AMBIENT_TEMPERATURE = 10
+# Realistic time for the chiller to start up (sec).
+STARTUP_DURATION = 2 * 60
+# Rate at which the actual temperature approaches its target (C/sec).
+TEMPERATURE_RATE = 0.05
+# Extra time allowed for the power command, beyond the startup duration (sec).
+STARTUP_TIMEOUT_MARGIN = 1
 
 
 class TopEndChillerDevice(BaseDevice):
@@ -32,19 +45,100 @@ class TopEndChillerDevice(BaseDevice):
     ----------
     controller : `MockController`
         Mock controller.
+    startup_scale : `float`, optional
+        Scale factor for the startup duration: 1 for a realistic duration,
+        0 (the default) to start up instantly, which speeds up unit tests.
+        To run a realistic startup faster than real time,
+        specify 1 and give the controller a `VirtualClock`.
+
+    Attributes
+    ----------
+    track_ambient : `bool`
+        Track the ambient temperature?
+    temperature : `float`
+        Desired temperature if not tracking ambient (C).
+    ambient_temperature : `float`
+        Ambient temperature (C). Call `set_ambient_temperature`
+        to change it.
+    actual_temperature : `Ramp`
+        Actual temperature (C). If the chiller is on then it
+        approaches the ambient temperature or ``temperature``,
+        depending on ``track_ambient``; if off then it drifts
+        to the ambient temperature. Either way it changes
+        at ``TEMPERATURE_RATE``.
+    startup_task : `asyncio.Future`
+        Task that is done when the chiller has finished starting up.
+
+    Raises
+    ------
+    ValueError
+        If ``startup_scale`` < 0.
     """
 
-    def __init__(self, controller):
+    def __init__(self, controller, startup_scale=0):
+        if startup_scale < 0:
+            raise ValueError(f"startup_scale={startup_scale} must be >= 0")
+        self.startup_scale = startup_scale
         # I am guessing that the top end chiller will track ambient
         # when turned on, but I don't know.
         self.track_ambient = True
         self.temperature = 0
+        self.ambient_temperature = DEFAULT_AMBIENT_TEMPERATURE
+        self.actual_temperature = Ramp(DEFAULT_AMBIENT_TEMPERATURE)
+        self.startup_task = salobj.make_done_future()
         super().__init__(
             controller=controller, device_id=enums.DeviceId.TOP_END_CHILLER
         )
 
+    @property
+    def power_on(self):
+        return self._power_on
+
+    @power_on.setter
+    def power_on(self, on):
+        self._power_on = on
+        self.update_target_temperature()
+
+    @property
+    def target_temperature(self):
+        """Get the temperature the chiller is approaching (C).
+        """
+        if self.power_on and not self.track_ambient:
+            return self.temperature
+        return self.ambient_temperature
+
+    def set_ambient_temperature(self, temperature):
+        """Set the ambient temperature (C).
+        """
+        self.ambient_temperature = temperature
+        self.update_target_temperature()
+
+    def update_target_temperature(self):
+        """Start ramping the actual temperature to `target_temperature`.
+
+        Call this whenever the target temperature may have changed.
+        """
+        tai = self.clock.tai()
+        target = self.target_temperature
+        duration = abs(target - self.actual_temperature.at(tai)) / TEMPERATURE_RATE
+        self.actual_temperature.set_target(tai=tai, target=target, duration=duration)
+
+    async def close(self):
+        self.startup_task.cancel()
+        await super().close()
+
+    def do_power(self, command):
+        self.startup_task.cancel()
+        super().do_power(command)
+        duration = STARTUP_DURATION * self.startup_scale if command.on else 0
+        if duration == 0:
+            return None
+        self.startup_task = asyncio.create_task(self.clock.sleep(duration))
+        return duration + STARTUP_TIMEOUT_MARGIN, self.startup_task
+
     def do_track_ambient(self, command):
         if not self.power_on:
             raise RuntimeError("Device not powered on.")
         self.track_ambient = command.on
         self.temperature = command.temperature
+        self.update_target_temperature()
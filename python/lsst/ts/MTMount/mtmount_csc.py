@@ -25,14 +25,19 @@ import asyncio
 import math
 import pathlib
 import signal
+import time
+
+import numpy as np
 
 from lsst.ts import salobj
 from lsst.ts.idl.enums.MTMount import DriveState
 from . import constants
 from . import command_futures
+from . import command_sequencer
 from . import commands
 from . import communicator
 from . import enums
+from . import latency_stats
 from . import limits
 from . import replies
 from . import __version__
@@ -56,6 +61,49 @@ TELEMETRY_START_TIME = 30
 # for check setpoint"; on 2020-02-01 the value was 5 seconds.
 ROTATOR_TELEMETRY_TIMEOUT = 1
 
+# Dict of name: template for commands with fixed parameters that
+# the CSC sends repeatedly. The names of the enable and disable steps
+# match the names of the templates.
+_COMMAND_TEMPLATES = {
+    name: commands.CommandTemplate(CommandClass, **kwargs)
+    for name, CommandClass, kwargs in (
+        ("reset_top_end_chiller", commands.TopEndChillerResetAlarm, {}),
+        ("reset_main_power_supply", commands.MainPowerSupplyResetAlarm, {}),
+        ("reset_mirror_cover_locks", commands.MirrorCoverLocksResetAlarm, {}),
+        ("reset_mirror_covers", commands.MirrorCoversResetAlarm, {}),
+        ("reset_azimuth", commands.AzimuthAxisResetAlarm, {}),
+        ("reset_elevation", commands.ElevationAxisResetAlarm, {}),
+        ("reset_camera_cable_wrap", commands.CameraCableWrapResetAlarm, {}),
+        ("power_top_end_chiller", commands.TopEndChillerPower, dict(on=True)),
+        ("power_main_power_supply", commands.MainPowerSupplyPower, dict(on=True)),
+        ("power_oil_supply_system", commands.OilSupplySystemPower, dict(on=True)),
+        ("power_azimuth", commands.AzimuthAxisPower, dict(on=True)),
+        ("power_elevation", commands.ElevationAxisPower, dict(on=True)),
+        ("power_camera_cable_wrap", commands.CameraCableWrapPower, dict(on=True)),
+        ("power_covers", commands.MirrorCoversPower, dict(on=True)),
+        ("power_locks", commands.MirrorCoverLocksPower, dict(on=True)),
+        ("power_off_azimuth", commands.AzimuthAxisPower, dict(on=False)),
+        ("power_off_elevation", commands.ElevationAxisPower, dict(on=False)),
+        ("power_off_camera_cable_wrap", commands.CameraCableWrapPower, dict(on=False)),
+        ("power_off_covers", commands.MirrorCoversPower, dict(on=False)),
+        ("power_off_locks", commands.MirrorCoverLocksPower, dict(on=False)),
+        ("stop_axes", commands.BothAxesStop, {}),
+        ("stop_camera_cable_wrap", commands.CameraCableWrapStop, {}),
+    )
+}
+
+# Index of the sequence_id field in Ack, NoAck and Done replies,
+# and of the fields after the common response fields.
+# These are used by the fast reply handlers, which do not parse
+# the whole reply (parsing the timestamp is especially slow).
+_SEQUENCE_ID_INDEX = 1
+_ACK_TIMEOUT_MS_INDEX = len(replies.AckReply.field_infos) - 1
+_NOACK_EXPLANATION_INDEX = len(replies.NoAckReply.field_infos) - 1
+
+# Maximum interval (seconds) between consecutive tracking setpoints
+# for which the implied acceleration is checked against the axis limits.
+MAX_TRACK_SETPOINT_INTERVAL = 1
+
 
 class MTMountCsc(salobj.ConfigurableCsc):
     """MTMount CSC
@@ -142,6 +190,19 @@ class MTMountCsc(salobj.ConfigurableCsc):
 
         self.command_lock = asyncio.Lock()
 
+        # Dict of reply_code, as an encoded string (e.g. "0" for ACK):
+        # handler for replies with that reply code.
+        # Each handler receives the reply as a list of string fields.
+        # Use add_reply_handler and remove_reply_handler to change this.
+        self.reply_handlers = dict()
+        self.add_reply_handler(enums.ReplyCode.ACK, self.handle_ack, raw=True)
+        self.add_reply_handler(enums.ReplyCode.NOACK, self.handle_noack, raw=True)
+        self.add_reply_handler(enums.ReplyCode.DONE, self.handle_done, raw=True)
+        self.add_reply_handler(enums.ReplyCode.WARNING, self.handle_warning)
+        self.add_reply_handler(enums.ReplyCode.ERROR, self.handle_error)
+        self.add_reply_handler(enums.ReplyCode.ON_STATE_INFO, self.handle_on_state_info)
+        self.add_reply_handler(enums.ReplyCode.IN_POSITION, self.handle_in_position)
+
         self.on_drive_states = set(
             (DriveState.MOVING, DriveState.STOPPING, DriveState.STOPPED)
         )
@@ -160,6 +221,27 @@ class MTMountCsc(salobj.ConfigurableCsc):
 
         self.monitor_telemetry_client_task = salobj.make_done_future()
 
+        # Are the mirror covers and mirror cover locks powered on?
+        # Only tracks commands sent by this CSC.
+        self.mirror_covers_power_on = False
+        self.mirror_cover_locks_power_on = False
+
+        # Task that turns off the mirror covers and locks after a delay.
+        self.mirror_cover_power_off_task = salobj.make_done_future()
+
+        # Checks azimuth and elevation setpoints against the axis limits.
+        self.setpoint_validator = limits.SetpointValidator(
+            device_ids=(enums.DeviceId.AZIMUTH_AXIS, enums.DeviceId.ELEVATION_AXIS)
+        )
+
+        # (tai, [azimuth velocity, elevation velocity]) of the most recent
+        # tracking setpoint, or None if not tracking.
+        # Used to check the acceleration implied by the next setpoint.
+        self.previous_track_setpoint = None
+
+        # Task that streams a tracking trajectory; see track_trajectory.
+        self.track_trajectory_task = salobj.make_done_future()
+
         # Tasks for camera cable wrap following the rotator
         self.camera_cable_wrap_follow_start_task = salobj.make_done_future()
         self.camera_cable_wrap_follow_loop_task = salobj.make_done_future()
@@ -187,12 +269,18 @@ class MTMountCsc(salobj.ConfigurableCsc):
             simulation_mode=simulation_mode,
         )
 
+        # Ack and Done latency statistics for each command code,
+        # used to set the time to wait for Ack and Done replies.
+        self.latency_stats = latency_stats.CommandLatencyStats(log=self.log)
+
         self.rotator = salobj.Remote(
             domain=self.domain, name="MTRotator", include=["rotation"]
         )
 
         self.mtmount_remote = salobj.Remote(
-            domain=self.domain, name="MTMount", include=["cameraCableWrap"]
+            domain=self.domain,
+            name="MTMount",
+            include=["azimuth", "cameraCableWrap", "elevation"],
         )
 
         loop = asyncio.get_running_loop()
@@ -256,6 +344,7 @@ class MTMountCsc(salobj.ConfigurableCsc):
 
     async def close_tasks(self):
         """Shut down pending tasks. Called by `close`."""
+        self.track_trajectory_task.cancel()
         while self.command_dict:
             command = self.command_dict.popitem()[1]
             command.setnoack("Connection closed before command finished")
@@ -454,6 +543,9 @@ class MTMountCsc(salobj.ConfigurableCsc):
         self.should_be_connected = False
 
         self.monitor_telemetry_client_task.cancel()
+        self.mirror_cover_power_off_task.cancel()
+        self.mirror_covers_power_on = False
+        self.mirror_cover_locks_power_on = False
 
         if self.communicator is not None:
             self.log.info("Disconnect from the low-level controller")
@@ -466,32 +558,10 @@ class MTMountCsc(salobj.ConfigurableCsc):
         self.log.info("Enable devices")
         self.disable_task.cancel()
         try:
-            for reset_command in [
-                commands.TopEndChillerResetAlarm(),
-                commands.MainPowerSupplyResetAlarm(),
-                commands.MirrorCoverLocksResetAlarm(),
-                commands.MirrorCoversResetAlarm(),
-                commands.AzimuthAxisResetAlarm(),
-                commands.ElevationAxisResetAlarm(),
-                commands.CameraCableWrapResetAlarm(),
-            ]:
-                try:
-                    await self.send_command(reset_command, do_lock=False)
-                except Exception as e:
-                    self.log.warning(
-                        f"Command {reset_command} failed; continuing: {e!r}"
-                    )
-
-            power_on_commands = [
-                commands.TopEndChillerPower(on=True),
-                commands.TopEndChillerTrackAmbient(on=True, temperature=0),
-                commands.MainPowerSupplyPower(on=True),
-                commands.OilSupplySystemPower(on=True),
-                commands.AzimuthAxisPower(on=True),
-                commands.ElevationAxisPower(on=True),
-                commands.CameraCableWrapPower(on=True),
-            ]
-            await self.send_commands(*power_on_commands)
+            sequencer = command_sequencer.CommandSequencer(
+                name="Enable devices", steps=self.make_enable_steps(), log=self.log
+            )
+            await sequencer.run(self._send_command_no_lock)
         except Exception as e:
             self.log.error(f"Failed to power on one or more devices: {e!r}")
             raise
@@ -503,24 +573,136 @@ class MTMountCsc(salobj.ConfigurableCsc):
     async def disable_devices(self):
         self.log.info("Disable devices")
         self.enable_task.cancel()
+        self.track_trajectory_task.cancel()
         self.camera_cable_wrap_follow_start_task.cancel()
         self.camera_cable_wrap_follow_loop_task.cancel()
         if not self.connected:
             return
-        for command in [
-            commands.BothAxesStop(),
-            commands.CameraCableWrapStop(),
-            commands.AzimuthAxisPower(on=False),
-            commands.ElevationAxisPower(on=False),
-            commands.CameraCableWrapPower(on=False),
-        ]:
-            try:
-                await self.send_command(command, do_lock=False)
-            except Exception as e:
-                self.log.warning(f"Command {command} failed; continuing: {e!r}")
+        sequencer = command_sequencer.CommandSequencer(
+            name="Disable devices", steps=self.make_disable_steps(), log=self.log
+        )
+        await sequencer.run(self._send_command_no_lock)
+        self.mirror_cover_power_off_task.cancel()
+        await self.power_off_mirror_covers()
 
         self.evt_axesInPosition.set_put(azimuth=False, elevation=False)
 
+    def make_enable_steps(self):
+        """Make the steps for `enable_devices`.
+
+        All alarms are reset in parallel; failures are logged and ignored.
+        Devices are then powered on as soon as the devices they rely on
+        are powered on:
+
+        * The top end chiller, main power supply and oil supply system
+          are independent.
+        * The azimuth and elevation axes require the main power supply
+          and the oil supply system (for the hydrostatic bearings).
+        * The camera cable wrap requires the main power supply.
+
+        Returns
+        -------
+        steps : `List` [`SequenceStep`]
+            The steps.
+        """
+        SequenceStep = command_sequencer.SequenceStep
+        reset_steps = [
+            SequenceStep(
+                name=name, command=_COMMAND_TEMPLATES[name](), allow_failure=True
+            )
+            for name in (
+                "reset_top_end_chiller",
+                "reset_main_power_supply",
+                "reset_mirror_cover_locks",
+                "reset_mirror_covers",
+                "reset_azimuth",
+                "reset_elevation",
+                "reset_camera_cable_wrap",
+            )
+        ]
+        reset_names = [step.name for step in reset_steps]
+        return reset_steps + [
+            SequenceStep(
+                name="power_top_end_chiller",
+                command=_COMMAND_TEMPLATES["power_top_end_chiller"](),
+                depends_on=reset_names,
+            ),
+            SequenceStep(
+                name="track_ambient_top_end_chiller",
+                command=commands.TopEndChillerTrackAmbient(on=True, temperature=0),
+                depends_on=["power_top_end_chiller"],
+            ),
+            SequenceStep(
+                name="power_main_power_supply",
+                command=_COMMAND_TEMPLATES["power_main_power_supply"](),
+                depends_on=reset_names,
+            ),
+            SequenceStep(
+                name="power_oil_supply_system",
+                command=_COMMAND_TEMPLATES["power_oil_supply_system"](),
+                depends_on=reset_names,
+            ),
+            SequenceStep(
+                name="power_azimuth",
+                command=_COMMAND_TEMPLATES["power_azimuth"](),
+                depends_on=["power_main_power_supply", "power_oil_supply_system"],
+            ),
+            SequenceStep(
+                name="power_elevation",
+                command=_COMMAND_TEMPLATES["power_elevation"](),
+                depends_on=["power_main_power_supply", "power_oil_supply_system"],
+            ),
+            SequenceStep(
+                name="power_camera_cable_wrap",
+                command=_COMMAND_TEMPLATES["power_camera_cable_wrap"](),
+                depends_on=["power_main_power_supply"],
+            ),
+        ]
+
+    def make_disable_steps(self):
+        """Make the steps for `disable_devices`.
+
+        Stop the axes and camera cable wrap in parallel,
+        then turn off each one as soon as it has been told to stop.
+        Failures are logged and ignored, so every command is tried.
+
+        Returns
+        -------
+        steps : `List` [`SequenceStep`]
+            The steps.
+        """
+        SequenceStep = command_sequencer.SequenceStep
+        return [
+            SequenceStep(
+                name="stop_axes",
+                command=_COMMAND_TEMPLATES["stop_axes"](),
+                allow_failure=True,
+            ),
+            SequenceStep(
+                name="stop_camera_cable_wrap",
+                command=_COMMAND_TEMPLATES["stop_camera_cable_wrap"](),
+                allow_failure=True,
+            ),
+            SequenceStep(
+                name="power_off_azimuth",
+                command=_COMMAND_TEMPLATES["power_off_azimuth"](),
+                depends_on=["stop_axes"],
+                allow_failure=True,
+            ),
+            SequenceStep(
+                name="power_off_elevation",
+                command=_COMMAND_TEMPLATES["power_off_elevation"](),
+                depends_on=["stop_axes"],
+                allow_failure=True,
+            ),
+            SequenceStep(
+                name="power_off_camera_cable_wrap",
+                command=_COMMAND_TEMPLATES["power_off_camera_cable_wrap"](),
+                depends_on=["stop_camera_cable_wrap"],
+                allow_failure=True,
+            ),
+        ]
+
     async def handle_summary_state(self):
         if self.disabled_or_enabled:
             if not self.connected:
@@ -559,35 +741,207 @@ class MTMountCsc(salobj.ConfigurableCsc):
             self.log.exception(f"Failed to send command {command}: {e!r}")
             raise
 
+    async def _send_command_no_lock(self, command):
+        """Send a command without locking the port.
+
+        Intended for `CommandSequencer.run`, which sends
+        independent commands in parallel.
+        """
+        return await self.send_command(command, do_lock=False)
+
     async def _basic_send_command(self, command):
         """Implementation of send_command. Ignores the command lock.
         """
         if not self.connected:
             raise salobj.ExpectedError("Not connected to the low-level controller.")
+        futures = self._add_command_futures(command)
+        await self.communicator.write(command)
+        await self._wait_for_ack(command, futures)
+        await self._wait_for_done(command, futures)
+        return futures
+
+    def _add_command_futures(self, command):
+        """Add and return futures for a command to ``command_dict``.
+        """
         if command.sequence_id in self.command_dict:
             raise RuntimeError(
                 f"Bug! Duplicate sequence_id {command.sequence_id} in command_dict"
             )
         futures = command_futures.CommandFutures()
         self.command_dict[command.sequence_id] = futures
-        await self.communicator.write(command)
-        await asyncio.wait_for(futures.ack, self.config.ack_timeout)
+        return futures
+
+    async def _wait_for_ack(self, command, futures):
+        """Wait for a command that has been written to be acknowledged.
+
+        The timeout is ``config.ack_timeout``, or less if the command
+        has usually been acknowledged much sooner; see `latency_stats`.
+        """
+        timeout = self.latency_stats.get_ack_timeout(
+            command.command_code, default_timeout=self.config.ack_timeout
+        )
+        t0 = time.monotonic()
+        try:
+            await asyncio.wait_for(futures.ack, timeout)
+        except asyncio.TimeoutError:
+            self.command_dict.pop(command.sequence_id, None)
+            # Record the timeout as a latency, so that an adaptive timeout
+            # that is too short grows, instead of failing repeatedly.
+            self.latency_stats.add_ack_latency(command.command_code, timeout)
+            raise asyncio.TimeoutError(
+                f"Timed out after {timeout} seconds "
+                f"waiting for the Ack reply to {command}"
+            )
+        self.latency_stats.add_ack_latency(command.command_code, time.monotonic() - t0)
+
+    async def _wait_for_done(self, command, futures):
+        """Wait for a command that has been acknowledged to finish.
+
+        The timeout is the timeout in the Ack reply + `TIMEOUT_BUFFER`,
+        or more if the command has usually taken longer;
+        see `latency_stats`.
+        """
         if command.command_code in commands.AckOnlyCommandCodes:
             # This command only receives an Ack; mark it done.
             futures.done.set_result(None)
         else:
+            timeout = self.latency_stats.get_done_timeout(
+                command.command_code, default_timeout=futures.timeout + TIMEOUT_BUFFER
+            )
+            t0 = time.monotonic()
             try:
-                await asyncio.wait_for(
-                    futures.done, timeout=futures.timeout + TIMEOUT_BUFFER
-                )
+                await asyncio.wait_for(futures.done, timeout=timeout)
             except asyncio.TimeoutError:
+                # Unlike Ack timeouts, do not record this as a latency:
+                # the command may never finish, and recording it would
+                # make the next Done timeouts for this command code longer.
                 self.command_dict.pop(command.sequence_id, None)
                 raise asyncio.TimeoutError(
-                    f"Timed out after {futures.timeout + TIMEOUT_BUFFER} seconds "
+                    f"Timed out after {timeout} seconds "
                     f"waiting for the Done reply to {command}"
                 )
+            self.latency_stats.add_done_latency(
+                command.command_code, time.monotonic() - t0
+            )
         return futures
 
+    def send_command_batch(self, commands, ordered=False, do_lock=True):
+        """Send a batch of commands to the operation manager.
+
+        Parameters
+        ----------
+        commands : `List` [`Command`]
+            Commands to send. Each must have a unique sequence_id.
+        ordered : `bool`, optional
+            How to send the commands:
+
+            * False: parallel. Write all commands at once,
+              using a single socket write, and wait for them in parallel.
+              Use this for independent commands, such as stopping
+              several devices.
+            * True: pipelined. Write each command as soon as the previous
+              command is acknowledged, without waiting for it to finish.
+              This guarantees that the commands are accepted in order.
+              If a command is not acknowledged, the remaining commands
+              are not sent.
+        do_lock : `bool`, optional
+            Lock the port while using it?
+            Specify False for emergency commands.
+
+        Returns
+        -------
+        task : `asyncio.Task`
+            A task that finishes when every command has finished
+            (or failed, or not been sent). Its result is a list
+            containing, for each command, in the order of ``commands``:
+            the `CommandFutures` if the command succeeded,
+            else the exception: the reason the command failed
+            or was not sent.
+            The task only raises an exception if the batch
+            cannot be sent at all, e.g. if not connected,
+            or if it is cancelled.
+        """
+        return asyncio.create_task(
+            self._send_command_batch(commands, ordered=ordered, do_lock=do_lock)
+        )
+
+    async def _send_command_batch(self, commands, ordered, do_lock):
+        """Implementation of send_command_batch.
+        """
+        commands = list(commands)
+        try:
+            if do_lock:
+                async with self.command_lock:
+                    return await self._basic_send_command_batch(commands, ordered)
+            else:
+                return await self._basic_send_command_batch(commands, ordered)
+        except ConnectionResetError:
+            raise
+        except Exception as e:
+            self.log.exception(f"Failed to send command batch {commands}: {e!r}")
+            raise
+
+    async def _basic_send_command_batch(self, commands, ordered):
+        """Implementation of send_command_batch. Ignores the command lock.
+        """
+        if not self.connected:
+            raise salobj.ExpectedError("Not connected to the low-level controller.")
+        sequence_ids = [command.sequence_id for command in commands]
+        if len(set(sequence_ids)) != len(sequence_ids):
+            raise RuntimeError(
+                f"Bug! Duplicate sequence_id in command batch {sequence_ids}"
+            )
+        if ordered:
+            done_tasks = []
+            try:
+                for i, command in enumerate(commands):
+                    futures = self._add_command_futures(command)
+                    try:
+                        await self.communicator.write(command)
+                        await self._wait_for_ack(command, futures)
+                    except Exception as e:
+                        self.command_dict.pop(command.sequence_id, None)
+                        results = await asyncio.gather(
+                            *done_tasks, return_exceptions=True
+                        )
+                        not_sent_error = salobj.ExpectedError(
+                            f"Not sent, because {command} failed: {e!r}"
+                        )
+                        return (
+                            results
+                            + [e]
+                            + [not_sent_error] * (len(commands) - len(results) - 1)
+                        )
+                    done_tasks.append(
+                        asyncio.create_task(self._wait_for_done(command, futures))
+                    )
+                return await asyncio.gather(*done_tasks, return_exceptions=True)
+            except asyncio.CancelledError:
+                for task in done_tasks:
+                    task.cancel()
+                raise
+        else:
+            futures_list = [self._add_command_futures(command) for command in commands]
+            try:
+                await self.communicator.write_many(commands)
+            except Exception:
+                for command in commands:
+                    self.command_dict.pop(command.sequence_id, None)
+                raise
+            return await asyncio.gather(
+                *[
+                    self._wait_for_command(command, futures)
+                    for command, futures in zip(commands, futures_list)
+                ],
+                return_exceptions=True,
+            )
+
+    async def _wait_for_command(self, command, futures):
+        """Wait for a command that has been written to finish.
+        """
+        await self._wait_for_ack(command, futures)
+        return await self._wait_for_done(command, futures)
+
     async def send_commands(self, *commands, do_lock=True):
         """Run a set of operation manager commands.
 
@@ -646,6 +1000,374 @@ class MTMountCsc(salobj.ConfigurableCsc):
             self.telemetry_client_process.terminate()
             self.telemetry_client_process = None
 
+    async def move_mirror_covers(self, open):
+        """Open or close the mirror covers.
+
+        Parameters
+        ----------
+        open : `bool`
+            Open (True) or close (False) the mirror covers?
+
+        Notes
+        -----
+        Opening retracts the mirror covers, then the mirror cover locks.
+        Closing deploys the mirror cover locks, then the mirror covers.
+        That ordering is always kept, but power is turned on for both
+        devices at the start, so that each device is ready to move
+        as soon as the other device finishes moving.
+
+        Power is left on for ``config.mirror_cover_power_off_delay``
+        seconds after the move, so back-to-back requests need not wait
+        for the devices to be powered off and on again.
+        If that delay is 0 then each device is turned off
+        as soon as it has finished moving.
+        """
+        self.mirror_cover_power_off_task.cancel()
+        power_off_delay = self.config.mirror_cover_power_off_delay
+        SequenceStep = command_sequencer.SequenceStep
+        steps = []
+        covers_ready = []
+        locks_ready = []
+        if not self.mirror_covers_power_on:
+            steps.append(
+                SequenceStep(
+                    name="power_covers", command=_COMMAND_TEMPLATES["power_covers"]()
+                )
+            )
+            covers_ready.append("power_covers")
+        if not self.mirror_cover_locks_power_on:
+            steps.append(
+                SequenceStep(
+                    name="power_locks", command=_COMMAND_TEMPLATES["power_locks"]()
+                )
+            )
+            locks_ready.append("power_locks")
+        if open:
+            steps += [
+                SequenceStep(
+                    name="move_covers",
+                    command=commands.MirrorCoversRetract(),
+                    depends_on=covers_ready,
+                ),
+                SequenceStep(
+                    name="move_locks",
+                    command=commands.MirrorCoverLocksMoveAll(deploy=False),
+                    depends_on=locks_ready + ["move_covers"],
+                ),
+            ]
+        else:
+            steps += [
+                SequenceStep(
+                    name="move_locks",
+                    command=commands.MirrorCoverLocksMoveAll(deploy=True),
+                    depends_on=locks_ready,
+                ),
+                SequenceStep(
+                    name="move_covers",
+                    command=commands.MirrorCoversDeploy(),
+                    depends_on=covers_ready + ["move_locks"],
+                ),
+            ]
+        if power_off_delay <= 0:
+            steps += [
+                SequenceStep(
+                    name="power_off_covers",
+                    command=_COMMAND_TEMPLATES["power_off_covers"](),
+                    depends_on=["move_covers"],
+                ),
+                SequenceStep(
+                    name="power_off_locks",
+                    command=_COMMAND_TEMPLATES["power_off_locks"](),
+                    depends_on=["move_locks"],
+                ),
+            ]
+        sequencer = command_sequencer.CommandSequencer(
+            name="Open mirror covers" if open else "Close mirror covers",
+            steps=steps,
+            log=self.log,
+        )
+        try:
+            async with self.command_lock:
+                await sequencer.run(self._send_mirror_cover_command)
+        except Exception:
+            await self.power_off_mirror_covers()
+            raise
+        if power_off_delay > 0:
+            self.mirror_cover_power_off_task = asyncio.create_task(
+                self._delayed_power_off_mirror_covers(delay=power_off_delay)
+            )
+
+    async def _delayed_power_off_mirror_covers(self, delay):
+        """Wait, then turn off the mirror covers and mirror cover locks.
+
+        Parameters
+        ----------
+        delay : `float`
+            Time to wait before turning them off (seconds).
+        """
+        await asyncio.sleep(delay)
+        async with self.command_lock:
+            await self.power_off_mirror_covers()
+
+    async def power_off_mirror_covers(self):
+        """Turn off the mirror covers and mirror cover locks, if on.
+
+        Does not lock the command port. Failures are logged and ignored.
+        """
+        power_off_commands = []
+        if self.mirror_covers_power_on:
+            power_off_commands.append(_COMMAND_TEMPLATES["power_off_covers"]())
+        if self.mirror_cover_locks_power_on:
+            power_off_commands.append(_COMMAND_TEMPLATES["power_off_locks"]())
+        if not power_off_commands or not self.connected:
+            return
+        sequencer = command_sequencer.CommandSequencer(
+            name="Power off mirror covers",
+            steps=[
+                command_sequencer.SequenceStep(
+                    name=command.command_code.name.lower(),
+                    command=command,
+                    allow_failure=True,
+                )
+                for command in power_off_commands
+            ],
+            log=self.log,
+        )
+        await sequencer.run(self._send_mirror_cover_command)
+
+    async def _send_mirror_cover_command(self, command):
+        """Send a mirror cover or mirror cover lock command,
+        keeping track of which devices are powered on.
+
+        The power flag is cleared before sending a power off command,
+        so that if the command fails or is interrupted,
+        the next move turns the device back on.
+        """
+        power_attr = {
+            enums.CommandCode.MIRROR_COVERS_POWER: "mirror_covers_power_on",
+            enums.CommandCode.MIRROR_COVER_LOCKS_POWER: "mirror_cover_locks_power_on",
+        }.get(command.command_code)
+        if power_attr is not None and not command.on:
+            setattr(self, power_attr, False)
+        await self.send_command(command, do_lock=False)
+        if power_attr is not None and command.on:
+            setattr(self, power_attr, True)
+
+    def track_trajectory(self, trajectory, track_id=0, tracksys="", radesys=""):
+        """Start streaming a tracking trajectory to the azimuth
+        and elevation axes.
+
+        The trajectory is sampled every ``config.track_trajectory_interval``
+        seconds and each sample is sent as a `commands.BothAxesTrack`
+        command ``config.track_trajectory_advance_time`` seconds before
+        its TAI time. This replaces any trajectory already being streamed.
+        Call ``startTracking`` first.
+
+        Parameters
+        ----------
+        trajectory : `Trajectory`
+            The trajectory to follow.
+        track_id : `int`, optional
+            Track ID, for the ``target`` event.
+        tracksys : `str`, optional
+            Tracking coordinate system, for the ``target`` event.
+        radesys : `str`, optional
+            Coordinate reference frame, for the ``target`` event.
+
+        Returns
+        -------
+        track_trajectory_task : `asyncio.Task`
+            The task streaming the trajectory.
+            It finishes when the last sample has been sent,
+            and is cancelled if another trajectory is started,
+            a ``trackTarget`` command is received,
+            or the axes are stopped.
+
+        Raises
+        ------
+        salobj.ExpectedError
+            If the trajectory has already ended
+            or the samples exceed the axis limits.
+        """
+        self.assert_enabled()
+        advance_time = self.config.track_trajectory_advance_time
+        tai_arr = trajectory.sample_times(
+            interval=self.config.track_trajectory_interval,
+            start_tai=salobj.current_tai() + advance_time,
+        )
+        if len(tai_arr) == 0:
+            raise salobj.ExpectedError(
+                f"The trajectory ends at {trajectory.end_tai}; "
+                "it is too late to track it"
+            )
+        (
+            azimuth_arr,
+            elevation_arr,
+            azimuth_velocity_arr,
+            elevation_velocity_arr,
+        ) = trajectory(tai_arr)
+        self.check_track_setpoints(
+            tai=tai_arr,
+            position=np.column_stack((azimuth_arr, elevation_arr)),
+            velocity=np.column_stack((azimuth_velocity_arr, elevation_velocity_arr)),
+        )
+        self.track_trajectory_task.cancel()
+        self.track_trajectory_task = asyncio.create_task(
+            self._track_trajectory_loop(
+                tai_arr=tai_arr,
+                azimuth_arr=azimuth_arr,
+                elevation_arr=elevation_arr,
+                azimuth_velocity_arr=azimuth_velocity_arr,
+                elevation_velocity_arr=elevation_velocity_arr,
+                track_id=track_id,
+                tracksys=tracksys,
+                radesys=radesys,
+            )
+        )
+        return self.track_trajectory_task
+
+    async def _track_trajectory_loop(
+        self,
+        tai_arr,
+        azimuth_arr,
+        elevation_arr,
+        azimuth_velocity_arr,
+        elevation_velocity_arr,
+        track_id,
+        tracksys,
+        radesys,
+    ):
+        """Stream trajectory samples; see `track_trajectory`.
+        """
+        advance_time = self.config.track_trajectory_advance_time
+        num_late = 0
+        try:
+            for tai, azimuth, elevation, azimuth_velocity, elevation_velocity in zip(
+                tai_arr,
+                azimuth_arr,
+                elevation_arr,
+                azimuth_velocity_arr,
+                elevation_velocity_arr,
+            ):
+                delay = tai - advance_time - salobj.current_tai()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif tai <= salobj.current_tai():
+                    # Too late to send this sample.
+                    num_late += 1
+                    continue
+                await self.send_command(
+                    commands.BothAxesTrack(
+                        azimuth=azimuth,
+                        azimuth_velocity=azimuth_velocity,
+                        elevation=elevation,
+                        elevation_velocity=elevation_velocity,
+                        tai=tai,
+                    )
+                )
+                self.previous_track_setpoint = (
+                    tai,
+                    (azimuth_velocity, elevation_velocity),
+                )
+                self.evt_target.set_put(
+                    azimuth=azimuth,
+                    elevation=elevation,
+                    azimuthVelocity=azimuth_velocity,
+                    elevationVelocity=elevation_velocity,
+                    taiTime=tai,
+                    trackId=track_id,
+                    tracksys=tracksys,
+                    radesys=radesys,
+                    force_output=True,
+                )
+        except asyncio.CancelledError:
+            self.log.info("Tracking trajectory superseded or stopped")
+            raise
+        except salobj.ExpectedError as e:
+            self.log.error(f"Tracking trajectory failed: {e!r}")
+            raise
+        except Exception:
+            self.log.exception("Tracking trajectory failed")
+            raise
+        finally:
+            if num_late > 0:
+                self.log.warning(
+                    f"Skipped {num_late} tracking trajectory samples "
+                    "that were too late to send"
+                )
+
+    def estimate_slew_time(self, azimuth, elevation):
+        """Estimate the time to slew from the current position to a target.
+
+        Parameters
+        ----------
+        azimuth : `float` or `numpy.ndarray`
+            Target azimuth(s) (deg).
+        elevation : `float` or `numpy.ndarray`
+            Target elevation(s) (deg).
+
+        Returns
+        -------
+        slew_time : `float` or `numpy.ndarray`
+            Estimated slew time(s) (sec); see `estimate_slew_time`.
+
+        Raises
+        ------
+        salobj.ExpectedError
+            If the current position is not known,
+            because azimuth or elevation telemetry is not available.
+        """
+        azimuth_data = self.mtmount_remote.tel_azimuth.get()
+        elevation_data = self.mtmount_remote.tel_elevation.get()
+        if azimuth_data is None or elevation_data is None:
+            raise salobj.ExpectedError(
+                "Cannot estimate slew time: current position not known"
+            )
+        return limits.estimate_slew_time(
+            start_azimuth=azimuth_data.actualPosition,
+            start_elevation=elevation_data.actualPosition,
+            end_azimuth=azimuth,
+            end_elevation=elevation,
+        )
+
+    def check_track_setpoints(self, tai, position, velocity):
+        """Check azimuth/elevation tracking setpoints against the axis limits.
+
+        The acceleration from the previous tracking setpoint is also checked,
+        if that setpoint is recent enough.
+
+        Parameters
+        ----------
+        tai : `float` or `numpy.ndarray`
+            TAI time of each setpoint (unix seconds).
+        position : `numpy.ndarray`
+            [azimuth, elevation] position of each setpoint (deg).
+        velocity : `numpy.ndarray`
+            [azimuth, elevation] velocity of each setpoint (deg/sec).
+
+        Raises
+        ------
+        salobj.ExpectedError
+            If a limit is exceeded.
+        """
+        previous_tai = None
+        previous_velocity = None
+        first_tai = np.atleast_1d(tai)[0]
+        if self.previous_track_setpoint is not None:
+            previous_tai, previous_velocity = self.previous_track_setpoint
+            if not 0 < first_tai - previous_tai <= MAX_TRACK_SETPOINT_INTERVAL:
+                previous_tai = None
+        try:
+            self.setpoint_validator.check_setpoints(
+                tai=tai,
+                position=position,
+                velocity=velocity,
+                previous_tai=previous_tai,
+                previous_velocity=previous_velocity,
+            )
+        except ValueError as e:
+            raise salobj.ExpectedError(f"Tracking setpoint rejected: {e}")
+
     async def camera_cable_wrap_start_following(self):
         """Make the camera cable wrap start following the camera rotator.
 
@@ -698,7 +1420,9 @@ class MTMountCsc(salobj.ConfigurableCsc):
                             "Rotator data not available; stopping the camera "
                             "cable wrap until rotator data is available"
                         )
-                        await self.send_command(commands.CameraCableWrapStop())
+                        await self.send_command(
+                            _COMMAND_TEMPLATES["stop_camera_cable_wrap"]()
+                        )
                     continue
                 if paused:
                     paused = False
@@ -735,69 +1459,188 @@ class MTMountCsc(salobj.ConfigurableCsc):
         await self.telemetry_client_process.wait()
         self.fail("Telemetry process exited prematurely")
 
+    def add_reply_handler(self, reply_code, handler, raw=False):
+        """Add or replace the handler for replies with a given reply code.
+
+        Parameters
+        ----------
+        reply_code : `ReplyCode`
+            Reply code.
+        handler : ``callable``
+            Synchronous function to call for each reply read
+            with this reply code. If ``raw`` is False the function
+            receives the reply (a `replies.Reply`), else it receives
+            the reply as a list of string fields.
+        raw : `bool`, optional
+            Call ``handler`` with string fields, instead of a parsed reply?
+            This is much faster, since it avoids parsing fields
+            the handler does not need, but the handler must
+            parse and check the fields it uses.
+
+        Raises
+        ------
+        ValueError
+            If ``reply_code`` is not a valid `ReplyCode`.
+        RuntimeError
+            If ``raw`` is False and there is no reply class
+            for ``reply_code``.
+        """
+        reply_code = enums.ReplyCode(reply_code)
+        key = str(reply_code.value)
+        if raw:
+            self.reply_handlers[key] = handler
+            return
+
+        decoder = replies.ReplyDecoderDict.get(key)
+        if decoder is None:
+            raise RuntimeError(f"No reply class for reply_code={reply_code!r}")
+
+        def parse_and_handle(fields):
+            handler(decoder(fields))
+
+        self.reply_handlers[key] = parse_and_handle
+
+    def remove_reply_handler(self, reply_code):
+        """Remove the handler for replies with a given reply code.
+
+        Replies with this reply code will be logged and ignored.
+        A no-op if there is no such handler.
+
+        Parameters
+        ----------
+        reply_code : `ReplyCode`
+            Reply code.
+        """
+        reply_code = enums.ReplyCode(reply_code)
+        self.reply_handlers.pop(str(reply_code.value), None)
+
+    def _get_command_futures(self, fields, reply_name, pop):
+        """Get the command futures for an Ack, NoAck or Done reply,
+        or None if there is no such command.
+
+        Parameters
+        ----------
+        fields : `List` [`str`]
+            The reply, as string fields.
+        reply_name : `str`
+            Name of reply, e.g. "Ack"; used for the warning message.
+        pop : `bool`
+            Remove the futures from ``command_dict``?
+        """
+        sequence_id = int(fields[_SEQUENCE_ID_INDEX])
+        if pop:
+            futures = self.command_dict.pop(sequence_id, None)
+        else:
+            futures = self.command_dict.get(sequence_id, None)
+        if futures is None:
+            self.log.warning(f"Got {reply_name} for non-existent command {sequence_id}")
+        return futures
+
+    def handle_ack(self, fields):
+        """Handle an Ack reply, as a list of string fields.
+
+        Command acknowledged. Set timeout but leave futures in command_dict.
+        """
+        if len(fields) != len(replies.AckReply.field_infos):
+            raise ValueError(f"Ack reply has the wrong number of fields: {fields}")
+        futures = self._get_command_futures(fields, reply_name="Ack", pop=False)
+        if futures is not None:
+            timeout_ms = int(fields[_ACK_TIMEOUT_MS_INDEX] or 0)
+            futures.setack(timeout_ms / 100.0)
+
+    def handle_noack(self, fields):
+        """Handle a NoAck reply, as a list of string fields.
+
+        Command failed. Pop the command_dict entry and report failure.
+        """
+        if len(fields) != len(replies.NoAckReply.field_infos):
+            raise ValueError(f"NoAck reply has the wrong number of fields: {fields}")
+        futures = self._get_command_futures(fields, reply_name="NoAck", pop=True)
+        if futures is not None:
+            futures.setnoack(fields[_NOACK_EXPLANATION_INDEX])
+
+    def handle_done(self, fields):
+        """Handle a Done reply, as a list of string fields.
+
+        Command finished. Pop the command_dict entry and report success.
+        """
+        if len(fields) != len(replies.DoneReply.field_infos):
+            raise ValueError(f"Done reply has the wrong number of fields: {fields}")
+        futures = self._get_command_futures(fields, reply_name="Done", pop=True)
+        if futures is not None:
+            futures.setdone()
+
+    def handle_warning(self, reply):
+        """Handle a `replies.WarningReply`.
+        """
+        self.evt_warning.set_put(
+            code=reply.code,
+            active=reply.active,
+            text="\n".join(reply.extra_data),
+            force_output=True,
+        )
+
+    def handle_error(self, reply):
+        """Handle a `replies.ErrorReply`.
+        """
+        self.evt_error.set_put(
+            code=reply.code,
+            latched=reply.on,
+            active=reply.active,
+            text="\n".join(reply.extra_data),
+            force_output=True,
+        )
+
+    def handle_on_state_info(self, reply):
+        """Handle a `replies.OnStateInfoReply`.
+        """
+        self.log.debug(f"Ignoring OnStateInfo reply: {reply}")
+
+    def handle_in_position(self, reply):
+        """Handle a `replies.InPositionReply`.
+        """
+        if reply.what == 0:
+            self.evt_axesInPosition.set_put(azimuth=reply.in_position)
+        elif reply.what == 1:
+            self.evt_axesInPosition.set_put(elevation=reply.in_position)
+        else:
+            self.log.warning(f"Unrecognized what={reply.what} in InPositionReply")
+
+    def handle_unrecognized_reply(self, fields):
+        """Handle a reply whose reply code field
+        is not a key of `reply_handlers`.
+
+        The reply code may be valid but unusually formatted (e.g. "+2"),
+        valid but with no handler, or invalid.
+
+        Raises
+        ------
+        ValueError
+            If the reply code is not a valid `ReplyCode`.
+        """
+        reply_code = enums.ReplyCode(int(fields[0]))
+        key = str(reply_code.value)
+        handler = self.reply_handlers.get(key)
+        if handler is None:
+            self.log.warning(f"Ignoring unrecognized reply: {fields}")
+        else:
+            handler([key] + fields[1:])
+
     async def read_loop(self):
         """Read and process replies from the low-level controller.
+
+        Each reply is handled by the function in `reply_handlers`
+        for its reply code.
         """
         self.log.debug("Read loop begins")
         while self.should_be_connected and self.connected:
             try:
-                reply = await self.communicator.read()
-                if isinstance(reply, replies.AckReply):
-                    # Command acknowledged. Set timeout but leave
-                    # futures in command_dict.
-                    futures = self.command_dict.get(reply.sequence_id, None)
-                    if futures is None:
-                        self.log.warning(
-                            f"Got Ack for non-existent command {reply.sequence_id}"
-                        )
-                        continue
-                    futures.setack(reply.timeout_ms / 100.0)
-                elif isinstance(reply, replies.NoAckReply):
-                    # Command failed. Pop the command_dict entry
-                    # and report failure.
-                    futures = self.command_dict.pop(reply.sequence_id, None)
-                    if futures is None:
-                        self.log.warning(
-                            f"Got NoAck for non-existent command {reply.sequence_id}"
-                        )
-                        continue
-                    futures.setnoack(reply.explanation)
-                elif isinstance(reply, replies.DoneReply):
-                    futures = self.command_dict.pop(reply.sequence_id, None)
-                    if futures is None:
-                        self.log.warning(
-                            f"Got Done for non-existent command {reply.sequence_id}"
-                        )
-                        continue
-                    futures.setdone()
-                elif isinstance(reply, replies.WarningReply):
-                    self.evt_warning.set_put(
-                        code=reply.code,
-                        active=reply.active,
-                        text="\n".join(reply.extra_data),
-                        force_output=True,
-                    )
-                elif isinstance(reply, replies.ErrorReply):
-                    self.evt_error.set_put(
-                        code=reply.code,
-                        latched=reply.on,
-                        active=reply.active,
-                        text="\n".join(reply.extra_data),
-                        force_output=True,
-                    )
-                elif isinstance(reply, replies.OnStateInfoReply):
-                    self.log.debug(f"Ignoring OnStateInfo reply: {reply}")
-                elif isinstance(reply, replies.InPositionReply):
-                    if reply.what == 0:
-                        self.evt_axesInPosition.set_put(azimuth=reply.in_position)
-                    elif reply.what == 1:
-                        self.evt_axesInPosition.set_put(elevation=reply.in_position)
-                    else:
-                        self.log.warning(
-                            f"Unrecognized what={reply.what} in InPositionReply"
-                        )
+                fields = await self.communicator.read_fields()
+                handler = self.reply_handlers.get(fields[0])
+                if handler is None:
+                    self.handle_unrecognized_reply(fields)
                 else:
-                    self.log.warning(f"Ignoring unrecognized reply: {reply}")
+                    handler(fields)
             except asyncio.CancelledError:
                 return
             except Exception as e:
@@ -831,39 +1674,17 @@ class MTMountCsc(salobj.ConfigurableCsc):
 
     async def do_closeMirrorCovers(self, data):
         self.assert_enabled()
-        # Deploy the mirror cover locks/guides.
-        await self.send_commands(
-            commands.MirrorCoverLocksPower(on=True),
-            commands.MirrorCoverLocksMoveAll(deploy=True),
-            commands.MirrorCoverLocksPower(on=False),
-        )
-        # Deploy the mirror covers.
-        await self.send_commands(
-            commands.MirrorCoversPower(on=True),
-            commands.MirrorCoversDeploy(),
-            commands.MirrorCoversPower(on=False),
-        )
+        await self.move_mirror_covers(open=False)
 
     async def do_openMirrorCovers(self, data):
         self.assert_enabled()
-        # Retract the mirror covers.
-        await self.send_commands(
-            commands.MirrorCoversPower(on=True),
-            commands.MirrorCoversRetract(),
-            commands.MirrorCoversPower(on=False),
-        )
-        # Retract the mirror cover locks/guides.
-        await self.send_commands(
-            commands.MirrorCoverLocksPower(on=True),
-            commands.MirrorCoverLocksMoveAll(deploy=False),
-            commands.MirrorCoverLocksPower(on=False),
-        )
+        await self.move_mirror_covers(open=True)
 
     async def do_disableCameraCableWrapFollowing(self, data):
         self.assert_enabled()
         self.camera_cable_wrap_follow_start_task.cancel()
         self.camera_cable_wrap_follow_loop_task.cancel()
-        await self.send_command(commands.CameraCableWrapStop())
+        await self.send_command(_COMMAND_TEMPLATES["stop_camera_cable_wrap"]())
 
     async def do_enableCameraCableWrapFollowing(self, data):
         self.assert_enabled()
@@ -875,12 +1696,29 @@ class MTMountCsc(salobj.ConfigurableCsc):
 
     async def do_moveToTarget(self, data):
         self.assert_enabled()
+        try:
+            self.setpoint_validator.check_positions([data.azimuth, data.elevation])
+        except ValueError as e:
+            raise salobj.ExpectedError(f"Target rejected: {e}")
+        try:
+            slew_time = self.estimate_slew_time(
+                azimuth=data.azimuth, elevation=data.elevation
+            )
+            self.log.info(f"Estimated slew time is {slew_time:0.1f} seconds")
+        except salobj.ExpectedError as e:
+            self.log.warning(str(e))
         await self.send_command(
             commands.BothAxesMove(azimuth=data.azimuth, elevation=data.elevation),
         )
 
     async def do_trackTarget(self, data):
         self.assert_enabled()
+        self.track_trajectory_task.cancel()
+        self.check_track_setpoints(
+            tai=data.taiTime,
+            position=[data.azimuth, data.elevation],
+            velocity=[data.azimuthVelocity, data.elevationVelocity],
+        )
         await self.send_command(
             commands.BothAxesTrack(
                 azimuth=data.azimuth,
@@ -890,6 +1728,10 @@ class MTMountCsc(salobj.ConfigurableCsc):
                 tai=data.taiTime,
             ),
         )
+        self.previous_track_setpoint = (
+            data.taiTime,
+            (data.azimuthVelocity, data.elevationVelocity),
+        )
         self.evt_target.set_put(
             azimuth=data.azimuth,
             elevation=data.elevation,
@@ -904,6 +1746,7 @@ class MTMountCsc(salobj.ConfigurableCsc):
 
     async def do_startTracking(self, data):
         self.assert_enabled()
+        self.previous_track_setpoint = None
         await self.send_commands(
             commands.ElevationAxisEnableTracking(),
             commands.AzimuthAxisEnableTracking(),
@@ -911,10 +1754,22 @@ class MTMountCsc(salobj.ConfigurableCsc):
 
     async def do_stop(self, data):
         self.assert_enabled()
-        await self.send_commands(
-            commands.BothAxesStop(), commands.CameraCableWrapStop(), do_lock=False,
+        self.track_trajectory_task.cancel()
+        self.previous_track_setpoint = None
+        # Stop everything at once, and report the first failure, if any.
+        results = await self.send_command_batch(
+            [
+                _COMMAND_TEMPLATES["stop_axes"](),
+                _COMMAND_TEMPLATES["stop_camera_cable_wrap"](),
+            ],
+            do_lock=False,
         )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
 
     async def do_stopTracking(self, data):
         self.assert_enabled()
-        await self.send_command(commands.BothAxesStop())
+        self.track_trajectory_task.cancel()
+        self.previous_track_setpoint = None
+        await self.send_command(_COMMAND_TEMPLATES["stop_axes"]())
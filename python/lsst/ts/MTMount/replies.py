@@ -30,6 +30,7 @@ __all__ = [
     "InPositionReply",
     "Replies",
     "ReplyDict",
+    "ReplyDecoderDict",
     "parse_reply",
 ]
 
@@ -230,9 +231,20 @@ def _make_reply_dict():
     return reply_dict
 
 
-# Dict of CommandCode: CommandClass
+# Dict of ReplyCode: ReplyClass
 ReplyDict = _make_reply_dict()
 
+# Dict of reply_code as a string: decoder for that reply,
+# as made by `BaseMessage.make_decoder`. The key is the
+# reply_code field exactly as it is encoded, e.g. "2",
+# so a reply can be decoded with a single dict lookup.
+# Replies added to `ReplyDict` later are still parsed,
+# but by the slower path in `parse_reply`.
+ReplyDecoderDict = {
+    ReplyClass.field_infos[0].str_from_value(reply_code): ReplyClass.make_decoder()
+    for reply_code, ReplyClass in ReplyDict.items()
+}
+
 
 def parse_reply(fields):
     """Parse a set of strings as a reply.
@@ -250,9 +262,14 @@ def parse_reply(fields):
     """
     if len(fields) < 1:
         raise ValueError("No fields provided")
-    reply_code = enums.ReplyCode(int(fields[0]))
-    try:
-        ReplyClass = ReplyDict[reply_code]
-    except KeyError:
-        raise RuntimeError(f"Invalid reply_code={reply_code}")
-    return ReplyClass.from_str_fields(fields)
+    decoder = ReplyDecoderDict.get(fields[0])
+    if decoder is None:
+        # Handle unusual representations of the reply code, such as "+2",
+        # and replies added to ReplyDict after this module was imported.
+        reply_code = enums.ReplyCode(int(fields[0]))
+        try:
+            ReplyClass = ReplyDict[reply_code]
+        except KeyError:
+            raise RuntimeError(f"Invalid reply_code={reply_code}")
+        return ReplyClass.from_str_fields(fields)
+    return decoder(fields)
@@ -0,0 +1,508 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["EntryPoint", "StartupProfiler"]
+
+import argparse
+import dataclasses
+import os
+import pathlib
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import yaml
+
+from . import constants
+
+# Host used for the sockets of the entry points.
+LOCAL_HOST = "127.0.0.1"
+# Interval between checks that an entry point is listening (sec).
+POLL_INTERVAL = 0.01
+# Default allowed fractional increase of a metric over the baseline.
+DEFAULT_TOLERANCE = 0.2
+# Increases smaller than this are never regressions,
+# to avoid flagging noise in small values.
+# Dict of text in a metric name: allowed absolute increase.
+ABSOLUTE_TOLERANCES = {"time": 0.05, "rss": 5}
+
+# Default directory containing the entry point scripts.
+DEFAULT_BIN_DIR = pathlib.Path(__file__).parents[4] / "bin"
+
+
+@dataclasses.dataclass
+class EntryPoint:
+    """An entry point (command-line script) to profile.
+
+    Parameters
+    ----------
+    script : `str`
+        Name of the script; the file is looked up in the bin directory.
+    import_statement : `str`
+        Statement that imports what the script uses.
+    make_args : callable or `None`
+        Function that takes a port number and returns
+        the command-line arguments for the script, as a list of str.
+        None if the script does not use a socket.
+    ready : `str` or `None`
+        How to tell that the script has started:
+
+        * "listen": the script listens on the port.
+        * "connect": the script connects to the port.
+        * None: there is no socket to check, so only
+          the import time and memory are measured.
+    port : `int` or `None`
+        Port to use. If None then pick a free port.
+    """
+
+    script: str
+    import_statement: str
+    make_args: typing.Optional[typing.Callable] = None
+    ready: typing.Optional[str] = None
+    port: typing.Optional[int] = None
+
+
+# The entry points in bin/, in the order they are profiled.
+# The CSC and MTMountCommander talk to SAL, not a socket,
+# so only their import time and memory are measured.
+DEFAULT_ENTRY_POINTS = (
+    EntryPoint(
+        script="run_mtmount.py",
+        import_statement="from lsst.ts.MTMount import MTMountCsc",
+    ),
+    EntryPoint(
+        script="run_mtmount_telemetry_client.py",
+        import_statement="from lsst.ts.MTMount import TelemetryClient",
+        make_args=lambda port: ["--host", LOCAL_HOST, "--port", str(port)],
+        ready="connect",
+    ),
+    EntryPoint(
+        script="run_mock_tma.py",
+        import_statement="from lsst.ts.MTMount import mock",
+        # The command port uses two ports (command and reply),
+        # so put the telemetry port, which is checked, after them.
+        make_args=lambda port: [
+            "--command-port",
+            str(port - 2),
+            "--telemetry-port",
+            str(port),
+        ],
+        ready="listen",
+    ),
+    EntryPoint(
+        script="command_mtmount.py",
+        import_statement="from lsst.ts.MTMount import MTMountCommander",
+    ),
+    EntryPoint(
+        script="command_tma.py",
+        import_statement="from lsst.ts.MTMount import TmaCommander",
+        make_args=lambda port: ["--host", LOCAL_HOST],
+        ready="connect",
+        port=constants.CSC_COMMAND_PORT,
+    ),
+)
+
+
+def get_free_port():
+    """Get a free TCP/IP port.
+    """
+    with socket.socket() as sock:
+        sock.bind((LOCAL_HOST, 0))
+        return sock.getsockname()[1]
+
+
+class StartupProfiler:
+    """Measure the startup time and memory of command-line scripts.
+
+    For each entry point, measure:
+
+    * ``import_time``: time to import what the script uses (sec),
+      measured inside a new Python process.
+    * ``ready_time``: time from starting the script to its first
+      socket listen or connect (sec). Omitted for scripts
+      that do not use a socket.
+    * ``peak_rss``: peak resident memory of the script (MB).
+
+    Each is measured cold, with an empty bytecode cache
+    (so every module is compiled), and warm, as the median of
+    several runs with a populated cache. The peak memory is
+    only reported warm, since compiling barely changes it.
+
+    Parameters
+    ----------
+    entry_points : `List` [`EntryPoint`], optional
+        Entry points to profile. If None then profile all
+        the scripts in ``bin``.
+    num_warm_runs : `int`, optional
+        Number of warm runs of each measurement.
+    timeout : `float`, optional
+        Maximum time to wait for a script to start (sec).
+    bin_dir : `str` or `pathlib.Path`, optional
+        Directory containing the scripts.
+        If None then use the ``bin`` directory of this package.
+
+    Notes
+    -----
+    The SAL scripts need a working SAL environment,
+    just as when they are run normally.
+    Only one profiler may run at a time, because
+    ``command_tma.py`` always uses the same port.
+    """
+
+    def __init__(self, entry_points=None, num_warm_runs=5, timeout=60, bin_dir=None):
+        if num_warm_runs < 1:
+            raise ValueError(f"num_warm_runs={num_warm_runs} must be >= 1")
+        self.entry_points = (
+            DEFAULT_ENTRY_POINTS if entry_points is None else tuple(entry_points)
+        )
+        self.num_warm_runs = num_warm_runs
+        self.timeout = timeout
+        self.bin_dir = pathlib.Path(DEFAULT_BIN_DIR if bin_dir is None else bin_dir)
+
+    @classmethod
+    def main(cls):
+        """Parse command-line arguments and profile the entry points.
+
+        Exit with status 1 if a regression is found.
+        """
+        parser = argparse.ArgumentParser(
+            "Profile the startup time and memory of the MTMount scripts"
+        )
+        parser.add_argument(
+            "scripts", nargs="*", help="Scripts to profile; all of them if omitted.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Number of warm runs of each measurement.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Maximum time to wait for a script to start (sec).",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Baseline file (yaml) with which to compare the results.",
+        )
+        parser.add_argument(
+            "--save-baseline", help="Save the results to this file (yaml).",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help="Allowed fractional increase over the baseline.",
+        )
+        namespace = parser.parse_args()
+        entry_point_dict = {
+            entry_point.script: entry_point for entry_point in DEFAULT_ENTRY_POINTS
+        }
+        try:
+            entry_points = [entry_point_dict[name] for name in namespace.scripts]
+        except KeyError as e:
+            parser.error(f"Unknown script {e}; choose from {list(entry_point_dict)}")
+        profiler = cls(
+            entry_points=entry_points or None,
+            num_warm_runs=namespace.runs,
+            timeout=namespace.timeout,
+        )
+        results = profiler.run()
+        print(format_results(results))
+        if namespace.save_baseline:
+            with open(namespace.save_baseline, "w") as f:
+                yaml.safe_dump(results, f)
+            print(f"Saved baseline {namespace.save_baseline}")
+        if namespace.baseline:
+            with open(namespace.baseline, "r") as f:
+                baseline = yaml.safe_load(f)
+            regressions = find_regressions(
+                results=results, baseline=baseline, tolerance=namespace.tolerance
+            )
+            for regression in regressions:
+                print(f"REGRESSION: {regression}")
+            if regressions:
+                sys.exit(1)
+            print(f"No regressions relative to {namespace.baseline}")
+
+    def run(self):
+        """Profile the entry points.
+
+        Returns
+        -------
+        results : `dict` [`str`, `dict` [`str`, `float`]]
+            Dict of script name: dict of metric name: value.
+            Metric names have a suffix of ``_cold`` or ``_warm``,
+            except ``peak_rss``.
+        """
+        return {
+            entry_point.script: self.profile(entry_point)
+            for entry_point in self.entry_points
+        }
+
+    def profile(self, entry_point):
+        """Profile one entry point.
+
+        Returns
+        -------
+        metrics : `dict` [`str`, `float`]
+            Dict of metric name: value. See `run`.
+        """
+        metrics = dict()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # The first run compiles every module into the new cache.
+            env = dict(os.environ, PYTHONPYCACHEPREFIX=cache_dir)
+            import_time, import_rss = self.measure_import(entry_point, env=env)
+            metrics["import_time_cold"] = import_time
+            warm_import = [
+                self.measure_import(entry_point, env=env)
+                for i in range(self.num_warm_runs)
+            ]
+            metrics["import_time_warm"] = statistics.median(
+                value[0] for value in warm_import
+            )
+            peak_rss = max(value[1] for value in warm_import)
+            if entry_point.ready is not None:
+                # Use a separate cache for the cold run of the script,
+                # so it is as cold as the cold import.
+                with tempfile.TemporaryDirectory() as script_cache_dir:
+                    metrics["ready_time_cold"] = self.measure_ready(
+                        entry_point,
+                        env=dict(os.environ, PYTHONPYCACHEPREFIX=script_cache_dir),
+                    )[0]
+                warm_ready = [
+                    self.measure_ready(entry_point, env=env)
+                    for i in range(self.num_warm_runs)
+                ]
+                metrics["ready_time_warm"] = statistics.median(
+                    value[0] for value in warm_ready
+                )
+                peak_rss = max(value[1] for value in warm_ready)
+            metrics["peak_rss"] = peak_rss
+        return metrics
+
+    def measure_import(self, entry_point, env):
+        """Measure the time and memory to import what a script uses.
+
+        Returns
+        -------
+        import_time : `float`
+            Time to import (sec).
+        peak_rss : `float`
+            Peak resident memory of the process (MB).
+        """
+        code = (
+            "import time\n"
+            "t0 = time.perf_counter()\n"
+            f"{entry_point.import_statement}\n"
+            "print(time.perf_counter() - t0)\n"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", code], env=env, stdout=subprocess.PIPE, text=True,
+        )
+        output = process.stdout.read()
+        process.stdout.close()
+        returncode, peak_rss = self.wait_process(process)
+        if returncode != 0:
+            raise RuntimeError(
+                f"Import for {entry_point.script} failed with code {returncode}"
+            )
+        return float(output.split()[-1]), peak_rss
+
+    def measure_ready(self, entry_point, env):
+        """Measure the time for a script to listen on or connect to its port.
+
+        Stop the script as soon as it is ready.
+
+        Returns
+        -------
+        ready_time : `float`
+            Time from starting the script to its first listen
+            or connect (sec).
+        peak_rss : `float`
+            Peak resident memory of the process (MB).
+        """
+        port = get_free_port() if entry_point.port is None else entry_point.port
+        args = [sys.executable, str(self.bin_dir / entry_point.script)]
+        args += entry_point.make_args(port)
+        server_sock = None
+        if entry_point.ready == "connect":
+            server_sock = socket.socket()
+            server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server_sock.bind((LOCAL_HOST, port))
+            server_sock.listen()
+            server_sock.settimeout(self.timeout)
+        elif entry_point.ready != "listen":
+            raise ValueError(f"Unsupported ready={entry_point.ready!r}")
+        try:
+            t0 = time.perf_counter()
+            process = subprocess.Popen(
+                args, env=env, stdout=subprocess.DEVNULL, stdin=subprocess.DEVNULL
+            )
+            try:
+                if server_sock is not None:
+                    conn, _ = server_sock.accept()
+                    conn.close()
+                else:
+                    self.wait_listen(process=process, port=port)
+                ready_time = time.perf_counter() - t0
+            finally:
+                if process.returncode is None:
+                    process.send_signal(signal.SIGTERM)
+                _, peak_rss = self.wait_process(process, timeout=self.timeout)
+        finally:
+            if server_sock is not None:
+                server_sock.close()
+        return ready_time, peak_rss
+
+    def wait_listen(self, process, port):
+        """Wait until a process is listening on a port.
+
+        Raises
+        ------
+        RuntimeError
+            If the process exits first.
+        TimeoutError
+            If the process does not listen in time.
+        """
+        end_time = time.perf_counter() + self.timeout
+        while time.perf_counter() < end_time:
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Process exited with code {process.returncode} before listening"
+                )
+            try:
+                with socket.create_connection((LOCAL_HOST, port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(POLL_INTERVAL)
+        raise TimeoutError(f"Process did not listen on port {port} in time")
+
+    def wait_process(self, process, timeout=None):
+        """Wait for a process to exit.
+
+        Parameters
+        ----------
+        process : `subprocess.Popen`
+            Process.
+        timeout : `float` or `None`, optional
+            Time to wait before killing the process (sec).
+            If None then wait forever.
+
+        Returns
+        -------
+        returncode : `int`
+            Process return code.
+        peak_rss : `float`
+            Peak resident memory of the process (MB).
+        """
+        if process.returncode is not None:
+            # Already reaped (by poll); the memory is no longer available.
+            return process.returncode, float("nan")
+        end_time = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            options = 0 if end_time is None else os.WNOHANG
+            pid, status, rusage = os.wait4(process.pid, options)
+            if pid != 0:
+                break
+            if time.perf_counter() > end_time:
+                process.kill()
+                end_time = None
+            else:
+                time.sleep(POLL_INTERVAL)
+        # Decode the status as subprocess does (os.waitstatus_to_exitcode
+        # requires Python 3.9).
+        if os.WIFSIGNALED(status):
+            process.returncode = -os.WTERMSIG(status)
+        elif os.WIFEXITED(status):
+            process.returncode = os.WEXITSTATUS(status)
+        else:
+            raise RuntimeError(f"Unexpected wait status {status} for pid {pid}")
+        # ru_maxrss is in kB on Linux and bytes on macOS.
+        scale = 1e-6 if sys.platform == "darwin" else 1e-3
+        return process.returncode, rusage.ru_maxrss * scale
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare results to a baseline.
+
+    Parameters
+    ----------
+    results : `dict`
+        Results from `StartupProfiler.run`.
+    baseline : `dict`
+        Baseline results, in the same format.
+    tolerance : `float`, optional
+        Allowed fractional increase of each metric.
+
+    Returns
+    -------
+    regressions : `List` [`str`]
+        A description of each metric that exceeds its baseline
+        by more than the allowed amount. Metrics that are missing
+        from the baseline or are nan are ignored.
+    """
+    regressions = []
+    for script, metrics in results.items():
+        baseline_metrics = baseline.get(script, {})
+        for name, value in metrics.items():
+            baseline_value = baseline_metrics.get(name)
+            if baseline_value is None:
+                continue
+            absolute_tolerance = next(
+                (tol for text, tol in ABSOLUTE_TOLERANCES.items() if text in name), 0
+            )
+            max_value = max(
+                baseline_value * (1 + tolerance), baseline_value + absolute_tolerance
+            )
+            if value > max_value:
+                regressions.append(
+                    f"{script} {name}={value:0.3f} > {max_value:0.3f} "
+                    f"(baseline {baseline_value:0.3f})"
+                )
+    return regressions
+
+
+def format_results(results):
+    """Format results from `StartupProfiler.run` as a table.
+    """
+    names = []
+    for metrics in results.values():
+        names += [name for name in metrics if name not in names]
+    script_width = max(len("script"), *(len(script) for script in results))
+    lines = [
+        " ".join([f"{'script':<{script_width}}"] + [f"{name:>16}" for name in names])
+    ]
+    for script, metrics in results.items():
+        values = [
+            f"{metrics[name]:16.3f}" if name in metrics else f"{'-':>16}"
+            for name in names
+        ]
+        lines.append(" ".join([f"{script:<{script_width}}"] + values))
+    lines.append("Times are in seconds and peak_rss is in MB.")
+    return "\n".join(lines)
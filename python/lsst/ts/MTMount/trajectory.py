@@ -0,0 +1,210 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["Trajectory"]
+
+import numpy as np
+
+
+class Trajectory:
+    """A short azimuth/elevation tracking trajectory.
+
+    The trajectory is a cubic Hermite spline through a sequence of
+    position and velocity setpoints for each axis,
+    which means position and velocity are both continuous.
+
+    Parameters
+    ----------
+    tai : `List` [`float`]
+        TAI time of each setpoint (unix seconds).
+        Must contain at least two values and be strictly increasing.
+    azimuth : `List` [`float`]
+        Azimuth at each time (deg).
+    elevation : `List` [`float`]
+        Elevation at each time (deg).
+    azimuth_velocity : `List` [`float`]
+        Azimuth velocity at each time (deg/sec).
+    elevation_velocity : `List` [`float`]
+        Elevation velocity at each time (deg/sec).
+
+    Raises
+    ------
+    ValueError
+        If the arrays are not all the same length, contain fewer than
+        two values, or ``tai`` is not strictly increasing.
+    """
+
+    def __init__(self, tai, azimuth, elevation, azimuth_velocity, elevation_velocity):
+        self.tai = np.array(tai, dtype=float)
+        self.azimuth = np.array(azimuth, dtype=float)
+        self.elevation = np.array(elevation, dtype=float)
+        self.azimuth_velocity = np.array(azimuth_velocity, dtype=float)
+        self.elevation_velocity = np.array(elevation_velocity, dtype=float)
+        arrays = (
+            self.tai,
+            self.azimuth,
+            self.elevation,
+            self.azimuth_velocity,
+            self.elevation_velocity,
+        )
+        if any(array.ndim != 1 for array in arrays):
+            raise ValueError("All trajectory arrays must be one-dimensional")
+        lengths = set(len(array) for array in arrays)
+        if len(lengths) != 1:
+            raise ValueError(
+                f"All trajectory arrays must be the same length; lengths={lengths}"
+            )
+        if len(self.tai) < 2:
+            raise ValueError(
+                f"A trajectory needs at least 2 points; got {len(self.tai)}"
+            )
+        if not np.all(np.diff(self.tai) > 0):
+            raise ValueError("tai must be strictly increasing")
+
+    @property
+    def start_tai(self):
+        """TAI time of the first setpoint (unix seconds).
+        """
+        return self.tai[0]
+
+    @property
+    def end_tai(self):
+        """TAI time of the last setpoint (unix seconds).
+        """
+        return self.tai[-1]
+
+    def __call__(self, tai):
+        """Compute azimuth and elevation position and velocity.
+
+        Parameters
+        ----------
+        tai : `float` or `numpy.ndarray`
+            TAI time(s) (unix seconds).
+            Must be in the range [start_tai, end_tai].
+
+        Returns
+        -------
+        azimuth, elevation, azimuth_velocity, elevation_velocity : \
+                `float` or `numpy.ndarray`
+            Azimuth and elevation position (deg) and velocity (deg/sec)
+            at the specified time(s).
+
+        Raises
+        ------
+        ValueError
+            If any ``tai`` is out of range.
+        """
+        tai_arr = np.asarray(tai, dtype=float)
+        if np.any(tai_arr < self.start_tai) or np.any(tai_arr > self.end_tai):
+            raise ValueError(
+                f"tai={tai} not in range [{self.start_tai}, {self.end_tai}]"
+            )
+        # Index of the start of the segment containing each time.
+        i = np.clip(
+            np.searchsorted(self.tai, tai_arr, side="right") - 1, 0, len(self.tai) - 2,
+        )
+        dt = self.tai[i + 1] - self.tai[i]
+        s = (tai_arr - self.tai[i]) / dt
+        azimuth, azimuth_velocity = self._hermite(
+            s=s, dt=dt, i=i, pos=self.azimuth, vel=self.azimuth_velocity
+        )
+        elevation, elevation_velocity = self._hermite(
+            s=s, dt=dt, i=i, pos=self.elevation, vel=self.elevation_velocity
+        )
+        return azimuth, elevation, azimuth_velocity, elevation_velocity
+
+    def sample_times(self, interval, start_tai=None):
+        """Get evenly spaced times at which to sample this trajectory.
+
+        Parameters
+        ----------
+        interval : `float`
+            Interval between samples (seconds). Must be positive.
+        start_tai : `float`, optional
+            Earliest time of interest (TAI unix seconds).
+            If None or earlier than `start_tai` then use `start_tai`.
+
+        Returns
+        -------
+        tai : `numpy.ndarray`
+            Sample times (TAI unix seconds). The first time is
+            ``start_tai`` and the times are spaced by ``interval``.
+            The last time is always `end_tai`, so the final setpoint
+            is never skipped; it replaces the preceding sample if that
+            is less than ``interval/2`` earlier, so the last interval
+            is between ``interval/2`` and ``1.5 * interval``
+            (and the only time is `end_tai` if ``start_tai``
+            is less than ``interval/2`` before `end_tai`).
+            Empty if ``start_tai`` > `end_tai`.
+        """
+        if interval <= 0:
+            raise ValueError(f"interval={interval} must be positive")
+        if start_tai is None or start_tai < self.start_tai:
+            start_tai = self.start_tai
+        if start_tai > self.end_tai:
+            return np.zeros(0)
+        tai = np.arange(start_tai, self.end_tai, interval)
+        # Due to roundoff error, the last sample may be slightly
+        # before end_tai when end_tai - start_tai is (nearly)
+        # a multiple of interval; end_tai replaces such a sample.
+        if len(tai) > 0 and self.end_tai - tai[-1] < interval / 2:
+            tai = tai[:-1]
+        return np.append(tai, self.end_tai)
+
+    @staticmethod
+    def _hermite(s, dt, i, pos, vel):
+        """Evaluate a cubic Hermite spline and its derivative.
+
+        Parameters
+        ----------
+        s : `numpy.ndarray`
+            Normalized time within each segment, in range [0, 1].
+        dt : `numpy.ndarray`
+            Duration of each segment (sec).
+        i : `numpy.ndarray`
+            Index of the start of each segment.
+        pos, vel : `numpy.ndarray`
+            Positions and velocities of all setpoints.
+
+        Returns
+        -------
+        position, velocity : `numpy.ndarray`
+            Position and velocity at each time.
+        """
+        p0 = pos[i]
+        p1 = pos[i + 1]
+        m0 = vel[i] * dt
+        m1 = vel[i + 1] * dt
+        s2 = s * s
+        s3 = s2 * s
+        position = (
+            (2 * s3 - 3 * s2 + 1) * p0
+            + (s3 - 2 * s2 + s) * m0
+            + (-2 * s3 + 3 * s2) * p1
+            + (s3 - s2) * m1
+        )
+        velocity = (
+            (6 * s2 - 6 * s) * p0
+            + (3 * s2 - 4 * s + 1) * m0
+            + (-6 * s2 + 6 * s) * p1
+            + (3 * s2 - 2 * s) * m1
+        ) / dt
+        return position, velocity
@@ -0,0 +1,146 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import time
+import unittest
+
+import asynctest
+
+from lsst.ts import MTMount
+
+# Time for each mock command to run (sec)
+COMMAND_DURATION = 0.2
+
+logging.basicConfig()
+
+
+class CommandSequencerTestCase(asynctest.TestCase):
+    def setUp(self):
+        self.log = logging.getLogger()
+        # List of (command, start time, end time) for each command sent.
+        self.sent = []
+        # Set of command codes that should fail.
+        self.failing_codes = set()
+
+    async def send_command(self, command):
+        """Mock send_command: sleep, then fail if requested."""
+        t0 = time.monotonic()
+        await asyncio.sleep(COMMAND_DURATION)
+        self.sent.append((command, t0, time.monotonic()))
+        if command.command_code in self.failing_codes:
+            raise RuntimeError(f"{command.command_code!r} failed, as requested")
+
+    def get_time_range(self, command_code):
+        """Get the (start time, end time) of the command with a given code."""
+        for command, t0, t1 in self.sent:
+            if command.command_code == command_code:
+                return t0, t1
+        self.fail(f"{command_code!r} not sent")
+
+    def make_steps(self, allow_failure=False):
+        SequenceStep = MTMount.SequenceStep
+        return [
+            SequenceStep(
+                name="mps",
+                command=MTMount.commands.MainPowerSupplyPower(on=True),
+                allow_failure=allow_failure,
+            ),
+            SequenceStep(
+                name="tec", command=MTMount.commands.TopEndChillerPower(on=True),
+            ),
+            SequenceStep(
+                name="az",
+                command=MTMount.commands.AzimuthAxisPower(on=True),
+                depends_on=["mps"],
+            ),
+            SequenceStep(
+                name="el",
+                command=MTMount.commands.ElevationAxisPower(on=True),
+                depends_on=["mps"],
+            ),
+        ]
+
+    async def test_parallel(self):
+        sequencer = MTMount.CommandSequencer(
+            name="test", steps=self.make_steps(), log=self.log
+        )
+        t0 = time.monotonic()
+        durations = await sequencer.run(self.send_command)
+        duration = time.monotonic() - t0
+        self.assertEqual(set(durations), {"mps", "tec", "az", "el"})
+        for step_duration in durations.values():
+            self.assertGreaterEqual(step_duration, COMMAND_DURATION * 0.9)
+        # The critical path is two commands long, not four.
+        self.assertLess(duration, COMMAND_DURATION * 3)
+        self.assertEqual(len(self.sent), 4)
+
+        mps_end = self.get_time_range(MTMount.CommandCode.MAIN_POWER_SUPPLY_POWER)[1]
+        for command_code in (
+            MTMount.CommandCode.AZIMUTH_AXIS_POWER,
+            MTMount.CommandCode.ELEVATION_AXIS_POWER,
+        ):
+            start = self.get_time_range(command_code)[0]
+            self.assertGreaterEqual(start, mps_end)
+
+    async def test_failure(self):
+        self.failing_codes = {MTMount.CommandCode.MAIN_POWER_SUPPLY_POWER}
+        sequencer = MTMount.CommandSequencer(
+            name="test", steps=self.make_steps(), log=self.log
+        )
+        with self.assertRaises(RuntimeError):
+            await sequencer.run(self.send_command)
+        sent_codes = {command.command_code for command, t0, t1 in self.sent}
+        self.assertNotIn(MTMount.CommandCode.AZIMUTH_AXIS_POWER, sent_codes)
+        self.assertNotIn(MTMount.CommandCode.ELEVATION_AXIS_POWER, sent_codes)
+
+    async def test_allowed_failure(self):
+        self.failing_codes = {MTMount.CommandCode.MAIN_POWER_SUPPLY_POWER}
+        sequencer = MTMount.CommandSequencer(
+            name="test", steps=self.make_steps(allow_failure=True), log=self.log
+        )
+        durations = await sequencer.run(self.send_command)
+        self.assertEqual(set(durations), {"mps", "tec", "az", "el"})
+        self.assertEqual(len(self.sent), 4)
+
+    def test_invalid_steps(self):
+        SequenceStep = MTMount.SequenceStep
+        command = MTMount.commands.BothAxesStop()
+        for bad_steps in (
+            # Duplicate name
+            [SequenceStep(name="a", command=command)] * 2,
+            # Unknown dependency
+            [SequenceStep(name="a", command=command, depends_on=["b"])],
+            # Cycle
+            [
+                SequenceStep(name="a", command=command, depends_on=["c"]),
+                SequenceStep(name="b", command=command, depends_on=["a"]),
+                SequenceStep(name="c", command=command, depends_on=["b"]),
+            ],
+        ):
+            with self.subTest(bad_steps=bad_steps):
+                with self.assertRaises(ValueError):
+                    MTMount.CommandSequencer(name="test", steps=bad_steps, log=self.log)
+
+
+if __name__ == "__main__":
+    unittest.main()
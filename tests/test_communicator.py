@@ -215,6 +215,103 @@ class CommunicatorTestCase(asynctest.TestCase):
             read_message = await reader.read()
             self.assertEqual(message, read_message)
 
+            await writer.write(message)
+            read_fields = await reader.read_fields()
+            self.assertEqual(read_fields, message.str_fields())
+
+        # Write all messages at once.
+        await writer.write_many(messages)
+        for message in messages:
+            read_message = await reader.read()
+            self.assertEqual(message, read_message)
+
+    async def test_write_priority(self):
+        get_write_priority = MTMount.Communicator.get_write_priority
+        for message, priority in (
+            (MTMount.commands.BothAxesStop(sequence_id=1), "EMERGENCY"),
+            (MTMount.commands.SafetyReset(sequence_id=1), "EMERGENCY"),
+            (MTMount.commands.CameraCableWrapStop(sequence_id=1), "EMERGENCY"),
+            (
+                MTMount.commands.ElevationAxisTrack(
+                    sequence_id=1, position=12, velocity=0.3, tai=1
+                ),
+                "TRACKING",
+            ),
+            (MTMount.commands.AzimuthAxisPower(sequence_id=1, on=True), "BULK"),
+            (MTMount.replies.AckReply(sequence_id=1, timeout_ms=3500), "BULK"),
+        ):
+            with self.subTest(message=message):
+                self.assertEqual(
+                    get_write_priority(message), MTMount.WritePriority[priority]
+                )
+
+        def make_warning(code):
+            return MTMount.replies.WarningReply(
+                active=True,
+                code=code,
+                subsystem=f"{SubsystemId.MIRROR_COVERS}",
+                what="test warning",
+                description="Description of the warning",
+            )
+
+        async with self.make_communicators():
+            self.assertEqual(self.comm2.num_waiting_writes, 0)
+
+            # Write enough data that draining blocks until comm1 reads,
+            # then queue more writes, with the emergency write last.
+            num_bulk1 = 20000
+            bulk1_task = asyncio.create_task(
+                self.comm2.write_many([make_warning(code=1)] * num_bulk1)
+            )
+            await asyncio.sleep(STD_TIMEOUT)
+            self.assertFalse(bulk1_task.done())
+            write_tasks = [bulk1_task]
+            for code, priority in (
+                (2, MTMount.WritePriority.BULK),
+                (3, MTMount.WritePriority.TRACKING),
+                (4, MTMount.WritePriority.BULK),
+                (5, MTMount.WritePriority.EMERGENCY),
+            ):
+                write_tasks.append(
+                    asyncio.create_task(
+                        self.comm2.write(make_warning(code=code), priority=priority)
+                    )
+                )
+            await asyncio.sleep(0)
+            self.assertEqual(self.comm2.num_waiting_writes, 4)
+
+            codes = []
+            for i in range(num_bulk1 + 4):
+                reply = await asyncio.wait_for(
+                    self.comm1.read(), timeout=CONNECT_TIMEOUT
+                )
+                codes.append(reply.code)
+            self.assertEqual(codes, [1] * num_bulk1 + [5, 3, 2, 4])
+            await asyncio.wait_for(
+                asyncio.gather(*write_tasks), timeout=CONNECT_TIMEOUT
+            )
+            self.assertEqual(self.comm2.num_waiting_writes, 0)
+
+            # A cancelled write does not block later writes.
+            bulk1_task = asyncio.create_task(
+                self.comm2.write_many([make_warning(code=1)] * num_bulk1)
+            )
+            await asyncio.sleep(STD_TIMEOUT)
+            cancelled_task = asyncio.create_task(self.comm2.write(make_warning(code=2)))
+            write_task = asyncio.create_task(self.comm2.write(make_warning(code=3)))
+            await asyncio.sleep(0)
+            cancelled_task.cancel()
+            codes = []
+            for i in range(num_bulk1 + 1):
+                reply = await asyncio.wait_for(
+                    self.comm1.read(), timeout=CONNECT_TIMEOUT
+                )
+                codes.append(reply.code)
+            self.assertEqual(codes, [1] * num_bulk1 + [3])
+            await asyncio.wait_for(
+                asyncio.gather(bulk1_task, write_task), timeout=CONNECT_TIMEOUT
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -363,6 +363,16 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             dt = time.monotonic() - t0
             print(f"opening the mirror covers took {dt:0.2f} sec")
 
+            # The devices are left powered on for a while after the move.
+            mock_locks_device = self.mock_controller.device_dict[
+                MTMount.DeviceId.MIRROR_COVER_LOCKS
+            ]
+            self.assertTrue(mock_device.power_on)
+            self.assertTrue(mock_locks_device.power_on)
+            self.assertTrue(self.csc.mirror_covers_power_on)
+            self.assertTrue(self.csc.mirror_cover_locks_power_on)
+            self.assertFalse(self.csc.mirror_cover_power_off_task.done())
+
             # Open the mirror covers again; this should be quick.
             t0 = time.monotonic()
             await self.remote.cmd_openMirrorCovers.start(timeout=STD_TIMEOUT)
@@ -388,6 +398,68 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             self.assertAlmostEqual(actuator.position(), 0)
             self.assertFalse(actuator.moving())
 
+            # With no power off delay the devices are turned off
+            # as soon as they finish moving.
+            self.csc.config.mirror_cover_power_off_delay = 0
+            await self.remote.cmd_openMirrorCovers.start(timeout=MIRROR_COVER_TIMEOUT)
+            self.assertAlmostEqual(actuator.position(), 100)
+            self.assertFalse(mock_device.power_on)
+            self.assertFalse(mock_locks_device.power_on)
+            self.assertFalse(self.csc.mirror_covers_power_on)
+            self.assertFalse(self.csc.mirror_cover_locks_power_on)
+            self.assertTrue(self.csc.mirror_cover_power_off_task.done())
+
+    async def test_reject_out_of_limits(self):
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            mock_azimuth = self.mock_controller.device_dict[
+                MTMount.DeviceId.AZIMUTH_AXIS
+            ]
+            mock_elevation = self.mock_controller.device_dict[
+                MTMount.DeviceId.ELEVATION_AXIS
+            ]
+            tai = salobj.current_tai()
+            azimuth = mock_azimuth.actuator.path.at(tai).position
+            elevation = mock_elevation.actuator.path.at(tai).position
+
+            for bad_azimuth, bad_elevation in ((azimuth, 90), (300, elevation)):
+                with self.subTest(azimuth=bad_azimuth, elevation=bad_elevation):
+                    with salobj.assertRaisesAckError():
+                        await self.remote.cmd_moveToTarget.set_start(
+                            azimuth=bad_azimuth,
+                            elevation=bad_elevation,
+                            timeout=STD_TIMEOUT,
+                        )
+
+            await self.remote.cmd_startTracking.start(timeout=STD_TIMEOUT)
+
+            # Velocity too large
+            kwargs = self.make_track_target_kwargs(
+                azimuth=azimuth, elevation=elevation, azimuthVelocity=10
+            )
+            with salobj.assertRaisesAckError():
+                await self.remote.cmd_trackTarget.set_start(
+                    **kwargs, timeout=STD_TIMEOUT
+                )
+
+            # Acceleration implied by consecutive setpoints too large
+            tai = salobj.current_tai() + 0.1
+            kwargs = self.make_track_target_kwargs(
+                azimuth=azimuth, elevation=elevation, taiTime=tai
+            )
+            await self.remote.cmd_trackTarget.set_start(**kwargs, timeout=STD_TIMEOUT)
+            kwargs = self.make_track_target_kwargs(
+                azimuth=azimuth,
+                elevation=elevation,
+                elevationVelocity=3,
+                taiTime=tai + 0.1,
+            )
+            with salobj.assertRaisesAckError():
+                await self.remote.cmd_trackTarget.set_start(
+                    **kwargs, timeout=STD_TIMEOUT
+                )
+
+            await self.remote.cmd_stopTracking.start(timeout=STD_TIMEOUT)
+
     async def test_move_to_target(self):
         async with self.make_csc(initial_state=salobj.State.ENABLED):
             await self.assert_next_sample(
@@ -417,6 +489,18 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             target_azimuth = azimuth_pvt.position + 1
             target_elevation = elevation_pvt.position + 2
             estimated_move_time = 2  # seconds
+
+            # Check the slew time estimate, once position telemetry arrives.
+            for topic in (
+                self.csc.mtmount_remote.tel_azimuth,
+                self.csc.mtmount_remote.tel_elevation,
+            ):
+                await topic.next(flush=False, timeout=STD_TIMEOUT)
+            slew_time = self.csc.estimate_slew_time(
+                azimuth=target_azimuth, elevation=target_elevation
+            )
+            self.assertGreater(slew_time, 0)
+            self.assertLess(slew_time, estimated_move_time)
             print(
                 f"start test_moveToTarget(azimuth={target_azimuth:0.2f}, "
                 f"elevation={target_elevation:0.2f})"
@@ -461,6 +545,182 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
                     self.remote.evt_axesInPosition, azimuth=False, elevation=False,
                 )
 
+    async def test_command_batch(self):
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            await self.assert_next_summary_state(salobj.State.ENABLED)
+
+            def make_track_command():
+                # Fails, because tracking is not enabled.
+                return MTMount.commands.AzimuthAxisTrack(
+                    position=0, velocity=0, tai=salobj.current_tai()
+                )
+
+            for ordered in (False, True):
+                with self.subTest(ordered=ordered):
+                    # All commands succeed.
+                    batch = [
+                        MTMount.commands.AzimuthAxisStop(),
+                        MTMount.commands.ElevationAxisStop(),
+                        MTMount.commands.CameraCableWrapStop(),
+                    ]
+                    results = await self.csc.send_command_batch(batch, ordered=ordered)
+                    self.assertEqual(len(results), len(batch))
+                    for result in results:
+                        self.assertIsInstance(result, MTMount.CommandFutures)
+                        self.assertTrue(result.done.done())
+
+                    # One command fails.
+                    batch = [
+                        MTMount.commands.AzimuthAxisStop(),
+                        make_track_command(),
+                        MTMount.commands.ElevationAxisStop(),
+                    ]
+                    results = await self.csc.send_command_batch(batch, ordered=ordered)
+                    self.assertEqual(len(results), len(batch))
+                    self.assertIsInstance(results[0], MTMount.CommandFutures)
+                    self.assertIsInstance(results[1], salobj.ExpectedError)
+                    # The last command is not sent if ordered.
+                    if ordered:
+                        self.assertIsInstance(results[2], salobj.ExpectedError)
+                        self.assertIn("Not sent", str(results[2]))
+                    else:
+                        self.assertIsInstance(results[2], MTMount.CommandFutures)
+                    self.assertEqual(self.csc.command_dict, dict())
+
+            # Duplicate sequence IDs are rejected.
+            command = MTMount.commands.AzimuthAxisStop()
+            with self.assertRaises(RuntimeError):
+                await self.csc.send_command_batch([command, command])
+
+            # The stop command stops everything at once.
+            await self.remote.cmd_stop.start(timeout=STD_TIMEOUT)
+
+    async def test_adaptive_timeouts(self):
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            await self.assert_next_summary_state(salobj.State.ENABLED)
+            stats = self.csc.latency_stats
+            command_code = MTMount.CommandCode.AZIMUTH_AXIS_STOP
+            ack_timeout = self.csc.config.ack_timeout
+            # The mock controller replies much faster than this.
+            self.assertGreater(ack_timeout, MTMount.latency_stats.MIN_ACK_TIMEOUT)
+
+            # Use the default timeouts until there are enough measurements.
+            for i in range(MTMount.latency_stats.MIN_SAMPLES - 1):
+                futures = await self.csc.send_command(
+                    MTMount.commands.AzimuthAxisStop()
+                )
+                done_timeout = futures.timeout + MTMount.mtmount_csc.TIMEOUT_BUFFER
+                self.assertEqual(
+                    stats.get_ack_timeout(command_code, default_timeout=ack_timeout),
+                    ack_timeout,
+                )
+                self.assertEqual(
+                    stats.get_done_timeout(command_code, default_timeout=done_timeout),
+                    done_timeout,
+                )
+            self.assertEqual(
+                stats.ack_trackers[command_code].histogram.num_samples,
+                MTMount.latency_stats.MIN_SAMPLES - 1,
+            )
+            self.assertEqual(
+                stats.done_trackers[command_code].histogram.num_samples,
+                MTMount.latency_stats.MIN_SAMPLES - 1,
+            )
+
+            # Once there are enough measurements, the Ack timeout
+            # shrinks to its minimum, and the Done timeout
+            # is not reduced below the default.
+            await self.csc.send_command(MTMount.commands.AzimuthAxisStop())
+            self.assertEqual(
+                stats.get_ack_timeout(command_code, default_timeout=ack_timeout),
+                MTMount.latency_stats.MIN_ACK_TIMEOUT,
+            )
+            self.assertEqual(
+                stats.get_done_timeout(command_code, default_timeout=done_timeout),
+                done_timeout,
+            )
+            self.assertFalse(stats.is_drifting(command_code))
+
+            # Statistics are kept for each command code.
+            self.assertEqual(
+                stats.get_ack_timeout(
+                    MTMount.CommandCode.ELEVATION_AXIS_STOP,
+                    default_timeout=ack_timeout,
+                ),
+                ack_timeout,
+            )
+
+            # Very slow Done replies make the Done timeout longer,
+            # but no longer than MAX_DONE_TIMEOUT_SCALE * the default.
+            for i in range(5):
+                stats.add_done_latency(command_code, 100 * done_timeout)
+            self.assertEqual(
+                stats.get_done_timeout(command_code, default_timeout=done_timeout),
+                MTMount.latency_stats.MAX_DONE_TIMEOUT_SCALE * done_timeout,
+            )
+            self.assertTrue(stats.is_drifting(command_code))
+
+            # Commands still work with the adapted timeouts.
+            await self.csc.send_command(MTMount.commands.AzimuthAxisStop())
+
+    async def test_reply_handlers(self):
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            await self.assert_next_sample(
+                self.remote.evt_axesInPosition, azimuth=False, elevation=False
+            )
+            with self.assertRaises(ValueError):
+                self.csc.add_reply_handler(reply_code=-1, handler=print)
+
+            # Add handlers that record replies, then call the standard handler:
+            # one for parsed replies and one for raw replies.
+            in_position_replies = []
+            done_fields_list = []
+
+            def handle_in_position(reply):
+                in_position_replies.append(reply)
+                self.csc.handle_in_position(reply)
+
+            def handle_done(fields):
+                done_fields_list.append(fields)
+                self.csc.handle_done(fields)
+
+            self.csc.add_reply_handler(
+                MTMount.ReplyCode.IN_POSITION, handle_in_position
+            )
+            self.csc.add_reply_handler(MTMount.ReplyCode.DONE, handle_done, raw=True)
+
+            mock_elevation = self.mock_controller.device_dict[
+                MTMount.DeviceId.ELEVATION_AXIS
+            ]
+            elevation_pvt = mock_elevation.actuator.path.at(salobj.current_tai())
+            mock_azimuth = self.mock_controller.device_dict[
+                MTMount.DeviceId.AZIMUTH_AXIS
+            ]
+            azimuth_pvt = mock_azimuth.actuator.path.at(salobj.current_tai())
+            await self.remote.cmd_moveToTarget.set_start(
+                azimuth=azimuth_pvt.position + 1,
+                elevation=elevation_pvt.position + 1,
+                timeout=STD_TIMEOUT,
+            )
+            self.assertGreater(len(done_fields_list), 0)
+            for done_fields in done_fields_list:
+                self.assertEqual(done_fields[0], str(MTMount.ReplyCode.DONE.value))
+            self.assertGreater(len(in_position_replies), 0)
+            for reply in in_position_replies:
+                self.assertIsInstance(reply, MTMount.replies.InPositionReply)
+
+            # Replies with no handler are ignored.
+            self.csc.remove_reply_handler(MTMount.ReplyCode.IN_POSITION)
+            self.csc.remove_reply_handler(MTMount.ReplyCode.IN_POSITION)
+            num_in_position = len(in_position_replies)
+            await self.remote.cmd_moveToTarget.set_start(
+                azimuth=azimuth_pvt.position,
+                elevation=elevation_pvt.position,
+                timeout=STD_TIMEOUT,
+            )
+            self.assertEqual(len(in_position_replies), num_in_position)
+            self.assertEqual(self.csc.summary_state, salobj.State.ENABLED)
+
     async def test_tracking(self):
         async with self.make_csc(initial_state=salobj.State.ENABLED):
             await self.assert_next_sample(
@@ -545,6 +805,64 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
                     self.remote.evt_axesInPosition, azimuth=False, elevation=False,
                 )
 
+    async def test_track_trajectory(self):
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            mock_azimuth = self.mock_controller.device_dict[
+                MTMount.DeviceId.AZIMUTH_AXIS
+            ]
+            mock_elevation = self.mock_controller.device_dict[
+                MTMount.DeviceId.ELEVATION_AXIS
+            ]
+            await self.remote.cmd_startTracking.start(timeout=STD_TIMEOUT)
+
+            tai0 = salobj.current_tai() + 0.5
+            initial_azimuth = mock_azimuth.actuator.path.at(tai0).position
+            initial_elevation = mock_elevation.actuator.path.at(tai0).position
+            trajectory = MTMount.Trajectory(
+                tai=[tai0, tai0 + 1, tai0 + 2],
+                azimuth=[initial_azimuth, initial_azimuth + 0.1, initial_azimuth + 0.3],
+                elevation=[initial_elevation] * 3,
+                azimuth_velocity=[0.1, 0.2, 0.2],
+                elevation_velocity=[0] * 3,
+            )
+
+            # It is too late to track a trajectory that has ended.
+            stale_trajectory = MTMount.Trajectory(
+                tai=trajectory.tai - 10,
+                azimuth=trajectory.azimuth,
+                elevation=trajectory.elevation,
+                azimuth_velocity=trajectory.azimuth_velocity,
+                elevation_velocity=trajectory.elevation_velocity,
+            )
+            with self.assertRaises(salobj.ExpectedError):
+                self.csc.track_trajectory(stale_trajectory)
+
+            task = self.csc.track_trajectory(
+                trajectory, track_id=3, tracksys="sidereal", radesys="ICRS"
+            )
+            await asyncio.wait_for(
+                task, timeout=trajectory.end_tai - tai0 + STD_TIMEOUT
+            )
+
+            # The last sample is the last point of the trajectory.
+            self.assertAlmostEqual(
+                mock_azimuth.actuator.target.position, initial_azimuth + 0.3
+            )
+            self.assertAlmostEqual(mock_azimuth.actuator.target.velocity, 0.2)
+            self.assertAlmostEqual(mock_azimuth.actuator.target.tai, trajectory.end_tai)
+            self.assertAlmostEqual(
+                mock_elevation.actuator.target.position, initial_elevation
+            )
+            data = self.remote.evt_target.get()
+            self.assertAlmostEqual(data.taiTime, trajectory.end_tai)
+            self.assertEqual(data.trackId, 3)
+
+            # Stopping tracking stops streaming a trajectory.
+            trajectory.tai += salobj.current_tai() + 0.5 - tai0
+            task = self.csc.track_trajectory(trajectory)
+            await self.remote.cmd_stopTracking.start(timeout=STD_TIMEOUT)
+            self.assertTrue(task.cancelled())
+
     async def track_target_loop(
         self, azimuth, elevation, azimuth_velocity, elevation_velocity
     ):
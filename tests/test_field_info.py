@@ -79,6 +79,11 @@ class FieldInfoTestCase(unittest.TestCase):
                 strval_round_trip = field_info.str_from_value(value)
                 self.assertEqual(strval_round_trip, strval)
 
+                self.assertTrue(field_info.values_equal(value, expected_value))
+                for other_strval, other_value in str_value_dict.items():
+                    if other_strval != strval:
+                        self.assertFalse(field_info.values_equal(value, other_value))
+
         for bad_value in bad_values:
             with self.subTest(bad_value=bad_value):
                 with self.assertRaises(ValueError):
@@ -147,7 +152,7 @@ class FieldInfoTestCase(unittest.TestCase):
         field_info = MTMount.field_info.FloatFieldInfo(name=self.name, doc=self.doc)
         self.check_name_doc(field_info)
         str_value_dict = {
-            str(float(value)): value for value in (0, 1, -1, 3.14, 9e99, 1e-5)
+            str(float(value)): value for value in (0, -0.0, 1, -1, 3.14, 9e99, 1e-5)
         }
         self.check_field_basics(
             field_info=field_info,
@@ -198,6 +203,10 @@ class FieldInfoTestCase(unittest.TestCase):
             str_value_dict={t.isot: t for t in valid_times},
             bad_values=(None, False, True, 1, 5.5, valid_date_str),
         )
+        # Other formats that astropy can recognize are also accepted.
+        self.assertEqual(
+            field_info.value_from_str("2020-04-06 22:33:57.335").isot, valid_date_str
+        )
 
     def test_reply_code_field_info(self):
         self.check_fixed_field_info(
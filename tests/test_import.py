@@ -0,0 +1,94 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import subprocess
+import sys
+import unittest
+
+from lsst.ts import MTMount
+
+# Modules that are slow to import and should only be imported when needed.
+# This omits astropy, because salobj imports it.
+HEAVY_MODULES = {
+    "lsst.ts.hexrotcomm",
+    "lsst.ts.simactuators",
+    "lsst.ts.MTMount.field_info",
+    "lsst.ts.MTMount.commands",
+    "lsst.ts.MTMount.mock",
+    "lsst.ts.MTMount.mtmount_csc",
+    "lsst.ts.MTMount.tma_commander",
+    "lsst.ts.MTMount.testutils",
+}
+
+
+def run_python(code):
+    """Run Python code in a new process and return the names
+    of the imported modules.
+
+    Use ``bin/profile_mtmount_startup.py`` to measure import times.
+    """
+    code = f"{code}\nimport sys, json\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_lazy_names(self):
+        for module_name, names in MTMount._LAZY_MODULE_EXPORTS.items():
+            with self.subTest(module_name=module_name):
+                module = getattr(MTMount, module_name)
+                self.assertEqual(module.__all__, names)
+                for name in names:
+                    self.assertIs(getattr(MTMount, name), getattr(module, name))
+        for name in MTMount.__all__:
+            with self.subTest(name=name):
+                self.assertTrue(hasattr(MTMount, name))
+                self.assertIn(name, dir(MTMount))
+        for module_name in ("commands", "field_info", "mock", "replies"):
+            self.assertIn(module_name, dir(MTMount))
+            getattr(MTMount, module_name)
+        with self.assertRaises(AttributeError):
+            MTMount.no_such_attribute
+
+    def test_import_package(self):
+        modules = run_python("import lsst.ts.MTMount")
+        self.assertEqual(modules & HEAVY_MODULES, set())
+        self.assertNotIn("astropy", modules)
+        self.assertNotIn("lsst.ts.salobj", modules)
+        self.assertIn("lsst.ts.MTMount.enums", modules)
+
+    def test_import_telemetry_client(self):
+        modules = run_python("from lsst.ts.MTMount import TelemetryClient")
+        self.assertEqual(modules & HEAVY_MODULES, set())
+        self.assertIn("lsst.ts.MTMount.telemetry_client", modules)
+
+    def test_import_csc(self):
+        modules = run_python("from lsst.ts.MTMount import MTMountCsc")
+        self.assertIn("lsst.ts.MTMount.mtmount_csc", modules)
+        self.assertNotIn("lsst.ts.MTMount.mock", modules)
+        self.assertNotIn("lsst.ts.MTMount.tma_commander", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
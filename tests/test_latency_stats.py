@@ -0,0 +1,184 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import unittest
+
+import numpy as np
+
+from lsst.ts import MTMount
+from lsst.ts.MTMount import latency_stats
+
+
+class LatencyStatsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.log = logging.getLogger()
+
+    def test_histogram(self):
+        histogram = MTMount.LatencyHistogram(min_latency=0.001, growth=2, num_bins=10)
+        self.assertIsNone(histogram.quantile(0.5))
+        np.testing.assert_allclose(histogram.upper_edges, 0.001 * 2 ** np.arange(10))
+
+        for latency, index in (
+            (0, 0),
+            (0.0005, 0),
+            (0.001, 1),
+            (0.0015, 1),
+            (0.003, 2),
+            (0.1, 7),
+            (1000, 9),
+        ):
+            with self.subTest(latency=latency):
+                histogram = MTMount.LatencyHistogram(
+                    min_latency=0.001, growth=2, num_bins=10, decay=1
+                )
+                histogram.add(latency)
+                self.assertEqual(histogram.num_samples, 1)
+                self.assertEqual(np.argmax(histogram.counts), index)
+                self.assertEqual(histogram.counts.sum(), 1)
+                quantile = histogram.quantile(0.5)
+                if index < 9:
+                    self.assertGreaterEqual(quantile, latency)
+                    self.assertLessEqual(quantile, max(latency * 2, 0.001))
+                else:
+                    self.assertEqual(quantile, histogram.upper_edges[8])
+
+        histogram = MTMount.LatencyHistogram(decay=1)
+        latencies = np.linspace(0.01, 1, num=100)
+        for latency in latencies:
+            histogram.add(latency)
+        for q in (0, 0.1, 0.5, 0.9, 1):
+            quantile = histogram.quantile(q)
+            true_quantile = np.quantile(latencies, q, method="inverted_cdf")
+            self.assertGreaterEqual(quantile, true_quantile)
+            self.assertLessEqual(quantile, true_quantile * 1.3)
+
+        for kwargs in (
+            dict(min_latency=0),
+            dict(growth=1),
+            dict(num_bins=1),
+            dict(decay=0),
+            dict(decay=1.1),
+        ):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    MTMount.LatencyHistogram(**kwargs)
+
+    def test_histogram_decay(self):
+        histogram = MTMount.LatencyHistogram(decay=0.9)
+        for i in range(100):
+            histogram.add(0.01)
+        self.assertLess(histogram.quantile(0.5), 0.0125)
+        # Old measurements lose weight, so the histogram
+        # quickly follows a change in latency.
+        for i in range(10):
+            histogram.add(1)
+        self.assertGreater(histogram.quantile(0.5), 1)
+
+        # Counts are rescaled to avoid overflow.
+        histogram = MTMount.LatencyHistogram(decay=0.5)
+        for i in range(1000):
+            histogram.add(0.01)
+        self.assertTrue(np.all(np.isfinite(histogram.counts)))
+        self.assertLess(histogram.quantile(0.5), 0.0125)
+
+    def test_timeouts(self):
+        stats = MTMount.CommandLatencyStats(log=self.log)
+        command_code = MTMount.CommandCode.AZIMUTH_AXIS_MOVE
+        other_code = MTMount.CommandCode.ELEVATION_AXIS_MOVE
+        self.assertEqual(stats.get_ack_timeout(command_code, default_timeout=10), 10)
+        self.assertEqual(stats.get_done_timeout(command_code, default_timeout=10), 10)
+
+        # Use the default timeouts until there are enough measurements.
+        for i in range(latency_stats.MIN_SAMPLES - 1):
+            stats.add_ack_latency(command_code, 0.5)
+            stats.add_done_latency(command_code, 20)
+            self.assertEqual(
+                stats.get_ack_timeout(command_code, default_timeout=10), 10
+            )
+            self.assertEqual(
+                stats.get_done_timeout(command_code, default_timeout=10), 10
+            )
+        stats.add_ack_latency(command_code, 0.5)
+        stats.add_done_latency(command_code, 20)
+
+        ack_timeout = stats.get_ack_timeout(command_code, default_timeout=10)
+        self.assertGreaterEqual(ack_timeout, latency_stats.TIMEOUT_SCALE * 0.5)
+        self.assertLess(ack_timeout, latency_stats.TIMEOUT_SCALE * 0.5 * 1.25)
+        # The Ack timeout is never longer than the default.
+        self.assertEqual(stats.get_ack_timeout(command_code, default_timeout=1), 1)
+        done_timeout = stats.get_done_timeout(command_code, default_timeout=50)
+        self.assertGreaterEqual(done_timeout, latency_stats.TIMEOUT_SCALE * 20)
+        # The Done timeout is never longer than
+        # MAX_DONE_TIMEOUT_SCALE times the default.
+        self.assertEqual(
+            stats.get_done_timeout(command_code, default_timeout=10),
+            latency_stats.MAX_DONE_TIMEOUT_SCALE * 10,
+        )
+        # The Done timeout is never shorter than the default.
+        self.assertEqual(
+            stats.get_done_timeout(command_code, default_timeout=1000), 1000
+        )
+
+        # Statistics are kept for each command code.
+        self.assertEqual(stats.get_ack_timeout(other_code, default_timeout=10), 10)
+
+        # The Ack timeout is never shorter than MIN_ACK_TIMEOUT.
+        for i in range(latency_stats.MIN_SAMPLES):
+            stats.add_ack_latency(other_code, 0.001)
+        self.assertEqual(
+            stats.get_ack_timeout(other_code, default_timeout=10),
+            latency_stats.MIN_ACK_TIMEOUT,
+        )
+
+    def test_drift(self):
+        stats = MTMount.CommandLatencyStats(log=self.log)
+        command_code = MTMount.CommandCode.AZIMUTH_AXIS_MOVE
+        for i in range(latency_stats.MIN_SAMPLES * 2):
+            stats.add_ack_latency(command_code, 0.01)
+        self.assertFalse(stats.is_drifting(command_code))
+        self.assertFalse(stats.is_drifting(MTMount.CommandCode.ELEVATION_AXIS_MOVE))
+
+        with self.assertLogs(self.log, level=logging.WARNING) as logs:
+            for i in range(10):
+                stats.add_ack_latency(command_code, 0.1)
+        self.assertTrue(stats.is_drifting(command_code))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("Ack latency", logs.output[0])
+
+        with self.assertLogs(self.log, level=logging.INFO) as logs:
+            for i in range(50):
+                stats.add_ack_latency(command_code, 0.01)
+        self.assertFalse(stats.is_drifting(command_code))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("back to normal", logs.output[0])
+
+        # Done latency is tracked separately.
+        for i in range(latency_stats.MIN_SAMPLES):
+            stats.add_done_latency(command_code, 1)
+        for i in range(5):
+            stats.add_done_latency(command_code, 10)
+        self.assertTrue(stats.is_drifting(command_code))
+        self.assertFalse(stats.ack_trackers[command_code].drifting)
+
+
+if __name__ == "__main__":
+    unittest.main()
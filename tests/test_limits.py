@@ -0,0 +1,153 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+import numpy as np
+
+from lsst.ts import MTMount
+
+
+class LimitsTestCase(unittest.TestCase):
+    def test_scaled(self):
+        limits = MTMount.Limits(
+            min_position=-10,
+            max_position=20,
+            max_velocity=3,
+            max_acceleration=4,
+            max_jerk=5,
+        )
+        scaled = limits.scaled(2)
+        self.assertEqual(scaled.min_position, -20)
+        self.assertEqual(scaled.max_position, 40)
+        self.assertEqual(scaled.max_velocity, 6)
+        self.assertEqual(scaled.max_acceleration, 8)
+        self.assertEqual(scaled.max_jerk, 10)
+        self.assertIsNone(MTMount.LimitsDict[MTMount.DeviceId.AZIMUTH_AXIS].max_jerk)
+
+    def test_trapezoidal_move_time(self):
+        limits = MTMount.Limits(
+            min_position=-100, max_position=100, max_velocity=2, max_acceleration=1
+        )
+        # Full speed is reached after moving 2 deg, so moves shorter
+        # than 4 deg never reach full speed.
+        self.assertEqual(limits.move_time(5, 5), 0)
+        self.assertAlmostEqual(limits.move_time(0, 1), 2)
+        self.assertAlmostEqual(limits.move_time(0, -4), 4)
+        self.assertAlmostEqual(limits.move_time(10, 0), 7)
+
+        # Vectorized form
+        end_position = np.array([1, -4, 10])
+        np.testing.assert_allclose(limits.move_time(0, end_position), [2, 4, 7])
+
+    def test_jerk_limited_move_time(self):
+        limits = MTMount.Limits(
+            min_position=-100,
+            max_position=100,
+            max_velocity=2,
+            max_acceleration=1,
+            max_jerk=0.5,
+        )
+        # Full acceleration is reached in 2 sec and full speed in 4 sec,
+        # after moving 4 deg. So a move of 8 deg takes 8 sec,
+        # and longer moves cruise at full speed.
+        self.assertAlmostEqual(limits.move_time(0, 8), 8)
+        self.assertAlmostEqual(limits.move_time(0, 18), 13)
+        # A move of 2 * amax^3 / jmax^2 = 8 deg just reaches full acceleration;
+        # shorter moves are limited by jerk alone: t = 4 (d / (2 jmax))^(1/3)
+        self.assertAlmostEqual(limits.move_time(0, 1), 4)
+
+        # Move time increases continuously with distance,
+        # including across the transitions between the different cases.
+        distance = np.linspace(0, 30, 3001)
+        for max_jerk, transition_distances in ((0.5, [8]), (2, [0.5, 5])):
+            jerk_limits = MTMount.Limits(
+                min_position=-100,
+                max_position=100,
+                max_velocity=2,
+                max_acceleration=1,
+                max_jerk=max_jerk,
+            )
+            duration = jerk_limits.move_time(0, distance)
+            with self.subTest(max_jerk=max_jerk):
+                self.assertTrue(np.all(np.diff(duration) > 0))
+                for transition_distance in transition_distances:
+                    self.assertAlmostEqual(
+                        jerk_limits.move_time(0, transition_distance * (1 - 1e-9)),
+                        jerk_limits.move_time(0, transition_distance * (1 + 1e-9)),
+                    )
+        duration = limits.move_time(0, distance)
+
+        # Jerk limits only make moves slower, and the difference
+        # vanishes as the jerk limit increases.
+        trapezoidal = MTMount.Limits(
+            min_position=-100, max_position=100, max_velocity=2, max_acceleration=1
+        )
+        trapezoidal_duration = trapezoidal.move_time(0, distance)
+        self.assertTrue(np.all(duration >= trapezoidal_duration))
+        fast_jerk = MTMount.Limits(
+            min_position=-100,
+            max_position=100,
+            max_velocity=2,
+            max_acceleration=1,
+            max_jerk=1e6,
+        )
+        np.testing.assert_allclose(
+            fast_jerk.move_time(0, distance), trapezoidal_duration, atol=1e-3
+        )
+
+    def test_estimate_slew_time(self):
+        azimuth_limits = MTMount.LimitsDict[MTMount.DeviceId.AZIMUTH_AXIS]
+        elevation_limits = MTMount.LimitsDict[MTMount.DeviceId.ELEVATION_AXIS]
+        slew_time = MTMount.estimate_slew_time(
+            start_azimuth=0, start_elevation=30, end_azimuth=90, end_elevation=35
+        )
+        self.assertAlmostEqual(slew_time, azimuth_limits.move_time(0, 90))
+        slew_time = MTMount.estimate_slew_time(
+            start_azimuth=0, start_elevation=30, end_azimuth=1, end_elevation=80
+        )
+        self.assertAlmostEqual(slew_time, elevation_limits.move_time(30, 80))
+
+        # Vectorized form: rank many candidate targets.
+        rng = np.random.default_rng(seed=5)
+        end_azimuth = rng.uniform(-270, 270, size=1000)
+        end_elevation = rng.uniform(20, 86.5, size=1000)
+        slew_times = MTMount.estimate_slew_time(
+            start_azimuth=10,
+            start_elevation=45,
+            end_azimuth=end_azimuth,
+            end_elevation=end_elevation,
+        )
+        self.assertEqual(slew_times.shape, (1000,))
+        for i in (0, 500, 999):
+            self.assertAlmostEqual(
+                slew_times[i],
+                MTMount.estimate_slew_time(
+                    start_azimuth=10,
+                    start_elevation=45,
+                    end_azimuth=end_azimuth[i],
+                    end_elevation=end_elevation[i],
+                ),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,9 +19,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import math
 import random
 import unittest
 
+import astropy.time
+import astropy.units
+
 from lsst.ts import MTMount
 
 random.seed(314)
@@ -37,23 +41,261 @@ class MessageTestCase(unittest.TestCase):
         message_round_trip = type(message).from_str_fields(str_fields)
         self.assertEqual(message, message_round_trip)
 
-    def check_message_type(self, message_type):
+    def check_parse(self, message, parse_function, code_index):
+        """Check that parse_function parses message.str_fields(),
+        including with an unusual representation of the code field.
+        """
+        str_fields = message.str_fields()
+        for code_str in (str_fields[code_index], "+" + str_fields[code_index]):
+            str_fields[code_index] = code_str
+            parsed_message = parse_function(str_fields)
+            self.assertIs(type(parsed_message), type(message))
+            self.assertEqual(parsed_message, message)
+            if message.has_extra_data:
+                self.assertEqual(parsed_message.extra_data, message.extra_data)
+
+    def check_message_type(self, message_type, parse_function, code_index):
         for i in range(10):
             message = MTMount.testutils.make_random_message(message_type)
             self.check_round_trip(message)
+            self.check_parse(message, parse_function, code_index)
 
             message2 = MTMount.testutils.make_random_message_with_defaults(message_type)
             self.check_round_trip(message2)
+            self.check_parse(message2, parse_function, code_index)
 
     def test_commands(self):
         for command_type in MTMount.commands.Commands:
             with self.subTest(command_type=command_type.__name__):
-                self.check_message_type(command_type)
+                self.check_message_type(
+                    command_type, MTMount.commands.parse_command, code_index=1
+                )
 
     def test_replies(self):
         for reply_type in MTMount.replies.Replies:
             with self.subTest(reply_type=reply_type.__name__):
-                self.check_message_type(reply_type)
+                self.check_message_type(
+                    reply_type, MTMount.replies.parse_reply, code_index=0
+                )
+
+    def test_slots(self):
+        for message_type in MTMount.commands.Commands + MTMount.replies.Replies:
+            with self.subTest(message_type=message_type.__name__):
+                message = MTMount.testutils.make_random_message(message_type)
+                self.assertFalse(hasattr(message, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    message.no_such_field = 1
+
+                field_names = [finfo.name for finfo in message_type.field_infos]
+                if message_type.has_extra_data:
+                    field_names.append("extra_data")
+                for field_name in field_names:
+                    self.assertTrue(hasattr(message, field_name))
+
+                # Attributes are writable.
+                message2 = MTMount.testutils.make_random_message(message_type)
+                for field_name in field_names:
+                    setattr(message, field_name, getattr(message2, field_name))
+                self.assertEqual(message, message2)
+
+        # Subclasses of message classes also have slots
+        # for their new fields, but not the inherited ones.
+        class ExtendedAck(MTMount.replies.AckReply):
+            field_infos = MTMount.replies.AckReply.field_infos + (
+                MTMount.field_info.IntFieldInfo(name="extra_int", doc="An int"),
+            )
+
+        self.assertEqual(ExtendedAck.__slots__, ("extra_int",))
+        ack = ExtendedAck(sequence_id=3, extra_int=4)
+        self.assertFalse(hasattr(ack, "__dict__"))
+        self.assertEqual(ack.sequence_id, 3)
+        self.assertEqual(ack.extra_int, 4)
+        self.check_round_trip(ack)
+
+    def test_equality_and_hash(self):
+        timestamp = astropy.time.Time("2020-04-06T22:33:57.335", scale="utc")
+        command = MTMount.commands.AzimuthAxisMove(
+            sequence_id=1, position=12, velocity=3.5, timestamp=timestamp
+        )
+        # Int and float values and timestamps that have
+        # the same string representation are equal.
+        command2 = MTMount.commands.AzimuthAxisMove(
+            sequence_id=1,
+            position=12.0,
+            velocity=3.5,
+            timestamp=timestamp + 0.0001 * astropy.units.second,
+        )
+        self.assertEqual(command, command2)
+        self.assertEqual(hash(command), hash(command2))
+        self.assertEqual(len({command, command2}), 1)
+
+        # Messages with a different field value are not equal.
+        for field_name, value in (
+            ("sequence_id", 2),
+            ("position", 12.1),
+            ("timestamp", timestamp + 0.001 * astropy.units.second),
+        ):
+            with self.subTest(field_name=field_name):
+                command3 = MTMount.commands.AzimuthAxisMove(
+                    sequence_id=1, position=12, velocity=3.5, timestamp=timestamp
+                )
+                self.assertEqual(command, command3)
+                setattr(command3, field_name, value)
+                self.assertNotEqual(command, command3)
+                self.assertNotEqual(command.encode(), command3.encode())
+
+        # NaN values are equal.
+        command_nan1 = MTMount.commands.AzimuthAxisMove(
+            sequence_id=1, position=math.nan, velocity=3.5, timestamp=timestamp
+        )
+        command_nan2 = MTMount.commands.AzimuthAxisMove(
+            sequence_id=1, position=math.nan, velocity=3.5, timestamp=timestamp
+        )
+        self.assertEqual(command_nan1, command_nan2)
+        self.assertEqual(hash(command_nan1), hash(command_nan2))
+
+        # 0.0 and -0.0 have different string representations,
+        # so they are not equal.
+        command_zero = MTMount.commands.AzimuthAxisMove(
+            sequence_id=1, position=0.0, velocity=3.5, timestamp=timestamp
+        )
+        command_minus_zero = MTMount.commands.AzimuthAxisMove(
+            sequence_id=1, position=-0.0, velocity=3.5, timestamp=timestamp
+        )
+        self.assertNotEqual(command_zero, command_minus_zero)
+        self.assertEqual(len({command_zero, command_minus_zero}), 2)
+
+        # Messages of different types are not equal,
+        # even if they have the same encoded form.
+        class OtherAzimuthAxisMove(MTMount.commands.AzimuthAxisMove):
+            pass
+
+        other_command = OtherAzimuthAxisMove(
+            sequence_id=1, position=12, velocity=3.5, timestamp=timestamp
+        )
+        self.assertEqual(other_command.encode(), command.encode())
+        self.assertNotEqual(command, other_command)
+        self.assertNotEqual(command, command.encode())
+
+        # Extra data is compared.
+        warning_kwargs = dict(
+            active=True, code=47, subsystem="a subsystem", timestamp=timestamp,
+        )
+        warning = MTMount.replies.WarningReply(extra_data=("a", "b"), **warning_kwargs)
+        self.assertEqual(
+            warning,
+            MTMount.replies.WarningReply(extra_data=("a", "b"), **warning_kwargs),
+        )
+        self.assertNotEqual(
+            warning, MTMount.replies.WarningReply(extra_data=("a",), **warning_kwargs),
+        )
+
+    def test_encode_cache(self):
+        command = MTMount.commands.AzimuthAxisMove(
+            sequence_id=1, position=12, velocity=3.5
+        )
+        encoded = command.encode()
+        self.assertEqual(encoded, ("\n".join(command.str_fields()) + "\r\n").encode())
+        self.assertIs(command.encode(), encoded)
+
+        # Setting a field clears the cache.
+        command.position = 13
+        encoded2 = command.encode()
+        self.assertNotEqual(encoded2, encoded)
+        self.assertEqual(encoded2, ("\n".join(command.str_fields()) + "\r\n").encode())
+
+        # Decoded messages encode to the same data.
+        decoded_command = MTMount.commands.parse_command(
+            encoded2.decode()[:-2].split("\n")
+        )
+        self.assertEqual(decoded_command.encode(), encoded2)
+
+    def test_command_template(self):
+        for CommandClass, kwargs in (
+            (MTMount.commands.BothAxesStop, {}),
+            (MTMount.commands.AzimuthAxisPower, dict(on=True)),
+            (MTMount.commands.MirrorCoversPower, dict(on=False, drive=2)),
+            (MTMount.commands.TopEndChillerTrackAmbient, dict(on=True, temperature=5)),
+        ):
+            with self.subTest(CommandClass=CommandClass.__name__):
+                template = MTMount.commands.CommandTemplate(CommandClass, **kwargs)
+                self.assertIs(template.CommandClass, CommandClass)
+                self.assertIn(CommandClass.__name__, repr(template))
+                command = template()
+                self.assertIsInstance(command, CommandClass)
+                for name, value in kwargs.items():
+                    self.assertEqual(getattr(command, name), value)
+
+                # The cached encoded form matches the encoded form
+                # of an equivalent command.
+                expected_command = CommandClass(
+                    sequence_id=command.sequence_id,
+                    timestamp=command.timestamp,
+                    **kwargs,
+                )
+                self.assertEqual(command, expected_command)
+                self.assertEqual(command.encode(), expected_command.encode())
+                command.sequence_id = 5
+                self.assertEqual(
+                    command.encode(),
+                    CommandClass(
+                        sequence_id=5, timestamp=command.timestamp, **kwargs
+                    ).encode(),
+                )
+
+                # Each command has a new sequence_id, unless specified.
+                command2 = template()
+                self.assertNotEqual(command2.sequence_id, command.sequence_id)
+                command3 = template(sequence_id=47)
+                self.assertEqual(command3.sequence_id, 47)
+                self.assertTrue(command3.encode().startswith(b"47\n"))
+
+        for bad_kwargs in (
+            dict(sequence_id=1),
+            dict(timestamp=astropy.time.Time.now()),
+            dict(on=None),  # missing required parameter
+        ):
+            with self.subTest(bad_kwargs=bad_kwargs):
+                with self.assertRaises(ValueError):
+                    MTMount.commands.CommandTemplate(
+                        MTMount.commands.AzimuthAxisPower, **bad_kwargs
+                    )
+
+    def test_decoder_dicts(self):
+        for decoder_dict, message_dict in (
+            (MTMount.commands.CommandDecoderDict, MTMount.commands.CommandDict),
+            (MTMount.replies.ReplyDecoderDict, MTMount.replies.ReplyDict),
+        ):
+            self.assertEqual(
+                set(decoder_dict), {str(code.value) for code in message_dict}
+            )
+
+    def test_parse_errors(self):
+        command = MTMount.commands.BothAxesStop(sequence_id=5)
+        str_fields = command.str_fields()
+        for bad_fields in (
+            str_fields[0:3],  # Too few fields
+            str_fields + ["extra"],  # Too many fields
+            str_fields[0:1] + ["no_such_code"] + str_fields[2:],
+            str_fields[0:1] + ["-999"] + str_fields[2:],
+            ["not_an_int"] + str_fields[1:],
+        ):
+            with self.subTest(bad_fields=bad_fields):
+                with self.assertRaises(ValueError):
+                    MTMount.commands.parse_command(bad_fields)
+
+        reply = MTMount.replies.NoAckReply(sequence_id=5, explanation="why")
+        str_fields = reply.str_fields()
+        for bad_fields in (
+            [],
+            str_fields[0:2],  # Too few fields
+            str_fields + ["extra"],  # Too many fields
+            ["no_such_code"] + str_fields[1:],
+            ["-999"] + str_fields[1:],
+        ):
+            with self.subTest(bad_fields=bad_fields):
+                with self.assertRaises(ValueError):
+                    MTMount.replies.parse_reply(bad_fields)
 
 
 if __name__ == "__main__":
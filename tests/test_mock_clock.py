@@ -0,0 +1,142 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import time
+import unittest
+
+import asynctest
+
+from lsst.ts import salobj
+from lsst.ts import MTMount
+
+START_TAI = 1000
+
+
+class TrivialMockController:
+    def __init__(self, clock):
+        self.command_dict = {}
+        self.log = logging.getLogger()
+        self.clock = clock
+
+
+class MockClockTestCase(asynctest.TestCase):
+    async def test_real_clock(self):
+        clock = MTMount.mock.RealClock()
+        self.assertAlmostEqual(clock.tai(), salobj.current_tai(), delta=0.1)
+        t0 = time.monotonic()
+        await clock.sleep(0.1)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.09)
+
+        # A controller with no clock uses a real clock.
+        controller = TrivialMockController(clock=None)
+        self.assertIsInstance(
+            MTMount.mock.get_clock(controller), MTMount.mock.RealClock
+        )
+
+    async def test_step_mode(self):
+        clock = MTMount.mock.VirtualClock(start_tai=START_TAI)
+        self.assertEqual(clock.tai(), START_TAI)
+
+        # List of (name, wake TAI)
+        wake_list = []
+
+        async def sleeper(name, durations):
+            for duration in durations:
+                await clock.sleep(duration)
+                wake_list.append((name, clock.tai()))
+
+        tasks = [
+            asyncio.create_task(sleeper("a", [3])),
+            asyncio.create_task(sleeper("b", [1, 1])),
+            asyncio.create_task(sleeper("c", [1.5])),
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(clock.num_sleepers, 3)
+
+        await clock.advance(1.5)
+        self.assertEqual(clock.tai(), START_TAI + 1.5)
+        self.assertEqual(wake_list, [("b", START_TAI + 1), ("c", START_TAI + 1.5)])
+
+        await clock.advance(10)
+        self.assertEqual(clock.tai(), START_TAI + 11.5)
+        self.assertEqual(
+            wake_list,
+            [
+                ("b", START_TAI + 1),
+                ("c", START_TAI + 1.5),
+                ("b", START_TAI + 2),
+                ("a", START_TAI + 3),
+            ],
+        )
+        for task in tasks:
+            self.assertTrue(task.done())
+        self.assertEqual(clock.num_sleepers, 0)
+
+        with self.assertRaises(ValueError):
+            await clock.advance(-1)
+
+    async def test_fast_mode(self):
+        clock = MTMount.mock.VirtualClock(rate=100)
+        tai0 = clock.tai()
+        t0 = time.monotonic()
+        await clock.sleep(5)
+        dt = time.monotonic() - t0
+        self.assertLess(dt, 1)
+        self.assertGreaterEqual(clock.tai() - tai0, 4.9)
+
+        with self.assertRaises(RuntimeError):
+            await clock.advance(1)
+        for bad_rate in (0, -1):
+            with self.assertRaises(ValueError):
+                MTMount.mock.VirtualClock(rate=bad_rate)
+
+    async def test_devices(self):
+        clock = MTMount.mock.VirtualClock()
+        controller = TrivialMockController(clock=clock)
+
+        covers = MTMount.mock.MirrorCoversDevice(controller=controller)
+        self.assertIs(covers.clock, clock)
+        covers.do_power(MTMount.commands.MirrorCoversPower(on=True))
+        timeout, task = covers.do_retract(MTMount.commands.MirrorCoversRetract())
+        self.assertGreater(timeout, 1)
+        await clock.advance(timeout - 0.1)
+        self.assertFalse(task.done())
+        await clock.advance(0.5)
+        self.assertTrue(task.done())
+        self.assertEqual(covers.actuator.position(tai=clock.tai()), 100)
+
+        azimuth = MTMount.mock.AxisDevice(
+            controller=controller, device_id=MTMount.DeviceId.AZIMUTH_AXIS
+        )
+        azimuth.do_power(MTMount.commands.AzimuthAxisPower(on=True))
+        timeout, task = azimuth.do_move(MTMount.commands.AzimuthAxisMove(position=20))
+        self.assertGreater(timeout, 1)
+        await clock.advance(timeout + 0.5)
+        self.assertTrue(task.done())
+        self.assertAlmostEqual(azimuth.actuator.path.at(clock.tai()).position, 20)
+        await azimuth.close()
+        await covers.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
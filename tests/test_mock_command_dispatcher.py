@@ -0,0 +1,179 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import types
+import unittest
+
+import asynctest
+
+from lsst.ts import MTMount
+
+
+class MockCommandDispatcherTestCase(asynctest.TestCase):
+    async def setUp(self):
+        self.log = logging.getLogger()
+        # List of (key, index) of commands handled, in order started.
+        self.started = []
+        # Number of commands being handled, and the maximum.
+        self.num_running = 0
+        self.max_running = 0
+        # Dict of key: max number running for that key.
+        self.running_per_key = dict()
+        self.max_running_per_key = dict()
+        self.handle_event = asyncio.Event()
+        self.handle_event.set()
+
+    async def handle_command(self, command):
+        self.started.append((command.key, command.index))
+        self.num_running += 1
+        self.max_running = max(self.max_running, self.num_running)
+        num_for_key = self.running_per_key.get(command.key, 0) + 1
+        self.running_per_key[command.key] = num_for_key
+        self.max_running_per_key[command.key] = max(
+            self.max_running_per_key.get(command.key, 0), num_for_key
+        )
+        try:
+            await self.handle_event.wait()
+            await asyncio.sleep(command.duration)
+            if command.fail:
+                raise RuntimeError("Failed, as requested")
+        finally:
+            self.num_running -= 1
+            self.running_per_key[command.key] -= 1
+
+    def make_dispatcher(self, num_workers=3, max_pending=100):
+        return MTMount.mock.CommandDispatcher(
+            handle_command=self.handle_command,
+            get_ordering_key=lambda command: command.key,
+            log=self.log,
+            num_workers=num_workers,
+            max_pending=max_pending,
+        )
+
+    def make_command(self, key, index, duration=0.01, fail=False):
+        return types.SimpleNamespace(key=key, index=index, duration=duration, fail=fail)
+
+    async def wait_idle(self, dispatcher, timeout=5):
+        async def wait():
+            while dispatcher.num_in_flight > 0:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait(), timeout=timeout)
+
+    async def test_constructor_errors(self):
+        for bad_num_workers in (0, -1):
+            with self.assertRaises(ValueError):
+                self.make_dispatcher(num_workers=bad_num_workers)
+        for bad_max_pending in (0, -1):
+            with self.assertRaises(ValueError):
+                self.make_dispatcher(max_pending=bad_max_pending)
+
+    async def test_ordering(self):
+        num_workers = 3
+        keys = ("a", "b", "c", "d", None)
+        num_per_key = 5
+        dispatcher = self.make_dispatcher(num_workers=num_workers)
+        try:
+            for index in range(num_per_key):
+                for key in keys:
+                    self.assertTrue(
+                        dispatcher.submit(
+                            # Make later commands quicker, so they would
+                            # finish first, if not ordered.
+                            self.make_command(
+                                key=key,
+                                index=index,
+                                duration=0.01 * (num_per_key - index),
+                                fail=index == 1,
+                            )
+                        )
+                    )
+            self.assertEqual(dispatcher.num_pending, len(keys) * num_per_key)
+            await self.wait_idle(dispatcher)
+            self.assertEqual(len(self.started), len(keys) * num_per_key)
+            self.assertEqual(self.max_running, num_workers)
+            for key in keys:
+                indices = [index for key2, index in self.started if key2 == key]
+                self.assertEqual(indices, list(range(num_per_key)))
+                self.assertEqual(self.max_running_per_key[key], 1)
+            self.assertEqual(dispatcher.num_pending, 0)
+            self.assertEqual(dispatcher.num_running, 0)
+            self.assertEqual(dispatcher.num_rejected, 0)
+        finally:
+            await dispatcher.close()
+
+    async def test_max_pending(self):
+        max_pending = 4
+        dispatcher = self.make_dispatcher(num_workers=1, max_pending=max_pending)
+        try:
+            self.handle_event.clear()
+            # The first command is taken by the worker,
+            # which then waits for handle_event.
+            self.assertTrue(dispatcher.submit(self.make_command(key="a", index=0)))
+            await asyncio.sleep(0.01)
+            self.assertEqual(dispatcher.num_running, 1)
+            for index in range(1, max_pending + 1):
+                self.assertTrue(
+                    dispatcher.submit(self.make_command(key="a", index=index))
+                )
+            self.assertEqual(dispatcher.num_pending, max_pending)
+            self.assertFalse(dispatcher.submit(self.make_command(key="b", index=0)))
+            self.assertEqual(dispatcher.num_rejected, 1)
+            self.assertEqual(dispatcher.num_in_flight, max_pending + 1)
+
+            # Discard the pending commands.
+            dispatcher.clear()
+            self.assertEqual(dispatcher.num_pending, 0)
+            self.handle_event.set()
+            await self.wait_idle(dispatcher)
+            self.assertEqual(self.started, [("a", 0)])
+
+            # The dispatcher still works after clear.
+            self.assertTrue(dispatcher.submit(self.make_command(key="a", index=1)))
+            await self.wait_idle(dispatcher)
+            self.assertEqual(self.started, [("a", 0), ("a", 1)])
+        finally:
+            await dispatcher.close()
+
+    async def test_monitor_tasks(self):
+        dispatcher = self.make_dispatcher()
+        short_task = asyncio.create_task(asyncio.sleep(0.01))
+        long_task = asyncio.create_task(asyncio.sleep(10))
+        dispatcher.add_monitor_task(short_task)
+        dispatcher.add_monitor_task(long_task)
+        self.assertEqual(dispatcher.num_in_flight, 2)
+        await short_task
+        await asyncio.sleep(0)
+        self.assertEqual(dispatcher.monitor_tasks, {long_task})
+
+        # Close cancels the remaining monitor tasks.
+        self.handle_event.clear()
+        dispatcher.submit(self.make_command(key="a", index=0))
+        await asyncio.sleep(0.01)
+        await dispatcher.close()
+        self.assertTrue(long_task.cancelled())
+        self.assertEqual(dispatcher.monitor_tasks, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -475,6 +475,22 @@ class MockControllerTestCase(asynctest.TestCase):
                     self.assertAlmostEqual(axis_telem[name], desired_value, msg=name)
                 self.assertGreater(axis_telem["timestamp"], tai0)
 
+            for topic_id, prefix, num_drives in (
+                (
+                    MTMount.TelemetryTopicId.AZIMUTH_DRIVE,
+                    "azCurrent",
+                    MTMount.mock.NUM_AZIMUTH_DRIVES,
+                ),
+                (
+                    MTMount.TelemetryTopicId.ELEVATION_DRIVE,
+                    "elCurrent",
+                    MTMount.mock.NUM_ELEVATION_DRIVES,
+                ),
+            ):
+                drives_telem = await self.next_telemetry(topic_id)
+                for i in range(1, num_drives + 1):
+                    self.assertEqual(drives_telem[f"{prefix}{i}"], 0)
+
             # Work around Docker time issues on macOS with an offset
             tai0 = salobj.current_tai() - 0.1
             ccw_telem = await self.next_telemetry(
@@ -620,6 +636,204 @@ class MockControllerTestCase(asynctest.TestCase):
                     desired_value = 0
                 self.assertAlmostEqual(axis_telem[name], desired_value, msg=name)
 
+    async def test_compute_in_position_tai(self):
+        async with self.make_controller():
+            device = self.controller.device_dict[MTMount.DeviceId.ELEVATION_AXIS]
+            await self.run_command(
+                MTMount.commands.ElevationAxisPower(on=True), use_read_loop=True
+            )
+            tai = salobj.current_tai()
+            self.assertIsNone(
+                self.controller.compute_in_position_tai(device=device, tai=tai)
+            )
+
+            start_position = device.actuator.path.at(tai).position
+            move_command = MTMount.commands.ElevationAxisMove(
+                position=start_position + 1
+            )
+            await self.run_command(move_command, use_read_loop=True, read_done=False)
+            tai = salobj.current_tai()
+            in_position_tai = self.controller.compute_in_position_tai(
+                device=device, tai=tai
+            )
+            self.assertGreater(in_position_tai, tai)
+            self.assertLessEqual(in_position_tai, device.end_tai)
+
+            def get_errors(tai):
+                actual = device.actuator.path.at(tai)
+                target = device.actuator.target.at(tai)
+                return (
+                    abs(actual.position - target.position),
+                    abs(actual.velocity - target.velocity),
+                )
+
+            position_error, velocity_error = get_errors(in_position_tai)
+            self.assertLess(position_error, self.controller.max_position_error)
+            self.assertLess(velocity_error, self.controller.max_velocity_error)
+            position_error, velocity_error = get_errors(
+                in_position_tai - 2 * MTMount.mock.controller.IN_POSITION_RESOLUTION
+            )
+            self.assertTrue(
+                position_error >= self.controller.max_position_error
+                or velocity_error >= self.controller.max_velocity_error
+            )
+
+            # The InPosition reply is written at in_position_tai,
+            # without a telemetry client.
+            self.telemetry_writer.close()
+            replies = await self.read_replies(
+                reply_types=[MTMount.replies.InPositionReply],
+                timeout=STD_TIMEOUT,
+                return_others=False,
+            )
+            self.assertTrue(replies[0].in_position)
+            self.assertGreaterEqual(salobj.current_tai(), in_position_tai)
+
+    async def test_multiple_telemetry_clients(self):
+        async with self.make_controller():
+            # Wait for telemetry from the first client,
+            # then connect two more.
+            await self.next_telemetry(MTMount.TelemetryTopicId.AZIMUTH)
+            streams = []
+            try:
+                for i in range(2):
+                    streams.append(
+                        await asyncio.wait_for(
+                            asyncio.open_connection(
+                                host=salobj.LOCAL_HOST,
+                                port=self.controller.telemetry_server.port,
+                            ),
+                            timeout=STD_TIMEOUT,
+                        )
+                    )
+                for reader, writer in streams:
+                    data = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n"), timeout=STD_TIMEOUT
+                    )
+                    self.assertIn("topicID", json.loads(data.decode()))
+                self.assertEqual(self.controller.telemetry_server.num_clients, 3)
+
+                # The original client still gets telemetry.
+                await self.next_telemetry(MTMount.TelemetryTopicId.ELEVATION)
+
+                # Telemetry continues while any client is connected.
+                self.telemetry_writer.close()
+                reader = streams[0][0]
+                for i in range(20):
+                    await asyncio.wait_for(
+                        reader.readuntil(b"\r\n"), timeout=STD_TIMEOUT
+                    )
+            finally:
+                for reader, writer in streams:
+                    writer.close()
+
+    async def test_fault_injection(self):
+        async with self.make_controller():
+            fault_injector = self.controller.fault_injector
+
+            # Delay Ack replies.
+            ack_delay = 0.5
+            fault_injector.ack_delay = ack_delay
+            t0 = time.monotonic()
+            await self.run_command(
+                MTMount.commands.MirrorCoverLocksPower(drive=-1, on=True),
+                use_read_loop=True,
+            )
+            self.assertGreaterEqual(time.monotonic() - t0, ack_delay)
+            fault_injector.ack_delay = None
+
+            # Drop Done replies, but not Ack replies.
+            fault_injector.drop_probability = 1
+            fault_injector.drop_reply_codes = {MTMount.ReplyCode.DONE}
+            await self.run_command(
+                MTMount.commands.MirrorCoverLocksPower(drive=-1, on=False),
+                use_read_loop=True,
+                read_done=False,
+            )
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.communicator.read(), timeout=0.5)
+            self.assertEqual(fault_injector.num_dropped, 1)
+            fault_injector.drop_probability = 0
+
+            # Stall telemetry.
+            await self.next_telemetry(MTMount.TelemetryTopicId.AZIMUTH)
+            fault_injector.stall_telemetry(duration=1)
+            await asyncio.sleep(0.2)
+            self.telemetry_dict[MTMount.TelemetryTopicId.AZIMUTH] = None
+            await asyncio.sleep(0.5)
+            self.assertIsNone(self.telemetry_dict[MTMount.TelemetryTopicId.AZIMUTH])
+            await self.next_telemetry(MTMount.TelemetryTopicId.AZIMUTH)
+
+    async def test_make_many(self):
+        """Test multiple mock controllers sharing a telemetry scheduler.
+        """
+        log = logging.getLogger()
+        num_mounts = 3
+        command_port = next(port_generator)
+        for i in range(2 * num_mounts - 1):
+            next(port_generator)
+        telemetry_port = next(port_generator)
+        for i in range(num_mounts - 1):
+            next(port_generator)
+
+        with self.assertRaises(ValueError):
+            MTMount.mock.Controller.make_many(
+                num_mounts=0,
+                command_port=command_port,
+                telemetry_port=telemetry_port,
+                log=log,
+            )
+        with self.assertRaises(ValueError):
+            MTMount.mock.Controller.make_many(
+                num_mounts=num_mounts,
+                command_port=command_port,
+                telemetry_port=command_port + 1,
+                log=log,
+            )
+
+        controllers = MTMount.mock.Controller.make_many(
+            num_mounts=num_mounts,
+            command_port=command_port,
+            telemetry_port=telemetry_port,
+            log=log,
+        )
+        writers = []
+        try:
+            self.assertEqual(len(controllers), num_mounts)
+            await asyncio.wait_for(
+                asyncio.gather(*[controller.start_task for controller in controllers]),
+                timeout=START_TIME,
+            )
+            telemetry_scheduler = controllers[0].telemetry_scheduler
+            for i, controller in enumerate(controllers):
+                self.assertIs(controller.telemetry_scheduler, telemetry_scheduler)
+                self.assertFalse(controller.own_telemetry_scheduler)
+                self.assertEqual(controller.command_port, command_port + 2 * i)
+                self.assertEqual(controller.telemetry_server.port, telemetry_port + i)
+
+            # Each controller writes its own telemetry.
+            readers = []
+            for i in range(num_mounts):
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        host=salobj.LOCAL_HOST, port=telemetry_port + i
+                    ),
+                    timeout=START_TIME,
+                )
+                readers.append(reader)
+                writers.append(writer)
+            for reader in readers:
+                data = await asyncio.wait_for(
+                    reader.readuntil(b"\r\n"), timeout=STD_TIMEOUT
+                )
+                self.assertIn("topicID", json.loads(data.decode()))
+            self.assertEqual(len(telemetry_scheduler.controllers), num_mounts)
+        finally:
+            for writer in writers:
+                writer.close()
+            for controller in controllers:
+                await controller.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -263,6 +263,109 @@ class MockDevicesTestCase(asynctest.TestCase):
         self.assertFalse(device.track_ambient)
         self.assertAlmostEqual(device.temperature, temperature2)
 
+    async def test_oil_supply_system_startup(self):
+        controller = TrivialMockController()
+        controller.clock = MTMount.mock.VirtualClock(start_tai=1000)
+        device = MTMount.mock.OilSupplySystemDevice(
+            controller=controller, startup_scale=1
+        )
+        clock = device.clock
+        self.assertEqual(device.oil_pressure.at(clock.tai()), 0)
+        self.assertEqual(device.oil_flow.at(clock.tai()), 0)
+
+        do_power = controller.command_dict[MTMount.CommandCode.OIL_SUPPLY_SYSTEM_POWER]
+        timeout, task = do_power(MTMount.commands.OilSupplySystemPower(on=True))
+        self.assertGreaterEqual(timeout, 15 * 60)
+        self.assertTrue(device.power_on)
+
+        # The main pump builds up pressure in 1 minute,
+        # the oil flow takes 2 minutes and the cooling 15 minutes.
+        await clock.advance(60)
+        self.assertAlmostEqual(device.oil_pressure.at(clock.tai()), 60)
+        self.assertAlmostEqual(device.oil_flow.at(clock.tai()), 75)
+        self.assertFalse(task.done())
+        await clock.advance(15 * 60 - 60.1)
+        self.assertFalse(task.done())
+        await clock.advance(0.1)
+        self.assertTrue(task.done())
+        self.assertAlmostEqual(device.oil_temperature.at(clock.tai()), 12)
+
+        # Power off finishes at once, but the ramps take time.
+        timeout, off_task = do_power(MTMount.commands.OilSupplySystemPower(on=False))
+        self.assertTrue(off_task.done())
+        self.assertFalse(device.power_on)
+        await clock.advance(30)
+        self.assertAlmostEqual(device.oil_pressure.at(clock.tai()), 30)
+
+        # Turning off a subsystem supersedes its startup.
+        timeout, task = do_power(MTMount.commands.OilSupplySystemPower(on=True))
+        do_main_pump = controller.command_dict[
+            MTMount.CommandCode.OIL_SUPPLY_SYSTEM_POWER_MAIN_PUMP
+        ]
+        self.assertIsNone(
+            do_main_pump(MTMount.commands.OilSupplySystemPowerMainPump(on=False))
+        )
+        await clock.advance(0)
+        self.assertTrue(task.cancelled())
+        await device.close()
+
+    async def test_top_end_chiller_startup(self):
+        controller = TrivialMockController()
+        controller.clock = MTMount.mock.VirtualClock(start_tai=1000)
+        device = MTMount.mock.TopEndChillerDevice(
+            controller=controller, startup_scale=1
+        )
+        clock = device.clock
+        ambient_temperature = device.ambient_temperature
+        self.assertEqual(device.actual_temperature.at(clock.tai()), ambient_temperature)
+
+        do_power = controller.command_dict[MTMount.CommandCode.TOP_END_CHILLER_POWER]
+        timeout, task = do_power(MTMount.commands.TopEndChillerPower(on=True))
+        self.assertGreaterEqual(timeout, 2 * 60)
+        await clock.advance(2 * 60 - 0.1)
+        self.assertFalse(task.done())
+        await clock.advance(0.1)
+        self.assertTrue(task.done())
+
+        # Stop tracking ambient; the temperature approaches the set point.
+        do_track_ambient = controller.command_dict[
+            MTMount.CommandCode.TOP_END_CHILLER_TRACK_AMBIENT
+        ]
+        set_temperature = ambient_temperature - 3
+        do_track_ambient(
+            MTMount.commands.TopEndChillerTrackAmbient(
+                on=False, temperature=set_temperature
+            )
+        )
+        self.assertEqual(device.target_temperature, set_temperature)
+        await clock.advance(20)
+        self.assertAlmostEqual(
+            device.actual_temperature.at(clock.tai()), ambient_temperature - 1
+        )
+        await clock.advance(40)
+        self.assertAlmostEqual(
+            device.actual_temperature.at(clock.tai()), set_temperature
+        )
+
+        # Track ambient, which changes.
+        do_track_ambient(
+            MTMount.commands.TopEndChillerTrackAmbient(on=True, temperature=0)
+        )
+        device.set_ambient_temperature(ambient_temperature + 1)
+        self.assertEqual(device.target_temperature, ambient_temperature + 1)
+        await clock.advance(80)
+        self.assertAlmostEqual(
+            device.actual_temperature.at(clock.tai()), ambient_temperature + 1
+        )
+
+        # When off, the temperature drifts to ambient.
+        device.set_ambient_temperature(ambient_temperature)
+        self.assertIsNone(do_power(MTMount.commands.TopEndChillerPower(on=False)))
+        await clock.advance(20)
+        self.assertAlmostEqual(
+            device.actual_temperature.at(clock.tai()), ambient_temperature
+        )
+
     async def test_axis_devices(self):
         for device_id in (
             MTMount.DeviceId.AZIMUTH_AXIS,
@@ -0,0 +1,174 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+import numpy as np
+
+from lsst.ts import MTMount
+
+
+class DriveModelTestCase(unittest.TestCase):
+    def test_drive_model_dict(self):
+        for device_id, num_drives in (
+            (MTMount.DeviceId.AZIMUTH_AXIS, MTMount.mock.NUM_AZIMUTH_DRIVES),
+            (MTMount.DeviceId.ELEVATION_AXIS, MTMount.mock.NUM_ELEVATION_DRIVES),
+        ):
+            drive_model = MTMount.mock.DriveModelDict[device_id]
+            self.assertEqual(drive_model.num_drives, num_drives)
+            # The drives can provide the maximum acceleration
+            # at the maximum velocity.
+            axis_limits = MTMount.LimitsDict[device_id]
+            self.assertFalse(
+                drive_model.is_saturated(
+                    velocity=axis_limits.max_velocity,
+                    acceleration=axis_limits.max_acceleration,
+                )
+            )
+            # Using about 80% of the available torque.
+            demanded_torque = drive_model.get_demanded_torque(
+                velocity=axis_limits.max_velocity,
+                acceleration=axis_limits.max_acceleration,
+            )
+            self.assertAlmostEqual(
+                demanded_torque / (num_drives * drive_model.max_torque),
+                0.8,
+                delta=0.01,
+            )
+
+    def test_constructor_error(self):
+        with self.assertRaises(ValueError):
+            MTMount.mock.DriveModel(
+                num_drives=0,
+                inertia=1,
+                viscous_friction=0,
+                coulomb_friction=0,
+                max_torque=1,
+                torque_constant=1,
+            )
+
+    def test_torques(self):
+        num_drives = 4
+        drive_model = MTMount.mock.DriveModel(
+            num_drives=num_drives,
+            inertia=np.degrees(1),  # so torque = inertia * accel in deg/sec2
+            viscous_friction=0.5,
+            coulomb_friction=0.25,
+            max_torque=2,
+            torque_constant=4,
+        )
+
+        # At rest there is no torque.
+        np.testing.assert_array_equal(
+            drive_model.get_torques(velocity=0, acceleration=0), np.zeros(num_drives)
+        )
+
+        # Torque is shared equally.
+        velocity = 1
+        acceleration = 2
+        demanded_torque = acceleration + 0.5 * velocity + 0.25
+        self.assertAlmostEqual(
+            drive_model.get_demanded_torque(
+                velocity=velocity, acceleration=acceleration
+            ),
+            demanded_torque,
+        )
+        torques = drive_model.get_torques(velocity=velocity, acceleration=acceleration)
+        np.testing.assert_allclose(torques, demanded_torque / num_drives)
+        currents = drive_model.get_currents(
+            velocity=velocity, acceleration=acceleration
+        )
+        np.testing.assert_allclose(currents, torques / 4)
+        self.assertFalse(
+            drive_model.is_saturated(velocity=velocity, acceleration=acceleration)
+        )
+
+        # Friction opposes motion.
+        torques = drive_model.get_torques(velocity=-velocity, acceleration=0)
+        np.testing.assert_allclose(torques, -(0.5 * velocity + 0.25) / num_drives)
+
+        # Unbalanced sharing.
+        drive_model.weights = np.array([2, 1, 1, 0], dtype=float)
+        torques = drive_model.get_torques(velocity=velocity, acceleration=acceleration)
+        np.testing.assert_allclose(
+            torques, demanded_torque * np.array([0.5, 0.25, 0.25, 0])
+        )
+        drive_model.weights = np.ones(num_drives)
+
+        # A faulted drive produces no torque; the others make up for it.
+        drive_model.set_fault(1)
+        torques = drive_model.get_torques(velocity=velocity, acceleration=acceleration)
+        self.assertEqual(torques[1], 0)
+        np.testing.assert_allclose(torques[[0, 2, 3]], demanded_torque / 3)
+        self.assertAlmostEqual(torques.sum(), demanded_torque)
+
+        # Torque limits: with two drives faulted the rest saturate.
+        drive_model.set_fault([1, 2])
+        self.assertFalse(
+            drive_model.is_saturated(velocity=velocity, acceleration=acceleration)
+        )
+        torques = drive_model.get_torques(velocity=velocity, acceleration=6)
+        np.testing.assert_allclose(torques, [2, 0, 0, 2])
+        self.assertTrue(drive_model.is_saturated(velocity=velocity, acceleration=6))
+
+        # No torque if all drives are faulted.
+        drive_model.set_fault(slice(None))
+        np.testing.assert_array_equal(
+            drive_model.get_torques(velocity=velocity, acceleration=acceleration),
+            np.zeros(num_drives),
+        )
+        drive_model.clear_faults()
+        self.assertFalse(np.any(drive_model.faulted))
+
+        # A copy has no faults and equal weights.
+        drive_model.set_fault(0)
+        drive_model.weights[0] = 5
+        copied_model = drive_model.copy()
+        self.assertFalse(np.any(copied_model.faulted))
+        np.testing.assert_array_equal(copied_model.weights, np.ones(num_drives))
+
+    def test_vectorized(self):
+        drive_model = MTMount.mock.DriveModelDict[MTMount.DeviceId.AZIMUTH_AXIS]
+        velocity = np.linspace(-5, 5, num=11)
+        acceleration = np.linspace(-10, 10, num=11)
+        torques = drive_model.get_torques(velocity=velocity, acceleration=acceleration)
+        self.assertEqual(torques.shape, (drive_model.num_drives, len(velocity)))
+        saturated = drive_model.is_saturated(
+            velocity=velocity, acceleration=acceleration
+        )
+        self.assertEqual(saturated.shape, velocity.shape)
+        for j in range(len(velocity)):
+            np.testing.assert_allclose(
+                torques[:, j],
+                drive_model.get_torques(
+                    velocity=velocity[j], acceleration=acceleration[j]
+                ),
+            )
+            self.assertEqual(
+                saturated[j],
+                drive_model.is_saturated(
+                    velocity=velocity[j], acceleration=acceleration[j]
+                ),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
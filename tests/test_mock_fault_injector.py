@@ -0,0 +1,135 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import unittest
+
+import asynctest
+
+from lsst.ts import MTMount
+
+
+class MockFaultInjectorTestCase(asynctest.TestCase):
+    def test_defaults(self):
+        fault_injector = MTMount.mock.FaultInjector()
+        self.assertEqual(fault_injector.get_delay(fault_injector.ack_delay), 0)
+        self.assertEqual(fault_injector.get_delay(fault_injector.done_delay), 0)
+        for reply in (
+            MTMount.replies.AckReply(sequence_id=1),
+            MTMount.replies.DoneReply(sequence_id=1),
+            MTMount.replies.NoAckReply(sequence_id=1, explanation="test"),
+        ):
+            self.assertFalse(fault_injector.should_drop(reply))
+        self.assertFalse(fault_injector.telemetry_stalled(tai=1000))
+        self.assertEqual(fault_injector.filter_telemetry(tai=1000, data=b"a"), b"a")
+
+        with self.assertRaises(ValueError):
+            MTMount.mock.FaultInjector(no_such_attribute=1)
+
+    def test_get_delay(self):
+        fault_injector = MTMount.mock.FaultInjector(seed=47)
+        self.assertEqual(fault_injector.get_delay(None), 0)
+        self.assertEqual(fault_injector.get_delay(0.5), 0.5)
+        self.assertEqual(fault_injector.get_delay(-0.5), 0)
+        delays = [fault_injector.get_delay((0.1, 0.3)) for i in range(100)]
+        self.assertGreaterEqual(min(delays), 0.1)
+        self.assertLessEqual(max(delays), 0.3)
+        self.assertGreater(max(delays) - min(delays), 0.1)
+        delays = [
+            fault_injector.get_delay(lambda rng: rng.expovariate(10))
+            for i in range(100)
+        ]
+        self.assertGreaterEqual(min(delays), 0)
+        self.assertAlmostEqual(sum(delays) / len(delays), 0.1, delta=0.05)
+
+        # The same seed gives the same delays.
+        delays1, delays2 = [
+            [MTMount.mock.FaultInjector(seed=5).get_delay((0, 1)) for i in range(10)]
+            for j in range(2)
+        ]
+        self.assertEqual(delays1, delays2)
+
+    def test_should_drop(self):
+        ack = MTMount.replies.AckReply(sequence_id=1)
+        done = MTMount.replies.DoneReply(sequence_id=1)
+        in_position = MTMount.replies.InPositionReply(what=0, in_position=True)
+        fault_injector = MTMount.mock.FaultInjector(
+            drop_probability=1, drop_reply_codes={MTMount.ReplyCode.DONE}
+        )
+        self.assertFalse(fault_injector.should_drop(ack))
+        self.assertTrue(fault_injector.should_drop(done))
+        self.assertFalse(fault_injector.should_drop(in_position))
+        self.assertEqual(fault_injector.num_dropped, 1)
+
+        fault_injector = MTMount.mock.FaultInjector(drop_probability=0.5, seed=3)
+        num_dropped = sum(fault_injector.should_drop(ack) for i in range(1000))
+        self.assertEqual(num_dropped, fault_injector.num_dropped)
+        self.assertAlmostEqual(num_dropped, 500, delta=100)
+
+    async def test_telemetry_stall(self):
+        clock = MTMount.mock.VirtualClock(start_tai=1000)
+        fault_injector = MTMount.mock.FaultInjector(clock=clock)
+        fault_injector.stall_telemetry(duration=1)
+        self.assertTrue(fault_injector.telemetry_stalled(clock.tai()))
+        self.assertEqual(fault_injector.filter_telemetry(clock.tai(), b"a"), b"")
+        await clock.advance(0.5)
+        self.assertEqual(fault_injector.filter_telemetry(clock.tai(), b"b"), b"")
+        await clock.advance(0.5)
+        self.assertFalse(fault_injector.telemetry_stalled(clock.tai()))
+        # Held telemetry is written in a burst.
+        self.assertEqual(fault_injector.filter_telemetry(clock.tai(), b"c"), b"abc")
+        self.assertEqual(fault_injector.filter_telemetry(clock.tai(), b"d"), b"d")
+
+        # Without bursts, telemetry that is due during a stall is discarded.
+        fault_injector.telemetry_burst = False
+        fault_injector.stall_telemetry(duration=1)
+        self.assertEqual(fault_injector.filter_telemetry(clock.tai(), b"a"), b"")
+        await clock.advance(1)
+        self.assertEqual(fault_injector.filter_telemetry(clock.tai(), b"b"), b"b")
+
+        # Periodic stalls.
+        fault_injector.telemetry_stall_period = 10
+        fault_injector.telemetry_stall_duration = 2
+        self.assertTrue(fault_injector.telemetry_stalled(1000))
+        self.assertTrue(fault_injector.telemetry_stalled(1001.9))
+        self.assertFalse(fault_injector.telemetry_stalled(1002.1))
+        self.assertFalse(fault_injector.telemetry_stalled(1009.9))
+        self.assertTrue(fault_injector.telemetry_stalled(1010.1))
+
+    async def test_delays_and_throttle(self):
+        clock = MTMount.mock.VirtualClock(start_tai=1000)
+        fault_injector = MTMount.mock.FaultInjector(
+            clock=clock, ack_delay=0.5, done_delay=1.5, write_rate=100
+        )
+        for coro, duration in (
+            (fault_injector.delay_ack(), 0.5),
+            (fault_injector.delay_done(), 1.5),
+            (fault_injector.throttle(num_bytes=200), 2),
+        ):
+            task = asyncio.create_task(coro)
+            await clock.advance(duration - 0.1)
+            self.assertFalse(task.done())
+            await clock.advance(0.1)
+            self.assertTrue(task.done())
+
+
+if __name__ == "__main__":
+    unittest.main()
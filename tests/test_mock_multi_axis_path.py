@@ -0,0 +1,97 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+import numpy as np
+
+from lsst.ts import salobj
+from lsst.ts import simactuators
+from lsst.ts import MTMount
+
+
+class MultiAxisPathTestCase(unittest.TestCase):
+    def setUp(self):
+        self.start_tai = salobj.current_tai()
+        # Make actuators whose paths have different numbers of segments.
+        self.actuators = []
+        for device_id, end_position, end_velocity in (
+            (MTMount.DeviceId.AZIMUTH_AXIS, 25, 0.01),
+            (MTMount.DeviceId.ELEVATION_AXIS, 60, 0),
+            (MTMount.DeviceId.CAMERA_CABLE_WRAP, 0, 0),
+        ):
+            device_limits = MTMount.LimitsDict[device_id].scaled()
+            actuator = simactuators.TrackingActuator(
+                min_position=device_limits.min_position,
+                max_position=device_limits.max_position,
+                max_velocity=device_limits.max_velocity,
+                max_acceleration=device_limits.max_acceleration,
+                dtmax_track=0.2,
+            )
+            actuator.set_target(
+                tai=self.start_tai, position=end_position, velocity=end_velocity
+            )
+            self.actuators.append(actuator)
+        self.paths = [actuator.path for actuator in self.actuators] + [
+            actuator.target for actuator in self.actuators
+        ]
+        self.end_tai = max(actuator.path[-1].tai for actuator in self.actuators) + 1
+
+    def check_at(self, tai, position, velocity, acceleration):
+        for i, path in enumerate(self.paths):
+            segment = path.at(tai)
+            self.assertAlmostEqual(position[i], segment.position)
+            self.assertAlmostEqual(velocity[i], segment.velocity)
+            self.assertAlmostEqual(acceleration[i], segment.acceleration)
+
+    def test_at_scalar(self):
+        multi_axis_path = MTMount.mock.MultiAxisPath(self.paths)
+        self.assertTrue(multi_axis_path.matches(self.paths))
+        self.assertFalse(multi_axis_path.matches(self.paths[:-1]))
+        self.assertFalse(multi_axis_path.matches(self.paths[::-1]))
+        # Include a time before the start of the paths.
+        for tai in np.linspace(self.start_tai - 1, self.end_tai, num=50):
+            position, velocity, acceleration = multi_axis_path.at(tai)
+            self.assertEqual(position.shape, (len(self.paths),))
+            self.check_at(
+                tai=tai,
+                position=position,
+                velocity=velocity,
+                acceleration=acceleration,
+            )
+
+    def test_at_array(self):
+        multi_axis_path = MTMount.mock.MultiAxisPath(self.paths)
+        tai = np.linspace(self.start_tai, self.end_tai, num=50)
+        position, velocity, acceleration = multi_axis_path.at(tai)
+        for array in (position, velocity, acceleration):
+            self.assertEqual(array.shape, (len(self.paths), len(tai)))
+        for j, tai_j in enumerate(tai):
+            self.check_at(
+                tai=tai_j,
+                position=position[:, j],
+                velocity=velocity[:, j],
+                acceleration=acceleration[:, j],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from lsst.ts import MTMount
+
+
+class RampTestCase(unittest.TestCase):
+    def test_ramp(self):
+        ramp = MTMount.mock.Ramp(5)
+        self.assertEqual(ramp.at(0), 5)
+        self.assertEqual(ramp.at(1000), 5)
+        self.assertTrue(ramp.done(1000))
+
+        ramp.set_target(tai=1000, target=15, duration=10)
+        self.assertEqual(ramp.at(999), 5)
+        self.assertEqual(ramp.at(1000), 5)
+        self.assertAlmostEqual(ramp.at(1002), 7)
+        self.assertFalse(ramp.done(1009.9))
+        self.assertTrue(ramp.done(1010))
+        self.assertEqual(ramp.at(1010), 15)
+        self.assertEqual(ramp.at(2000), 15)
+
+        # A new ramp starts from the current value.
+        ramp.set_target(tai=1005, target=0, duration=5)
+        self.assertAlmostEqual(ramp.start_value, 10)
+        self.assertAlmostEqual(ramp.at(1007.5), 5)
+        self.assertEqual(ramp.at(1010), 0)
+
+        # A ramp with 0 duration is done at once.
+        ramp.set_target(tai=1020, target=3, duration=0)
+        self.assertEqual(ramp.at(1020), 3)
+        self.assertTrue(ramp.done(1020))
+
+        with self.assertRaises(ValueError):
+            ramp.set_target(tai=1030, target=4, duration=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import pathlib
+import unittest
+
+import asynctest
+import numpy as np
+import yaml
+
+from lsst.ts import salobj
+from lsst.ts import MTMount
+
+TELEMETRY_MAP_PATH = pathlib.Path(__file__).parents[1] / "data" / "telemetry_map.yaml"
+
+
+class TrivialMockController:
+    def __init__(self):
+        self.command_dict = {}
+        self.log = logging.getLogger()
+
+
+class MockTelemetryEngineTestCase(asynctest.TestCase):
+    def setUp(self):
+        controller = TrivialMockController()
+        devices = [
+            MTMount.mock.AxisDevice(controller=controller, device_id=device_id)
+            for device_id in MTMount.LimitsDict
+        ]
+        self.device_dict = {device.device_id: device for device in devices}
+
+    def decode(self, data):
+        """Decode the data returned by TelemetryEngine.encode.
+
+        Return a dict of topic ID: data dict.
+        """
+        self.assertTrue(data.endswith(b"\r\n"))
+        data_dict = dict()
+        for line in data.split(b"\r\n")[:-1]:
+            llv_data = json.loads(line.decode())
+            topic_id = MTMount.TelemetryTopicId(llv_data["topicID"])
+            self.assertNotIn(topic_id, data_dict)
+            data_dict[topic_id] = llv_data
+        return data_dict
+
+    def test_all_topics(self):
+        with open(TELEMETRY_MAP_PATH, "r") as f:
+            telemetry_map = yaml.safe_load(f)
+        num_drives_dict = dict(
+            azCurrent=MTMount.mock.NUM_AZIMUTH_DRIVES,
+            elCurrent=MTMount.mock.NUM_ELEVATION_DRIVES,
+        )
+
+        engine = MTMount.mock.TelemetryEngine(device_dict=self.device_dict)
+        self.assertEqual(set(engine.topic_ids), set(telemetry_map))
+        tai = salobj.current_tai()
+        data_dict = self.decode(engine.encode(tai))
+        self.assertEqual(set(data_dict), set(telemetry_map))
+        for topic_id, (sal_topic_name, field_dict) in telemetry_map.items():
+            llv_data = data_dict[topic_id]
+            for llv_name in field_dict.values():
+                with self.subTest(sal_topic_name=sal_topic_name, llv_name=llv_name):
+                    if llv_name in num_drives_dict:
+                        for i in range(1, num_drives_dict[llv_name] + 1):
+                            self.assertEqual(llv_data[f"{llv_name}{i}"], 0)
+                    else:
+                        self.assertIn(llv_name, llv_data)
+            self.assertEqual(llv_data["timestamp"], tai)
+
+        # No topics are due until the interval has elapsed.
+        self.assertEqual(engine.encode(tai + 0.001), b"")
+        self.assertAlmostEqual(engine.next_tai, tai + 0.2)
+
+        # All topics are due again after reset.
+        engine.reset()
+        data_dict = self.decode(engine.encode(tai + 0.001))
+        self.assertEqual(set(data_dict), set(telemetry_map))
+
+    def test_rates(self):
+        fast_topic = MTMount.TelemetryTopicId.AZIMUTH
+        engine = MTMount.mock.TelemetryEngine(
+            device_dict=self.device_dict,
+            default_interval=0.1,
+            intervals={fast_topic: 0.01},
+        )
+        counts = {topic_id: 0 for topic_id in engine.topic_ids}
+        tai0 = salobj.current_tai()
+        tai = tai0
+        # Simulate one second of telemetry, calling encode
+        # exactly when the next message is due.
+        while tai < tai0 + 0.995:
+            for topic_id in self.decode(engine.encode(tai)):
+                counts[topic_id] += 1
+            tai = engine.next_tai
+        for topic_id, count in counts.items():
+            expected_count = 100 if topic_id == fast_topic else 10
+            self.assertEqual(count, expected_count, msg=f"topic_id={topic_id!r}")
+
+    def test_get_axis_states(self):
+        engine = MTMount.mock.TelemetryEngine(device_dict=self.device_dict)
+        tai0 = salobj.current_tai()
+        for device_id in MTMount.mock.AXIS_DEVICE_IDS:
+            self.device_dict[device_id].actuator.set_target(
+                tai=tai0, position=10, velocity=0.1
+            )
+        tai_arr = np.linspace(tai0, tai0 + 10, num=11)
+        axis_states_arr = engine.get_axis_states(tai_arr)
+        for axis_state in axis_states_arr:
+            self.assertEqual(
+                axis_state.shape, (len(MTMount.mock.AXIS_DEVICE_IDS), len(tai_arr))
+            )
+        for j, tai in enumerate(tai_arr):
+            axis_states = engine.get_axis_states(tai)
+            # The result for the current tick is cached.
+            self.assertIs(engine.get_axis_states(tai), axis_states)
+            for device_id, i in engine.axis_index_dict.items():
+                actuator = self.device_dict[device_id].actuator
+                actual = actuator.path.at(tai)
+                target = actuator.target.at(tai)
+                for value, desired_value in zip(
+                    axis_states,
+                    (
+                        actual.position,
+                        actual.velocity,
+                        actual.acceleration,
+                        target.position,
+                        target.velocity,
+                    ),
+                ):
+                    self.assertAlmostEqual(value[i], desired_value)
+                for value_arr, value in zip(axis_states_arr, axis_states):
+                    self.assertAlmostEqual(value_arr[i, j], value[i])
+
+    def test_drive_currents(self):
+        engine = MTMount.mock.TelemetryEngine(device_dict=self.device_dict)
+        tai0 = salobj.current_tai()
+        for device_id, topic_id, drive_topic_id, prefix in (
+            (
+                MTMount.DeviceId.AZIMUTH_AXIS,
+                MTMount.TelemetryTopicId.AZIMUTH,
+                MTMount.TelemetryTopicId.AZIMUTH_DRIVE,
+                "azCurrent",
+            ),
+            (
+                MTMount.DeviceId.ELEVATION_AXIS,
+                MTMount.TelemetryTopicId.ELEVATION,
+                MTMount.TelemetryTopicId.ELEVATION_DRIVE,
+                "elCurrent",
+            ),
+        ):
+            device = self.device_dict[device_id]
+            device.power_on = True
+            device.actuator.set_target(tai=tai0, position=45, velocity=0)
+            drive_model = device.drive_model
+            faulted_index = 2
+            for faulted in (False, True):
+                with self.subTest(device_id=device_id, faulted=faulted):
+                    drive_model.set_fault(faulted_index, faulted)
+                    # Pick a time when the axis is accelerating.
+                    tai = tai0 + 0.1
+                    engine.reset()
+                    data_dict = self.decode(engine.encode(tai))
+                    axis_data = data_dict[topic_id]
+                    drive_data = data_dict[drive_topic_id]
+                    desired_currents = drive_model.get_currents(
+                        velocity=axis_data["velocityActual"],
+                        acceleration=axis_data["accelerationActual"],
+                    )
+                    self.assertNotEqual(axis_data["accelerationActual"], 0)
+                    currents = np.array(
+                        [
+                            drive_data[f"{prefix}{i + 1}"]
+                            for i in range(drive_model.num_drives)
+                        ]
+                    )
+                    np.testing.assert_allclose(currents, desired_currents)
+                    self.assertEqual(currents[faulted_index] == 0, faulted)
+                    self.assertAlmostEqual(
+                        axis_data["torqueActual"],
+                        np.sum(currents * drive_model.torque_constant),
+                    )
+
+    def test_process_topics(self):
+        controller = TrivialMockController()
+        oil_supply_system = MTMount.mock.OilSupplySystemDevice(controller=controller)
+        top_end_chiller = MTMount.mock.TopEndChillerDevice(controller=controller)
+        device_dict = dict(self.device_dict)
+        for device in (oil_supply_system, top_end_chiller):
+            device_dict[device.device_id] = device
+        engine = MTMount.mock.TelemetryEngine(device_dict=device_dict)
+        mock_topic_ids = {
+            MTMount.mock.OIL_SUPPLY_SYSTEM_TOPIC_ID,
+            MTMount.mock.TOP_END_CHILLER_TOPIC_ID,
+        }
+        self.assertTrue(mock_topic_ids <= set(engine.topic_ids))
+
+        oil_supply_system.power_on = True
+        top_end_chiller.power_on = True
+        tai = salobj.current_tai()
+        data_dict = self.decode(engine.encode(tai))
+        oil_data = data_dict[MTMount.mock.OIL_SUPPLY_SYSTEM_TOPIC_ID]
+        for name in ("coolingOn", "mainPumpOn", "oilOn"):
+            self.assertTrue(oil_data[name])
+        self.assertEqual(oil_data["oilTemperature"], 12)
+        self.assertEqual(oil_data["oilPressure"], 60)
+        self.assertEqual(oil_data["oilFlow"], 150)
+        self.assertEqual(oil_data["timestamp"], tai)
+        chiller_data = data_dict[MTMount.mock.TOP_END_CHILLER_TOPIC_ID]
+        self.assertTrue(chiller_data["powerOn"])
+        self.assertTrue(chiller_data["trackAmbient"])
+        for name in ("temperatureSet", "temperatureActual"):
+            self.assertAlmostEqual(
+                chiller_data[name], top_end_chiller.ambient_temperature
+            )
+        self.assertEqual(chiller_data["timestamp"], tai)
+
+    def test_invalid_intervals(self):
+        for kwargs in (
+            dict(default_interval=0),
+            dict(intervals={MTMount.TelemetryTopicId.AZIMUTH: -1}),
+            dict(intervals={999: 0.1}),
+        ):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    MTMount.mock.TelemetryEngine(device_dict=self.device_dict, **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
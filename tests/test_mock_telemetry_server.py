@@ -0,0 +1,159 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import unittest
+
+import asynctest
+
+from lsst.ts import salobj
+from lsst.ts import MTMount
+
+STD_TIMEOUT = 5  # Timeout for short operations (sec)
+
+
+class MockTelemetryServerTestCase(asynctest.TestCase):
+    async def setUp(self):
+        self.connect_queue = asyncio.Queue()
+        self.server = MTMount.mock.TelemetryServer(
+            name="test",
+            host=salobj.LOCAL_HOST,
+            port=0,
+            log=logging.getLogger(),
+            connect_callback=self.connect_callback,
+            max_buffer_size=10,
+        )
+        await asyncio.wait_for(self.server.start_task, timeout=STD_TIMEOUT)
+        self.assertNotEqual(self.server.port, 0)
+        self.assertFalse(self.server.connected)
+        self.streams = []
+
+    async def tearDown(self):
+        for reader, writer in self.streams:
+            writer.close()
+        await self.server.close()
+
+    def connect_callback(self, server):
+        self.connect_queue.put_nowait(server.num_clients)
+
+    async def connect(self):
+        """Connect a client; return the reader.
+        """
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host=salobj.LOCAL_HOST, port=self.server.port),
+            timeout=STD_TIMEOUT,
+        )
+        self.streams.append((reader, writer))
+        num_clients = await asyncio.wait_for(
+            self.connect_queue.get(), timeout=STD_TIMEOUT
+        )
+        self.assertEqual(num_clients, len(self.streams))
+        return reader
+
+    async def read_line(self, reader):
+        return await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout=STD_TIMEOUT)
+
+    async def read_exactly(self, reader, num_bytes):
+        return await asyncio.wait_for(
+            reader.readexactly(num_bytes), timeout=STD_TIMEOUT
+        )
+
+    async def test_fan_out(self):
+        readers = [await self.connect() for i in range(3)]
+        self.assertTrue(self.server.connected)
+        self.assertEqual(self.server.num_clients, 3)
+        for data in (b"one\r\n", b"two\r\n"):
+            self.server.write(data)
+            for reader in readers:
+                self.assertEqual(await self.read_line(reader), data)
+
+        # Disconnect a client; the others still get data.
+        reader, writer = self.streams.pop(0)
+        writer.close()
+        num_clients = await asyncio.wait_for(
+            self.connect_queue.get(), timeout=STD_TIMEOUT
+        )
+        self.assertEqual(num_clients, 2)
+        self.server.write(b"three\r\n")
+        for reader in readers[1:]:
+            self.assertEqual(await self.read_line(reader), b"three\r\n")
+
+    async def test_drop(self):
+        reader = await self.connect()
+        client = self.server.clients[0]
+
+        # Writes that do not fit in the buffer discard the oldest data.
+        # The write task cannot run until this test yields.
+        self.server.write(b"aaa\r\n")
+        self.server.write(b"bbb\r\n")
+        self.assertEqual(client.buffer_size, 10)
+        self.server.write(b"ccc\r\n")
+        self.assertEqual(client.buffer_size, 10)
+        self.assertEqual(client.num_dropped, 1)
+        self.assertEqual(await self.read_line(reader), b"bbb\r\n")
+        self.assertEqual(await self.read_line(reader), b"ccc\r\n")
+
+        # Discard the newest data instead.
+        self.server.drop_oldest = False
+        self.server.write(b"ddd\r\n")
+        self.server.write(b"eee\r\n")
+        self.server.write(b"fff\r\n")
+        self.assertEqual(client.num_dropped, 2)
+        # Data larger than the buffer is always discarded.
+        self.server.write(b"too long for the buffer\r\n")
+        self.assertEqual(client.num_dropped, 3)
+        self.assertEqual(self.server.num_dropped, 3)
+        self.assertEqual(await self.read_line(reader), b"ddd\r\n")
+        self.assertEqual(await self.read_line(reader), b"eee\r\n")
+        self.server.write(b"ggg\r\n")
+        self.assertEqual(await self.read_line(reader), b"ggg\r\n")
+
+    async def test_slow_client(self):
+        """A client that does not read must not block the others.
+        """
+        slow_reader = await self.connect()
+        fast_reader = await self.connect()
+        slow_client = self.server.clients[0]
+        self.server.max_buffer_size = 200_000
+        # Write more than the OS socket buffers can hold.
+        data = b"x" * 99_998 + b"\r\n"
+        for i in range(200):
+            self.server.write(data)
+            self.assertEqual(await self.read_exactly(fast_reader, len(data)), data)
+        self.assertGreater(slow_client.num_dropped, 0)
+        self.assertLessEqual(slow_client.buffer_size, self.server.max_buffer_size)
+        # The slow client still gets complete messages.
+        self.assertEqual(await self.read_exactly(slow_reader, len(data)), data)
+
+    async def test_constructor_error(self):
+        with self.assertRaises(ValueError):
+            MTMount.mock.TelemetryServer(
+                name="test",
+                host=salobj.LOCAL_HOST,
+                port=0,
+                log=logging.getLogger(),
+                max_buffer_size=0,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+import numpy as np
+
+from lsst.ts import MTMount
+
+
+class SetpointValidatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.limits_dict = {
+            MTMount.DeviceId.AZIMUTH_AXIS: MTMount.Limits(
+                min_position=-10, max_position=10, max_velocity=2, max_acceleration=1
+            ),
+            MTMount.DeviceId.ELEVATION_AXIS: MTMount.Limits(
+                min_position=20, max_position=80, max_velocity=1, max_acceleration=0.5
+            ),
+        }
+        self.validator = MTMount.SetpointValidator(limits_dict=self.limits_dict)
+
+    def test_constructor(self):
+        validator = MTMount.SetpointValidator()
+        self.assertEqual(
+            validator.device_ids,
+            (MTMount.DeviceId.AZIMUTH_AXIS, MTMount.DeviceId.ELEVATION_AXIS),
+        )
+        for i, device_id in enumerate(validator.device_ids):
+            limits = MTMount.LimitsDict[device_id]
+            self.assertEqual(validator.min_position[i], limits.min_position)
+            self.assertEqual(validator.max_position[i], limits.max_position)
+            self.assertEqual(validator.max_velocity[i], limits.max_velocity)
+            self.assertEqual(validator.max_acceleration[i], limits.max_acceleration)
+
+        validator = MTMount.SetpointValidator(
+            device_ids=[MTMount.DeviceId.CAMERA_CABLE_WRAP]
+        )
+        validator.check_positions([90])
+        with self.assertRaises(ValueError):
+            validator.check_positions([91])
+
+    def test_check_positions(self):
+        position = self.validator.check_positions([-10, 80])
+        np.testing.assert_equal(position, [-10, 80])
+        batch = [[0, 20], [10, 50], [-5, 79]]
+        np.testing.assert_equal(self.validator.check_positions(batch), batch)
+
+        for bad_position in ([-10.1, 50], [0, 80.1], [[0, 50], [11, 50]]):
+            with self.subTest(bad_position=bad_position):
+                with self.assertRaises(ValueError):
+                    self.validator.check_positions(bad_position)
+
+        clipped = self.validator.check_positions([[-11, 90], [5, 10]], clip=True)
+        np.testing.assert_equal(clipped, [[-10, 80], [5, 20]])
+
+        for bad_shape in ([0], [0, 20, 30], [[[0, 20]]]):
+            with self.subTest(bad_shape=bad_shape):
+                with self.assertRaises(ValueError):
+                    self.validator.check_positions(bad_shape)
+
+    def test_check_single_setpoint(self):
+        position, velocity = self.validator.check_setpoints(
+            tai=5, position=[0, 50], velocity=[2, -1]
+        )
+        np.testing.assert_equal(position, [0, 50])
+        np.testing.assert_equal(velocity, [2, -1])
+
+        with self.assertRaises(ValueError):
+            self.validator.check_setpoints(tai=5, position=[0, 50], velocity=[2.1, 0])
+
+        # Acceleration from the previous setpoint
+        kwargs = dict(previous_tai=4, previous_velocity=[1, 0])
+        self.validator.check_setpoints(
+            tai=5, position=[0, 50], velocity=[2, 0.5], **kwargs
+        )
+        with self.assertRaises(ValueError):
+            self.validator.check_setpoints(
+                tai=5, position=[0, 50], velocity=[2, 0.6], **kwargs
+            )
+        position, velocity = self.validator.check_setpoints(
+            tai=5, position=[0, 50], velocity=[-1, 0.6], clip=True, **kwargs
+        )
+        np.testing.assert_allclose(velocity, [0, 0.5])
+
+        # Time must increase
+        with self.assertRaises(ValueError):
+            self.validator.check_setpoints(
+                tai=4, position=[0, 50], velocity=[1, 0], **kwargs
+            )
+
+    def test_check_batch(self):
+        tai = np.arange(0, 5, 0.5)
+        velocity = np.column_stack((0.4 * tai, -0.2 * tai))
+        position = np.column_stack((0.2 * tai ** 2, 50 - 0.1 * tai ** 2))
+        out_position, out_velocity = self.validator.check_setpoints(
+            tai=tai, position=position, velocity=velocity
+        )
+        np.testing.assert_equal(out_position, position)
+        np.testing.assert_equal(out_velocity, velocity)
+
+        # Make the elevation velocity jump by too much at one step.
+        bad_velocity = velocity.copy()
+        bad_velocity[5:, 1] += 0.5
+        with self.assertRaises(ValueError):
+            self.validator.check_setpoints(
+                tai=tai, position=position, velocity=bad_velocity
+            )
+
+        # Clipping limits the acceleration at that step,
+        # and propagates to later steps.
+        out_position, out_velocity = self.validator.check_setpoints(
+            tai=tai, position=position, velocity=bad_velocity, clip=True
+        )
+        np.testing.assert_equal(out_velocity[:5], velocity[:5])
+        dv = np.diff(out_velocity, axis=0)
+        self.assertTrue(np.all(np.abs(dv[:, 1]) <= 0.5 * 0.5 + 1e-12))
+        self.validator.check_setpoints(
+            tai=tai, position=out_position, velocity=out_velocity
+        )
+
+        with self.assertRaises(ValueError):
+            self.validator.check_setpoints(
+                tai=tai[:-1], position=position, velocity=velocity
+            )
+        with self.assertRaises(ValueError):
+            self.validator.check_setpoints(
+                tai=tai, position=position, velocity=velocity[:-1]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
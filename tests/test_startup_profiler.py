@@ -0,0 +1,143 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+import pathlib
+import tempfile
+import textwrap
+import unittest
+
+from lsst.ts import MTMount
+from lsst.ts.MTMount import startup_profiler
+
+# Scripts that start up like the real ones, but quickly.
+LISTEN_SCRIPT = """
+import socket
+import sys
+import time
+
+sock = socket.socket()
+sock.bind(("127.0.0.1", int(sys.argv[1])))
+sock.listen()
+time.sleep(60)
+"""
+
+CONNECT_SCRIPT = """
+import socket
+import sys
+import time
+
+sock = socket.create_connection(("127.0.0.1", int(sys.argv[1])))
+time.sleep(60)
+"""
+
+
+class StartupProfilerTestCase(unittest.TestCase):
+    def test_profile(self):
+        with tempfile.TemporaryDirectory() as bin_dir:
+            for name, script in (
+                ("listen.py", LISTEN_SCRIPT),
+                ("connect.py", CONNECT_SCRIPT),
+            ):
+                path = pathlib.Path(bin_dir) / name
+                path.write_text(textwrap.dedent(script))
+            entry_points = [
+                MTMount.EntryPoint(
+                    script="listen.py",
+                    import_statement="import socket",
+                    make_args=lambda port: [str(port)],
+                    ready="listen",
+                ),
+                MTMount.EntryPoint(
+                    script="connect.py",
+                    import_statement="import socket",
+                    make_args=lambda port: [str(port)],
+                    ready="connect",
+                ),
+                MTMount.EntryPoint(
+                    script="no_socket.py", import_statement="import json"
+                ),
+            ]
+            profiler = MTMount.StartupProfiler(
+                entry_points=entry_points, num_warm_runs=2, timeout=10, bin_dir=bin_dir
+            )
+            results = profiler.run()
+        self.assertEqual(
+            list(results), ["listen.py", "connect.py", "no_socket.py"],
+        )
+        for script, metrics in results.items():
+            with self.subTest(script=script):
+                names = ["import_time_cold", "import_time_warm"]
+                if script != "no_socket.py":
+                    names += ["ready_time_cold", "ready_time_warm"]
+                self.assertEqual(sorted(metrics), sorted(names + ["peak_rss"]))
+                for name, value in metrics.items():
+                    self.assertFalse(math.isnan(value), msg=name)
+                    self.assertGreater(value, 0, msg=name)
+                    self.assertLess(value, 1000, msg=name)
+        table = startup_profiler.format_results(results)
+        for script in results:
+            self.assertIn(script, table)
+
+        with self.assertRaises(ValueError):
+            MTMount.StartupProfiler(num_warm_runs=0)
+
+    def test_default_entry_points(self):
+        bin_dir = pathlib.Path(__file__).parents[1] / "bin"
+        scripts = {
+            entry_point.script for entry_point in startup_profiler.DEFAULT_ENTRY_POINTS
+        }
+        self.assertEqual(
+            scripts | {"profile_mtmount_startup.py"},
+            {path.name for path in bin_dir.glob("*.py")},
+        )
+
+    def test_find_regressions(self):
+        baseline = {
+            "a.py": dict(import_time_warm=1.0, peak_rss=100.0),
+            "b.py": dict(import_time_warm=0.01),
+        }
+        results = {
+            # Within the fractional tolerance.
+            "a.py": dict(import_time_warm=1.15, peak_rss=119.0, new_metric=5.0),
+            # Within the absolute tolerance.
+            "b.py": dict(import_time_warm=0.05),
+            # Not in the baseline.
+            "c.py": dict(import_time_warm=10.0),
+        }
+        self.assertEqual(
+            startup_profiler.find_regressions(
+                results=results, baseline=baseline, tolerance=0.2
+            ),
+            [],
+        )
+        results["a.py"]["peak_rss"] = 130
+        results["b.py"]["import_time_warm"] = 0.1
+        regressions = startup_profiler.find_regressions(
+            results=results, baseline=baseline, tolerance=0.2
+        )
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a.py peak_rss=130.000"))
+        self.assertTrue(regressions[1].startswith("b.py import_time_warm=0.100"))
+
+
+if __name__ == "__main__":
+    unittest.main()
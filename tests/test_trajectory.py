@@ -0,0 +1,147 @@
+# This file is part of ts_MTMount.
+#
+# Developed for Vera Rubin Observatory.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+import numpy as np
+
+from lsst.ts import MTMount
+
+
+class TrajectoryTestCase(unittest.TestCase):
+    def make_trajectory(self):
+        return MTMount.Trajectory(
+            tai=[10, 11, 13],
+            azimuth=[20, 21, 25],
+            elevation=[45, 45.5, 45],
+            azimuth_velocity=[1, 1.5, 2],
+            elevation_velocity=[0.5, 0, -0.5],
+        )
+
+    def test_setpoints(self):
+        trajectory = self.make_trajectory()
+        self.assertEqual(trajectory.start_tai, 10)
+        self.assertEqual(trajectory.end_tai, 13)
+        azimuth, elevation, azimuth_velocity, elevation_velocity = trajectory(
+            trajectory.tai
+        )
+        np.testing.assert_allclose(azimuth, trajectory.azimuth)
+        np.testing.assert_allclose(elevation, trajectory.elevation)
+        np.testing.assert_allclose(azimuth_velocity, trajectory.azimuth_velocity)
+        np.testing.assert_allclose(elevation_velocity, trajectory.elevation_velocity)
+
+    def test_constant_velocity(self):
+        # A constant velocity trajectory is a straight line.
+        tai = np.array([5, 6, 8])
+        trajectory = MTMount.Trajectory(
+            tai=tai,
+            azimuth=3 + 0.5 * (tai - 5),
+            elevation=60 - 0.25 * (tai - 5),
+            azimuth_velocity=[0.5] * 3,
+            elevation_velocity=[-0.25] * 3,
+        )
+        sample_tai = trajectory.sample_times(interval=0.3)
+        azimuth, elevation, azimuth_velocity, elevation_velocity = trajectory(
+            sample_tai
+        )
+        np.testing.assert_allclose(azimuth, 3 + 0.5 * (sample_tai - 5))
+        np.testing.assert_allclose(elevation, 60 - 0.25 * (sample_tai - 5))
+        np.testing.assert_allclose(azimuth_velocity, 0.5)
+        np.testing.assert_allclose(elevation_velocity, -0.25)
+
+        # Scalar input gives scalar output.
+        azimuth = trajectory(7)[0]
+        self.assertAlmostEqual(float(azimuth), 4)
+
+    def test_sample_times(self):
+        trajectory = self.make_trajectory()
+        tai = trajectory.sample_times(interval=0.4)
+        self.assertEqual(tai[0], trajectory.start_tai)
+        self.assertEqual(tai[-1], trajectory.end_tai)
+        np.testing.assert_allclose(np.diff(tai[:-1]), 0.4)
+        self.assertGreater(tai[-1] - tai[-2], 0.4 / 2)
+        self.assertLess(tai[-1] - tai[-2], 0.4 * 1.5)
+
+        tai = trajectory.sample_times(interval=0.5, start_tai=12.2)
+        np.testing.assert_allclose(tai, [12.2, 12.7, 13])
+
+        self.assertEqual(len(trajectory.sample_times(interval=1, start_tai=14)), 0)
+
+        # A start time less than interval/2 before end_tai is replaced.
+        np.testing.assert_allclose(
+            trajectory.sample_times(interval=0.5, start_tai=12.9), [13]
+        )
+
+        # Roundoff error must not make the last two samples nearly equal
+        # when the duration is (nearly) a multiple of the interval,
+        # at realistic TAI values.
+        rng = np.random.default_rng(47)
+        for start_tai in rng.uniform(1.7e9, 1.8e9, size=100):
+            for duration, interval in ((0.7, 0.05), (1.0, 0.1), (3, 0.2)):
+                trajectory = MTMount.Trajectory(
+                    tai=[start_tai, start_tai + duration],
+                    azimuth=[0, 1],
+                    elevation=[45, 46],
+                    azimuth_velocity=[0, 0],
+                    elevation_velocity=[0, 0],
+                )
+                tai = trajectory.sample_times(interval=interval)
+                self.assertEqual(tai[0], trajectory.start_tai)
+                self.assertEqual(tai[-1], trajectory.end_tai)
+                self.assertEqual(len(tai), round(duration / interval) + 1)
+                self.assertTrue(np.all(np.diff(tai) > interval / 2))
+                self.assertTrue(np.all(np.diff(tai) < interval * 1.5))
+        with self.assertRaises(ValueError):
+            trajectory.sample_times(interval=0)
+
+    def test_invalid(self):
+        good_kwargs = dict(
+            tai=[1, 2],
+            azimuth=[0, 0],
+            elevation=[0, 0],
+            azimuth_velocity=[0, 0],
+            elevation_velocity=[0, 0],
+        )
+        MTMount.Trajectory(**good_kwargs)
+        for name, bad_value in (
+            ("tai", [1]),
+            ("tai", [2, 1]),
+            ("tai", [1, 1]),
+            ("azimuth", [0, 0, 0]),
+            ("elevation_velocity", [[0, 0]]),
+        ):
+            bad_kwargs = good_kwargs.copy()
+            bad_kwargs[name] = bad_value
+            if name == "tai" and len(bad_value) == 1:
+                bad_kwargs = {key: value[:1] for key, value in good_kwargs.items()}
+            with self.subTest(name=name, bad_value=bad_value):
+                with self.assertRaises(ValueError):
+                    MTMount.Trajectory(**bad_kwargs)
+
+        trajectory = MTMount.Trajectory(**good_kwargs)
+        for bad_tai in (0.9, 2.1, [1.5, 3]):
+            with self.subTest(bad_tai=bad_tai):
+                with self.assertRaises(ValueError):
+                    trajectory(bad_tai)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,6 +45,9 @@ class ValidationTestCase(unittest.TestCase):
             ack_timeout=10,
             camera_cable_wrap_advance_time=0.02,
             max_rotator_position_error=0.1,
+            mirror_cover_power_off_delay=30,
+            track_trajectory_interval=0.05,
+            track_trajectory_advance_time=0.1,
         )
 
     def test_default(self):
@@ -75,6 +78,9 @@ class ValidationTestCase(unittest.TestCase):
             connection_timeout=3.4,
             ack_timeout=4.5,
             max_rotator_position_error=1.2,
+            mirror_cover_power_off_delay=5.6,
+            track_trajectory_interval=0.2,
+            track_trajectory_advance_time=0.3,
         )
         data_copy = data.copy()
         result = self.validator.validate(data)